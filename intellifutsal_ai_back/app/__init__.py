@@ -1,10 +1,10 @@
 import logging
 from flask import Flask
 from flasgger import Swagger
-from app.routes import init_analysis_bp, init_main_bp, init_physical_bp, init_position_bp
-from app.infrastructure import PickleModelLoader, SklearnModelAdapter, ModelLoadError
-from app.services import OpenAIService, PlayerProfilePredictor
-from app.core import Config, ConfigError, register_error_handlers
+from app.routes import init_admin_bp, init_analysis_bp, init_bulk_bp, init_jobs_bp, init_main_bp, init_physical_bp, init_position_bp
+from app.infrastructure import PickleModelLoader, SQLiteAnalysisCache, SQLiteJobStore, ModelLoadError
+from app.services import BulkScorer, JobService, ModelRegistry, ModelSource, OpenAIService, PlayerProfilePredictor, PredictionCache, ProfileScorer, parse_shadow_sources
+from app.core import Config, ConfigError, get_json_provider_class, register_error_handlers
 
 
 def setup_logging(app: Flask) -> None:
@@ -52,6 +52,7 @@ def create_app(config_object=Config, testing=False) -> Flask:
                 template_folder="../static/templates")
     
     app.config.from_object(config_object)
+    app.json = get_json_provider_class(Config.JSON_PROVIDER)(app)
     app.config["SWAGGER"] = {
         "title": "IntelliFutsal AI API Docs",
         "uiversion": 3,
@@ -92,20 +93,81 @@ def create_app(config_object=Config, testing=False) -> Flask:
     try:
         app.logger.info("Loading models...")
         
-        raw_positions_model = PickleModelLoader.load_model(Config.POSITIONS_MODEL_PATH)
-        raw_positions_scaler = PickleModelLoader.load_model(Config.POSITIONS_SCALER_PATH)
-        positions_model_adapter = SklearnModelAdapter(raw_positions_model, raw_positions_scaler)
+        positions_model_adapter = PickleModelLoader.load_adapter(
+            Config.POSITIONS_MODEL_PATH, Config.POSITIONS_SCALER_PATH, Config.POSITIONS_ARTIFACT_PATH
+        )
+        physical_conditions_model_adapter = PickleModelLoader.load_adapter(
+            Config.PHYSICAL_CONDITIONS_MODEL_PATH, Config.PHYSICAL_CONDITIONS_SCALER_PATH, Config.PHYSICAL_CONDITIONS_ARTIFACT_PATH
+        )
+        
+        positions_cache = None
+        physical_conditions_cache = None
+        
+        if Config.PREDICTION_CACHE_SIZE > 0:
+            positions_cache = PredictionCache(Config.PREDICTION_CACHE_SIZE, Config.PREDICTION_CACHE_TTL)
+            physical_conditions_cache = PredictionCache(Config.PREDICTION_CACHE_SIZE, Config.PREDICTION_CACHE_TTL)
+        
+        positions_predictor = PlayerProfilePredictor(positions_model_adapter, positions_cache)
+        physical_conditions_predictor = PlayerProfilePredictor(physical_conditions_model_adapter, physical_conditions_cache)
+        profile_scorer = ProfileScorer(positions_predictor, physical_conditions_predictor)
+        profile_scorer.warm_up()
+        
+        model_registry = ModelRegistry(
+            profile_scorer,
+            {
+                "positions": ModelSource(Config.POSITIONS_MODEL_PATH, Config.POSITIONS_SCALER_PATH, Config.POSITIONS_ARTIFACT_PATH),
+                "physicalConditions": ModelSource(
+                    Config.PHYSICAL_CONDITIONS_MODEL_PATH, Config.PHYSICAL_CONDITIONS_SCALER_PATH, Config.PHYSICAL_CONDITIONS_ARTIFACT_PATH
+                )
+            },
+            Config.MODEL_RELOAD_INTERVAL,
+            Config.MODEL_RELOAD_MARKER_PATH,
+            {
+                "positions": parse_shadow_sources(
+                    Config.POSITIONS_SHADOW_MODEL_PATHS, Config.POSITIONS_SHADOW_SCALER_PATHS, Config.POSITIONS_SCALER_PATH
+                ),
+                "physicalConditions": parse_shadow_sources(
+                    Config.PHYSICAL_CONDITIONS_SHADOW_MODEL_PATHS, Config.PHYSICAL_CONDITIONS_SHADOW_SCALER_PATHS, Config.PHYSICAL_CONDITIONS_SCALER_PATH
+                )
+            },
+            Config.SHADOW_SAMPLE_RATE,
+            Config.SHADOW_QUEUE_SIZE
+        )
+        app.before_request(model_registry.ensure_watching)
+        
+        analysis_cache = None
+        if Config.ANALYSIS_CACHE_ENABLED:
+            analysis_cache = SQLiteAnalysisCache(
+                Config.ANALYSIS_CACHE_PATH, Config.ANALYSIS_CACHE_TTL, Config.ANALYSIS_CACHE_MAX_ENTRIES
+            )
+        
+        openai_service = OpenAIService(analysis_cache)
         
-        raw_physical_conditions_model = PickleModelLoader.load_model(Config.PHYSICAL_CONDITIONS_MODEL_PATH)
-        raw_physical_conditions_scaler = PickleModelLoader.load_model(Config.PHYSICAL_CONDITIONS_SCALER_PATH)
-        physical_conditions_model_adapter = SklearnModelAdapter(raw_physical_conditions_model, raw_physical_conditions_scaler)
+        job_service = None
+        if Config.JOBS_ENABLED:
+            job_service = JobService(
+                SQLiteJobStore(Config.JOBS_DB_PATH, Config.JOBS_TTL),
+                Config.JOBS_MAX_WORKERS,
+                Config.JOBS_STALE_SECONDS,
+                Config.JOBS_MAX_ATTEMPTS,
+                Config.JOBS_REQUEUE_INTERVAL
+            )
+            app.before_request(job_service.resume)
         
-        positions_predictor = PlayerProfilePredictor(positions_model_adapter)
-        physical_conditions_predictor = PlayerProfilePredictor(physical_conditions_model_adapter)
-        openai_service = OpenAIService()
+        app.extensions["intellifutsal"] = {
+            "positions_predictor": positions_predictor,
+            "physical_conditions_predictor": physical_conditions_predictor,
+            "profile_scorer": profile_scorer,
+            "model_registry": model_registry,
+            "openai_service": openai_service,
+            "job_service": job_service
+        }
         
         init_main_bp(app, positions_predictor, physical_conditions_predictor, openai_service)
-        init_analysis_bp(app, positions_predictor, physical_conditions_predictor, openai_service)
+        init_analysis_bp(app, positions_predictor, physical_conditions_predictor, openai_service, profile_scorer, job_service)
+        init_jobs_bp(app, job_service)
+        init_admin_bp(app, model_registry)
+        init_bulk_bp(app, BulkScorer(profile_scorer, Config.BULK_CHUNK_SIZE))
         init_physical_bp(app, physical_conditions_predictor)
         init_position_bp(app, positions_predictor)
         register_error_handlers(app)
@@ -0,0 +1,180 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+from a2wsgi import WSGIMiddleware
+from flask import Flask
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from app.core import Config
+from app.domain import FEATURES, POSITIONS_CATEGORIES, PHYSICAL_CONDITIONS_CATEGORIES
+from app.routes.analysis_routes import build_team_data, complete_player_result, score_team_players, use_analysis_cache
+from app.services import parse_features
+
+
+def create_asgi_app(flask_app: Flask) -> Starlette:
+    """
+    Builds the ASGI application.
+
+    The OpenAI-bound analysis routes are served by async handlers, so a
+    worker holds many concurrent analyses without a thread or process each;
+    model inference runs in the default thread pool to keep the event loop
+    free. With `OPENAI_BATCH_ANALYSIS` enabled, team analyses pack their
+    players into batched requests, like the Flask route. Every other route
+    is served by the Flask application, mounted as WSGI.
+
+    Args:
+        flask_app: Application returned by `create_app`.
+
+    Returns:
+        The Starlette application.
+    """
+    services = flask_app.extensions["intellifutsal"]
+    profile_scorer = services["profile_scorer"]
+    model_registry = services["model_registry"]
+    openai_service = services["openai_service"]
+    job_service = services["job_service"]
+    semaphore = None
+
+    def json_response(payload: Dict[str, Any], status_code: int = 200) -> Response:
+        """Encodes a response body the same way as the Flask routes."""
+        return Response(flask_app.json.dumps(payload) + "\n", status_code, media_type="application/json")
+
+    async def bounded(coroutine):
+        """Runs an OpenAI call within the worker's concurrency limit."""
+        nonlocal semaphore
+
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, Config.OPENAI_ASYNC_MAX_CONCURRENCY))
+
+        async with semaphore:
+            return await coroutine
+
+    async def read_json(request: Request):
+        """Returns the JSON body, or None if the request isn't JSON."""
+        if "application/json" not in request.headers.get("Content-Type", ""):
+            return None
+
+        return await request.json()
+
+    async def api_analyze(request: Request) -> Response:
+        """
+        Endpoint para realizar un análisis detallado de un jugador usando OpenAI.
+        """
+        try:
+            data = await read_json(request)
+
+            if data is None:
+                return json_response({"error": "Se requiere JSON"}, 400)
+
+            parsed = parse_features([data])
+
+            if not parsed.valid[0]:
+                return json_response({"error": parsed.errors[0]}, 400)
+
+            user_features = parsed.matrix[0].tolist()
+
+            scores = await asyncio.to_thread(profile_scorer.score_one, user_features)
+            position_id = scores["positionId"]
+            physical_id = scores["physicalId"]
+
+            analysis_result = await bounded(openai_service.analyze_player_profile_async(
+                user_features,
+                position_id,
+                physical_id,
+                FEATURES,
+                use_analysis_cache(data, request.headers)
+            ))
+
+            analysis_result["positionName"] = POSITIONS_CATEGORIES.get(position_id, f"Perfil desconocido ({position_id})")
+            analysis_result["physicalName"] = PHYSICAL_CONDITIONS_CATEGORIES.get(physical_id, f"Perfil desconocido ({physical_id})")
+
+            return json_response(analysis_result)
+
+        except Exception as error:
+            return json_response({"error": str(error)}, 500)
+
+    async def api_team_analyze(request: Request) -> Response:
+        """
+        Endpoint para realizar un análisis detallado de un equipo completo usando OpenAI.
+        """
+        try:
+            data = await read_json(request)
+
+            if data is None:
+                return json_response({"error": "Se requiere JSON"}, 400)
+
+            if not isinstance(data, dict) or "players" not in data or not isinstance(data["players"], list):
+                return json_response({"error": "Formato inválido. Se espera un objeto JSON con una lista de jugadores en 'players'"}, 400)
+
+            players_data = data["players"]
+            team_name = data.get("teamName", "Equipo sin nombre")
+            use_cache = use_analysis_cache(data, request.headers)
+            results = []
+
+            scored_players, errors = await asyncio.to_thread(score_team_players, players_data)
+
+            players = [
+                (user_features, position_id, physical_id)
+                for _, _, _, user_features, position_id, physical_id in scored_players
+            ]
+
+            if Config.OPENAI_BATCH_ANALYSIS and len(players) > 1:
+                analyses = await openai_service.analyze_player_batches_async(players, FEATURES, use_cache)
+            else:
+                analyses = await asyncio.gather(*(
+                    bounded(openai_service.analyze_player_profile_async(*player, FEATURES, use_cache))
+                    for player in players
+                ), return_exceptions=True)
+
+            for (i, player_id, player_name, _, position_id, physical_id), analysis_result in zip(scored_players, analyses):
+                if isinstance(analysis_result, Exception):
+                    errors.append({
+                        "playerIndex": i,
+                        "playerName": player_name,
+                        "error": str(analysis_result)
+                    })
+                    continue
+
+                results.append(complete_player_result(analysis_result, player_id, player_name, position_id, physical_id))
+
+            errors.sort(key=lambda error: error["playerIndex"])
+
+            team_analysis = None
+            if len(results) > 1:
+                try:
+                    team_analysis = await bounded(openai_service.analyze_team_async(build_team_data(team_name, results), use_cache))
+                except Exception as e:
+                    team_analysis = {"error": f"Error al analizar el equipo: {str(e)}"}
+
+            return json_response({
+                "success": True,
+                "teamName": team_name,
+                "playerResults": results,
+                "errors": errors,
+                "totalPlayers": len(players_data),
+                "processedPlayers": len(results),
+                "failedPlayers": len(errors),
+                "teamAnalysis": team_analysis
+            })
+
+        except Exception as error:
+            return json_response({"error": str(error)}, 500)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        model_registry.ensure_watching()
+        if job_service is not None:
+            job_service.resume()
+        yield
+        await openai_service.aclose()
+
+    return Starlette(
+        routes=[
+            Route("/api/analyze", api_analyze, methods=["POST"]),
+            Route("/api/team/analyze", api_team_analyze, methods=["POST"]),
+            Mount("/", app=WSGIMiddleware(flask_app, workers=max(1, Config.OPENAI_MAX_CONCURRENCY)))
+        ],
+        lifespan=lifespan
+    )
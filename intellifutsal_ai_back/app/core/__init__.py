@@ -1,2 +1,3 @@
 from .config import Config, ConfigError, get_env
-from .error_handler import register_error_handlers, create_error_response
\ No newline at end of file
+from .error_handler import register_error_handlers, create_error_response
+from .json_provider import JSONFragments, NumpyJSONProvider, OrjsonJSONProvider, get_json_provider_class
\ No newline at end of file
@@ -41,10 +41,76 @@ class Config:
     HOST = get_env("HOST", "0.0.0.0")
     PORT = int(get_env("PORT", "9041"))
 
-    OPENAI_API_KEY = get_env("OPENAI_API_KEY")
+    COMPILED_MODELS = get_env("COMPILED_MODELS", "true").lower() == "true"
+    FUSED_SCALERS = get_env("FUSED_SCALERS", "true").lower() == "true"
+    RELEASE_SKLEARN_MODELS = get_env("RELEASE_SKLEARN_MODELS", "false").lower() == "true"
+    MODEL_ARTIFACTS = get_env("MODEL_ARTIFACTS", "true").lower() == "true"
+    POSITIONS_ARTIFACT_PATH = get_env("POSITIONS_ARTIFACT_PATH", os.path.splitext(POSITIONS_MODEL_PATH)[0] + ".forest")
+    PHYSICAL_CONDITIONS_ARTIFACT_PATH = get_env(
+        "PHYSICAL_CONDITIONS_ARTIFACT_PATH", os.path.splitext(PHYSICAL_CONDITIONS_MODEL_PATH)[0] + ".forest"
+    )
+    MODEL_RELOAD_INTERVAL = float(get_env("MODEL_RELOAD_INTERVAL", "30"))
+    MODEL_RELOAD_MARKER_PATH = get_env("MODEL_RELOAD_MARKER_PATH", "instance/models.reload")
+    POSITIONS_SHADOW_MODEL_PATHS = get_env("POSITIONS_SHADOW_MODEL_PATHS", "")
+    POSITIONS_SHADOW_SCALER_PATHS = get_env("POSITIONS_SHADOW_SCALER_PATHS", "")
+    PHYSICAL_CONDITIONS_SHADOW_MODEL_PATHS = get_env("PHYSICAL_CONDITIONS_SHADOW_MODEL_PATHS", "")
+    PHYSICAL_CONDITIONS_SHADOW_SCALER_PATHS = get_env("PHYSICAL_CONDITIONS_SHADOW_SCALER_PATHS", "")
+    SHADOW_SAMPLE_RATE = float(get_env("SHADOW_SAMPLE_RATE", "0.1"))
+    SHADOW_QUEUE_SIZE = int(get_env("SHADOW_QUEUE_SIZE", "1000"))
+    ADMIN_TOKEN = get_env("ADMIN_TOKEN")
+    PREDICTION_CACHE_SIZE = int(get_env("PREDICTION_CACHE_SIZE", "4096"))
+    PREDICTION_CACHE_TTL = float(get_env("PREDICTION_CACHE_TTL", "3600"))
+
+    JOBS_ENABLED = get_env("JOBS_ENABLED", "true").lower() == "true"
+    JOBS_DB_PATH = get_env("JOBS_DB_PATH", "instance/jobs.sqlite3")
+    JOBS_MAX_WORKERS = int(get_env("JOBS_MAX_WORKERS", "2"))
+    JOBS_STALE_SECONDS = float(get_env("JOBS_STALE_SECONDS", "900"))
+    JOBS_MAX_ATTEMPTS = int(get_env("JOBS_MAX_ATTEMPTS", "3"))
+    JOBS_REQUEUE_INTERVAL = float(get_env("JOBS_REQUEUE_INTERVAL", "60"))
+    JOBS_TTL = float(get_env("JOBS_TTL", "86400"))
 
     REQUEST_TIMEOUT = int(get_env("REQUEST_TIMEOUT", "10"))
     MAX_CONTENT_LENGTH = int(get_env("MAX_CONTENT_LENGTH", "1024000"))
+    JSON_PROVIDER = get_env("JSON_PROVIDER", "orjson")
+    BULK_MAX_CONTENT_LENGTH = int(get_env("BULK_MAX_CONTENT_LENGTH", "1073741824"))
+    BULK_CHUNK_SIZE = int(get_env("BULK_CHUNK_SIZE", "2000"))
+    STREAM_BATCH_SIZE = int(get_env("STREAM_BATCH_SIZE", "64"))
+
+    OPENAI_API_KEY = get_env("OPENAI_API_KEY")
+    OPENAI_API_BASE = get_env("OPENAI_API_BASE")
+    OPENAI_CONNECT_TIMEOUT = float(get_env("OPENAI_CONNECT_TIMEOUT", str(REQUEST_TIMEOUT)))
+    OPENAI_READ_TIMEOUT = float(get_env("OPENAI_READ_TIMEOUT", "60"))
+    OPENAI_POOL_SIZE = int(get_env("OPENAI_POOL_SIZE", "10"))
+    OPENAI_ASYNC_POOL_SIZE = int(get_env("OPENAI_ASYNC_POOL_SIZE", "100"))
+    OPENAI_ASYNC_MAX_CONCURRENCY = int(get_env("OPENAI_ASYNC_MAX_CONCURRENCY", "200"))
+    OPENAI_MAX_RETRIES = int(get_env("OPENAI_MAX_RETRIES", "2"))
+    OPENAI_RETRY_BACKOFF = float(get_env("OPENAI_RETRY_BACKOFF", "0.5"))
+    OPENAI_RETRY_JITTER = float(get_env("OPENAI_RETRY_JITTER", "0.5"))
+    OPENAI_MODEL = get_env("OPENAI_MODEL", "gpt-4o")
+    OPENAI_TEMPERATURE = float(get_env("OPENAI_TEMPERATURE", "0.5"))
+    OPENAI_MAX_TOKENS = int(get_env("OPENAI_MAX_TOKENS", "1500"))
+    OPENAI_MAX_CONCURRENCY = int(get_env("OPENAI_MAX_CONCURRENCY", "8"))
+    OPENAI_SINGLE_FLIGHT = get_env("OPENAI_SINGLE_FLIGHT", "true").lower() == "true"
+    OPENAI_SINGLE_FLIGHT_LOCK_DIR = get_env("OPENAI_SINGLE_FLIGHT_LOCK_DIR", "instance/locks")
+    OPENAI_SINGLE_FLIGHT_TIMEOUT = float(get_env("OPENAI_SINGLE_FLIGHT_TIMEOUT", "30"))
+    OPENAI_CIRCUIT_BREAKER = get_env("OPENAI_CIRCUIT_BREAKER", "true").lower() == "true"
+    OPENAI_BREAKER_FAILURE_RATE = float(get_env("OPENAI_BREAKER_FAILURE_RATE", "0.5"))
+    OPENAI_BREAKER_SLOW_CALL_SECONDS = float(get_env("OPENAI_BREAKER_SLOW_CALL_SECONDS", "30"))
+    OPENAI_BREAKER_WINDOW = int(get_env("OPENAI_BREAKER_WINDOW", "20"))
+    OPENAI_BREAKER_MIN_CALLS = int(get_env("OPENAI_BREAKER_MIN_CALLS", "5"))
+    OPENAI_BREAKER_OPEN_SECONDS = float(get_env("OPENAI_BREAKER_OPEN_SECONDS", "30"))
+    OPENAI_BREAKER_HALF_OPEN_CALLS = int(get_env("OPENAI_BREAKER_HALF_OPEN_CALLS", "1"))
+    OPENAI_BATCH_ANALYSIS = get_env("OPENAI_BATCH_ANALYSIS", "false").lower() == "true"
+    OPENAI_BATCH_MAX_PLAYERS = int(get_env("OPENAI_BATCH_MAX_PLAYERS", "6"))
+    OPENAI_BATCH_MAX_PROMPT_TOKENS = int(get_env("OPENAI_BATCH_MAX_PROMPT_TOKENS", "8000"))
+    OPENAI_BATCH_MAX_COMPLETION_TOKENS = int(get_env("OPENAI_BATCH_MAX_COMPLETION_TOKENS", "4096"))
+    OPENAI_BATCH_TOKENS_PER_PLAYER = int(get_env("OPENAI_BATCH_TOKENS_PER_PLAYER", "650"))
+
+    ANALYSIS_CACHE_ENABLED = get_env("ANALYSIS_CACHE_ENABLED", "true").lower() == "true"
+    ANALYSIS_CACHE_PATH = get_env("ANALYSIS_CACHE_PATH", "instance/analysis_cache.sqlite3")
+    ANALYSIS_CACHE_TTL = float(get_env("ANALYSIS_CACHE_TTL", "86400"))
+    ANALYSIS_CACHE_MAX_ENTRIES = int(get_env("ANALYSIS_CACHE_MAX_ENTRIES", "5000"))
+
 
     @classmethod
     def validate(cls) -> Dict[str, str]:
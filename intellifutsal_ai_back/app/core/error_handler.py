@@ -32,6 +32,11 @@ def register_error_handlers(app):
         """Handles 405 errors (Method not allowed)."""
         return jsonify({"error": "Método no permitido", "code": 405}), 405
 
+    @app.errorhandler(413)
+    def request_entity_too_large(error) -> Tuple[Response, int]:
+        """Handles 413 errors (Request entity too large)."""
+        return jsonify({"error": "El cuerpo de la solicitud es demasiado grande", "code": 413}), 413
+
     @app.errorhandler(415)
     def unsupported_media_type(error) -> Tuple[Response, int]:
         """Handles 415 errors (Unsupported media type)."""
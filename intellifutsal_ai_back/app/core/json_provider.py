@@ -0,0 +1,159 @@
+import logging
+from typing import Any, Dict, Type
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class JSONFragments:
+    """
+    Values encoded once, to be merged into many documents.
+
+    Static payloads repeated across responses (e.g. the descriptions of a
+    cluster, sent once per player) are encoded when the fragments are built
+    instead of on every response. The `splice` method of the app's JSON
+    provider returns them in the form its encoder takes: spliced as is by
+    orjson, encoded as usual by the standard library.
+    """
+
+    __slots__ = ("values", "encoded")
+
+    def __init__(self, values: Dict[str, Any]):
+        """
+        Encodes the values.
+
+        Args:
+            values: Dictionary whose values are JSON serializable.
+        """
+        self.values = dict(values)
+
+        if hasattr(orjson, "Fragment"):
+            self.encoded = {
+                key: orjson.Fragment(orjson.dumps(value, option=orjson.OPT_SORT_KEYS))
+                for key, value in self.values.items()
+            }
+        else:
+            self.encoded = self.values
+
+
+class NumpyJSONProvider(DefaultJSONProvider):
+    """
+    Flask's standard library JSON provider, extended with NumPy values.
+
+    NumPy scalars and arrays (e.g. cluster ids returned by a model) are
+    encoded as their Python equivalents.
+    """
+
+    @staticmethod
+    def default(o: Any) -> Any:
+        """Returns a serializable version of a value the encoder doesn't know."""
+        if isinstance(o, (np.generic, np.ndarray)):
+            return o.tolist()
+
+        return DefaultJSONProvider.default(o)
+
+    def splice(self, fragments: JSONFragments) -> Dict[str, Any]:
+        """
+        Returns pre-encoded values to merge into a document.
+
+        Args:
+            fragments: Values encoded once.
+
+        Returns:
+            Dictionary with the keys of the fragments, in the form this
+            provider encodes fastest.
+        """
+        return fragments.values
+
+
+class OrjsonJSONProvider(NumpyJSONProvider):
+    """
+    JSON provider that encodes responses with orjson.
+
+    Encodes directly to bytes, several times faster than the standard
+    library, with NumPy scalars and arrays supported natively and fragments
+    (orjson 3.9 and later) spliced without re-encoding. The output is the
+    same document as `NumpyJSONProvider`'s, with non-ASCII characters as
+    UTF-8 instead of escapes. Dates, decimals, UUIDs and dataclasses keep
+    Flask's encoding, and documents orjson can't encode (such as integers
+    beyond 64 bits, without fragments) are encoded by the standard library.
+    Requests are still decoded by the standard library, so the bodies
+    accepted don't change.
+    """
+
+    def splice(self, fragments: JSONFragments) -> Dict[str, Any]:
+        """Returns pre-encoded values to merge into a document, spliced as is."""
+        return fragments.encoded
+
+    def encode(self, obj: Any, pretty: bool = False) -> bytes:
+        """
+        Encodes a document to UTF-8 bytes.
+
+        Args:
+            obj: The document.
+            pretty: If True, indents the output with two spaces.
+
+        Returns:
+            The encoded document.
+        """
+        option = (
+            orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            layout = {"indent": 2} if pretty else {"separators": (",", ":")}
+            return super().dumps(obj, ensure_ascii=False, **layout).encode("utf-8")
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        Serializes data as JSON to a string.
+
+        Keyword arguments are those of `json.dumps`; if any is given, the
+        standard library encodes the data.
+        """
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+
+        return self.encode(obj).decode("utf-8")
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Serializes the arguments as a JSON response, like `jsonify`."""
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+
+        return self._app.response_class(self.encode(obj, pretty) + b"\n", mimetype=self.mimetype)
+
+
+def get_json_provider_class(name: str) -> Type[DefaultJSONProvider]:
+    """
+    Returns the JSON provider class configured by `JSON_PROVIDER`.
+
+    Args:
+        name: `orjson`, or `default` for the standard library.
+
+    Returns:
+        The provider class. `orjson` falls back to the standard library if
+        the package isn't installed.
+    """
+    if name == "orjson":
+        if orjson is not None:
+            return OrjsonJSONProvider
+
+        logger.warning("orjson is not installed, using the standard library JSON provider")
+
+    return NumpyJSONProvider
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Sequence
 
 
 class ModelInterface(ABC):
@@ -21,6 +21,38 @@ class ModelInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def predict_batch(self, matrix: Sequence[Sequence[float]]) -> List[int]:
+        """
+        Makes predictions for several feature vectors in a single call.
+
+        Args:
+            matrix: N x len(FEATURES) matrix, one row of features per player.
+
+        Returns:
+            List with one prediction per row, in the same order as the input.
+
+        Raises:
+            RuntimeError: If an error occurs during prediction.
+        """
+        pass
+
+    @abstractmethod
+    def predict_proba_batch(self, matrix: Sequence[Sequence[float]]) -> Any:
+        """
+        Computes class probabilities for several feature vectors in a single call.
+
+        Args:
+            matrix: N x len(FEATURES) matrix, one row of features per player.
+
+        Returns:
+            N x n_classes array of probabilities, columns ordered by class id.
+
+        Raises:
+            RuntimeError: If an error occurs during prediction.
+        """
+        pass
+
     @abstractmethod
     def validate_features(self, features: List[float]) -> Dict[str, str]:
         """
@@ -1 +1 @@
-from .exceptions import ConfigError, ModelLoadError, PredictionError
\ No newline at end of file
+from .exceptions import ConfigError, ModelLoadError, PredictionError, CircuitOpenError
\ No newline at end of file
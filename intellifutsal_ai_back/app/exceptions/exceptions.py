@@ -9,3 +9,7 @@ class ModelLoadError(Exception):
 class PredictionError(Exception):
     """Exception for errors during prediction."""
     pass
+
+class CircuitOpenError(Exception):
+    """Exception for calls rejected while a circuit breaker is open."""
+    pass
\ No newline at end of file
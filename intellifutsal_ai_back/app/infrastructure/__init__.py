@@ -1 +1,9 @@
-from .model_loader import PickleModelLoader, SklearnModelAdapter, ModelLoadError
\ No newline at end of file
+from .model_loader import PickleModelLoader, SklearnModelAdapter, ModelLoadError
+from .compiled_forest import CompiledForest, CompiledForestGroup
+from .model_artifact import MemoryMappedModelLoader, ArtifactScaler
+from .analysis_cache import SQLiteAnalysisCache
+from .single_flight import SingleFlight, file_lock
+from .openai_client import OpenAISessionFactory, PooledSession
+from .circuit_breaker import CircuitBreaker
+from .job_store import SQLiteJobStore
+from .feature_files import FeatureFileWriter, read_feature_chunks, read_json_lines, format_from_media_type, format_from_path, FILE_FORMATS, MEDIA_TYPES
\ No newline at end of file
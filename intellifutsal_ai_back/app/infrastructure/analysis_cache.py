@@ -0,0 +1,158 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteAnalysisCache:
+    """
+    Disk-backed cache for LLM analysis results.
+
+    Entries live in a SQLite database in WAL mode, so every gunicorn worker
+    (and every restart) shares the same cache. Keys are content addresses of
+    the full request sent to the model, values are the raw completion text.
+    Database errors (e.g. `database is locked` under contention) are logged
+    and treated as a miss or a skipped write, so the cache never fails a
+    request.
+    """
+
+    def __init__(self, path: str, ttl: float = 86400.0, max_entries: int = 5000):
+        """
+        Initializes the cache, creating the database if needed.
+
+        Args:
+            path: Path of the SQLite database file.
+            ttl: Seconds an entry stays valid. Zero or less disables expiration.
+            max_entries: Maximum number of entries; the least recently used ones
+                are evicted beyond it.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as connection:
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS analysis_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS analysis_cache_accessed_at ON analysis_cache (accessed_at)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection of the current thread and process.
+
+        Connections are never shared across threads or inherited through a
+        fork, so each gunicorn worker thread opens its own.
+        """
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None or getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+
+        return connection
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """
+        Builds a content-addressed key from everything that shapes a completion.
+
+        Args:
+            **parts: Model name, temperature, prompts, etc.
+
+        Returns:
+            Hex SHA-256 digest of the canonical JSON encoding of the parts.
+        """
+        canonical = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns a cached value if present and not expired.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached value, or None if it's missing, expired or unreadable.
+        """
+        now = time.time()
+        value = None
+
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT value, created_at FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            value, created_at = row
+
+            if self.ttl > 0 and created_at + self.ttl <= now:
+                value = None
+                connection.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+            else:
+                connection.execute("UPDATE analysis_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            # A value already read is still served if only the bookkeeping failed.
+            logger.warning(f"Analysis cache access not recorded: {str(e)}" if value is not None
+                           else f"Analysis cache read skipped: {str(e)}")
+
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Stores a value and evicts expired and least recently used entries.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+        """
+        now = time.time()
+
+        try:
+            connection = self._connection()
+
+            connection.execute(
+                "INSERT OR REPLACE INTO analysis_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+
+            if self.ttl > 0:
+                connection.execute("DELETE FROM analysis_cache WHERE created_at <= ?", (now - self.ttl,))
+
+            if self.max_entries > 0:
+                connection.execute(
+                    """DELETE FROM analysis_cache WHERE key IN (
+                        SELECT key FROM analysis_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )""",
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis cache write skipped: {str(e)}")
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        self._connection().execute("DELETE FROM analysis_cache")
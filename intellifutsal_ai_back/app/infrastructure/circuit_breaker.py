@@ -0,0 +1,209 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Tuple, Type
+from app.exceptions import CircuitOpenError
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for a remote dependency.
+
+    While closed, the outcome of the last `window_size` calls is tracked; a
+    call counts as failed if it raised or took longer than
+    `slow_call_threshold` seconds. Once at least `min_calls` are tracked and
+    the failed fraction reaches `failure_rate_threshold`, the circuit opens
+    and calls are rejected without being attempted. After `open_duration`
+    seconds it turns half-open and lets `half_open_max_calls` probes through:
+    if they succeed it closes again, otherwise it reopens.
+
+    Exceptions listed in `ignored_exceptions` (e.g. client errors, which say
+    nothing about the health of the dependency) are not counted at all.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_rate_threshold: float = 0.5, slow_call_threshold: float = 30.0,
+                 window_size: int = 20, min_calls: int = 5, open_duration: float = 30.0,
+                 half_open_max_calls: int = 1, clock: Callable[[], float] = time.monotonic,
+                 ignored_exceptions: Tuple[Type[BaseException], ...] = ()):
+        """
+        Initializes a closed circuit.
+
+        Args:
+            name: Name of the dependency, for logging.
+            failure_rate_threshold: Fraction of failed calls that opens the circuit.
+            slow_call_threshold: Seconds after which a successful call counts as failed.
+            window_size: Number of recent calls tracked.
+            min_calls: Minimum number of tracked calls before the circuit can open.
+            open_duration: Seconds the circuit stays open before probing.
+            half_open_max_calls: Concurrent probes allowed while half-open.
+            clock: Monotonic time source, in seconds.
+            ignored_exceptions: Exceptions that count neither as failures nor
+                as successes.
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.min_calls = max(1, min_calls)
+        self.open_duration = open_duration
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._clock = clock
+        self.ignored_exceptions = tuple(ignored_exceptions)
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=max(1, window_size))
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self.rejected = 0
+
+    def _transition(self, state: str) -> None:
+        """Changes the state; must be called with the lock held."""
+        if state != self._state:
+            logger.warning(f"Circuit breaker '{self.name}': {self._state} -> {state}")
+
+        self._state = state
+        self._probes = 0
+        self._probe_successes = 0
+
+        if state == self.OPEN:
+            self._opened_at = self._clock()
+        elif state == self.CLOSED:
+            self._outcomes.clear()
+
+    @property
+    def state(self) -> str:
+        """Current state, turning half-open if the open period has elapsed."""
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.open_duration:
+                self._transition(self.HALF_OPEN)
+
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Tells whether a call may be attempted now.
+
+        While half-open, an allowed call takes a probe slot, which must be
+        returned with `record` or `release`.
+
+        Returns:
+            False if the call must be rejected.
+        """
+        with self._lock:
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.open_duration:
+                    self.rejected += 1
+                    return False
+                self._transition(self.HALF_OPEN)
+
+            if self._state == self.HALF_OPEN:
+                if self._probes >= self.half_open_max_calls:
+                    self.rejected += 1
+                    return False
+                self._probes += 1
+
+            return True
+
+    def release(self) -> None:
+        """Returns the slot of an allowed call whose outcome is unknown, e.g. a cancelled stream."""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record(self, succeeded: bool, latency: float = 0.0) -> None:
+        """
+        Records the outcome of an allowed call.
+
+        Args:
+            succeeded: False if the call raised.
+            latency: Duration of the call, in seconds.
+        """
+        failed = not succeeded or latency > self.slow_call_threshold
+
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                if failed:
+                    self._transition(self.OPEN)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_max_calls:
+                        self._transition(self.CLOSED)
+                return
+
+            if self._state == self.OPEN:
+                return
+
+            self._outcomes.append(failed)
+
+            if len(self._outcomes) >= self.min_calls and \
+                    sum(self._outcomes) / len(self._outcomes) >= self.failure_rate_threshold:
+                self._transition(self.OPEN)
+
+    def record_error(self, error: BaseException, latency: float = 0.0) -> None:
+        """
+        Records an allowed call that raised.
+
+        Args:
+            error: The exception raised. Exceptions in `ignored_exceptions`
+                (and non-`Exception` ones, such as a cancellation) only return
+                the call's slot.
+            latency: Duration of the call, in seconds.
+        """
+        if isinstance(error, self.ignored_exceptions) or not isinstance(error, Exception):
+            self.release()
+        else:
+            self.record(False, latency)
+
+    def call(self, function: Callable[[], Any]) -> Any:
+        """
+        Runs a call through the breaker.
+
+        Args:
+            function: Call to the dependency.
+
+        Returns:
+            The result of the call.
+
+        Raises:
+            CircuitOpenError: If the circuit rejects the call.
+            Exception: Whatever the call raised.
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"Servicio '{self.name}' no disponible temporalmente")
+
+        start = self._clock()
+
+        try:
+            result = function()
+        except BaseException as e:
+            self.record_error(e, self._clock() - start)
+            raise
+
+        self.record(True, self._clock() - start)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the breaker's state and counters.
+
+        Returns:
+            Dictionary with the state, tracked calls, failure rate and rejections.
+        """
+        state = self.state
+
+        with self._lock:
+            calls = len(self._outcomes)
+            return {
+                "state": state,
+                "calls": calls,
+                "failureRate": sum(self._outcomes) / calls if calls else 0.0,
+                "rejected": self.rejected
+            }
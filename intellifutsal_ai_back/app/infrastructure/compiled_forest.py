@@ -0,0 +1,543 @@
+import numpy as np
+from typing import Any, Callable, Dict, Optional
+
+
+_FLOAT64_SIGN_BIT = np.uint64(0x8000000000000000)
+
+# Rows traversed at a time by `CompiledForest.apply`.
+_APPLY_BLOCK_ROWS = 512
+
+
+def _float_to_key(values: np.ndarray) -> np.ndarray:
+    """Maps float64 values to uint64 keys that sort in the same order."""
+    bits = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64)
+    return np.where(bits & _FLOAT64_SIGN_BIT, ~bits, bits | _FLOAT64_SIGN_BIT)
+
+
+def _key_to_float(keys: np.ndarray) -> np.ndarray:
+    """Inverse of `_float_to_key`."""
+    bits = np.where(keys & _FLOAT64_SIGN_BIT, keys ^ _FLOAT64_SIGN_BIT, ~keys)
+    return np.ascontiguousarray(bits, dtype=np.uint64).view(np.float64)
+
+
+def _sort_nodes_by_feature(feature: np.ndarray, threshold: np.ndarray, children_left: np.ndarray,
+                           children_right: np.ndarray, values: np.ndarray, roots: np.ndarray):
+    """
+    Renumbers the nodes of a flattened forest so they are grouped by feature.
+
+    With the nodes sorted this way, the per-node input values of a single row
+    are just `np.repeat(row, counts)`, which is much cheaper than a gather.
+
+    Returns:
+        Tuple with the reordered feature, threshold, children_left,
+        children_right, values and roots arrays.
+    """
+    order = np.argsort(feature, kind="stable")
+    new_ids = np.empty_like(order)
+    new_ids[order] = np.arange(len(order), dtype=order.dtype)
+
+    return (
+        np.ascontiguousarray(feature[order]),
+        np.ascontiguousarray(threshold[order]),
+        np.ascontiguousarray(new_ids.take(children_left[order]), dtype=np.intp),
+        np.ascontiguousarray(new_ids.take(children_right[order]), dtype=np.intp),
+        np.ascontiguousarray(values[order]),
+        new_ids.take(roots).astype(np.intp)
+    )
+
+
+class CompiledForest:
+    """
+    Flat-array evaluator for a fitted scikit-learn random forest classifier.
+
+    Every tree of the forest is copied into a single set of contiguous NumPy
+    arrays (features, thresholds, children and leaf values) so a batch can be
+    evaluated for all trees at once, one tree level per iteration. Leaves point
+    to themselves, which lets every sample keep iterating until the deepest tree
+    is exhausted without any per-tree branching.
+
+    The evaluation reproduces sklearn's own arithmetic: inputs are compared as
+    float32 values against float64 thresholds, leaf probabilities are summed
+    tree by tree in estimator order and averaged before the argmax, so the
+    resulting labels are identical to `model.predict`.
+
+    A forest can also be fused with its `StandardScaler` (see `fuse_scaler`), in
+    which case the thresholds live in the raw feature space and the input is
+    used as is, without any scaling step.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, children_left: np.ndarray,
+                 children_right: np.ndarray, values: np.ndarray, roots: np.ndarray, max_depth: int,
+                 classes: np.ndarray, n_features: int, scaler_fused: bool = False):
+        """
+        Initializes the evaluator from already flattened arrays.
+
+        Args:
+            feature: Feature index tested by each node (0 for leaves).
+            threshold: Split threshold of each node.
+            children_left: Left child of each node, leaves point to themselves.
+            children_right: Right child of each node, leaves point to themselves.
+            values: Class probabilities stored in each node, one row per node.
+            roots: Index of the root node of every tree.
+            max_depth: Depth of the deepest tree.
+            classes: Labels of the classes, in the order of the value columns.
+            n_features: Number of features expected in each input row.
+            scaler_fused: True if the thresholds already include the scaler, so
+                the input is raw float64 features instead of scaled float32 ones.
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.values = values
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes = classes
+        self.n_features = n_features
+        self.scaler_fused = scaler_fused
+        self.input_dtype = np.float64 if scaler_fused else np.float32
+        self.n_trees = len(roots)
+
+        # Node counts per feature, only usable when the nodes are grouped by feature.
+        self.feature_counts = None
+        if len(feature) and np.all(feature[1:] >= feature[:-1]):
+            self.feature_counts = np.bincount(feature, minlength=n_features)
+
+    @classmethod
+    def from_sklearn(cls, model: Any) -> "CompiledForest":
+        """
+        Flattens a fitted scikit-learn forest classifier.
+
+        Args:
+            model: A fitted `RandomForestClassifier` (or any single-output forest
+                of `DecisionTreeClassifier` estimators).
+
+        Returns:
+            The compiled forest.
+
+        Raises:
+            ValueError: If the model is not a supported forest.
+        """
+        estimators = getattr(model, "estimators_", None)
+
+        if not estimators or not hasattr(model, "classes_"):
+            raise ValueError(f"Modelo no soportado para compilación: {type(model).__name__}")
+
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise ValueError("Solo se soportan bosques de una única salida")
+
+        n_classes = len(model.classes_)
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+
+        for estimator in estimators:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.intp))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold).astype(np.float64))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            values.append(np.asarray(tree.value[:, 0, :n_classes], dtype=np.float64))
+            roots.append(offset)
+
+            offset += tree.node_count
+
+        feature, threshold, children_left, children_right, values, roots = _sort_nodes_by_feature(
+            np.concatenate(features), np.concatenate(thresholds), np.concatenate(lefts),
+            np.concatenate(rights), np.concatenate(values), np.asarray(roots, dtype=np.intp)
+        )
+
+        return cls(
+            feature=feature,
+            threshold=threshold,
+            children_left=children_left,
+            children_right=children_right,
+            values=values,
+            roots=roots,
+            max_depth=max(estimator.tree_.max_depth for estimator in estimators),
+            classes=np.asarray(model.classes_),
+            n_features=int(model.n_features_in_)
+        )
+
+    def fuse_scaler(self, scaler: Any) -> "CompiledForest":
+        """
+        Folds a fitted `StandardScaler` into the split thresholds.
+
+        sklearn sends a raw value `x` to the left child when
+        `float32((x - mean) / scale) <= threshold`. That expression is monotone
+        in `x`, so for every split there is a largest float64 `x` satisfying it;
+        it is found by bisecting over the ordered float64 bit patterns. Using it
+        as the new threshold gives exactly the same decisions on raw input,
+        including rounding at the boundaries.
+
+        Args:
+            scaler: Fitted `StandardScaler` used to train the forest.
+
+        Returns:
+            A new compiled forest that consumes raw features.
+
+        Raises:
+            ValueError: If the forest is already fused or the scaler is not supported.
+        """
+        if self.scaler_fused:
+            raise ValueError("El modelo ya incluye el escalador")
+
+        if not hasattr(scaler, "with_mean") or not hasattr(scaler, "with_std"):
+            raise ValueError(f"Escalador no soportado para fusión: {type(scaler).__name__}")
+
+        mean = scaler.mean_ if scaler.with_mean else None
+        scale = scaler.scale_ if scaler.with_std else None
+
+        mean = np.zeros(self.n_features) if mean is None else np.asarray(mean, dtype=np.float64)
+        scale = np.ones(self.n_features) if scale is None else np.asarray(scale, dtype=np.float64)
+
+        if mean.shape != (self.n_features,) or scale.shape != (self.n_features,) or not (scale > 0).all():
+            raise ValueError("Parámetros del escalador incompatibles con el modelo")
+
+        is_split = np.isfinite(self.threshold)
+        split_threshold = self.threshold[is_split]
+        split_mean = mean.take(self.feature[is_split])
+        split_scale = scale.take(self.feature[is_split])
+
+        def goes_left(raw_values: np.ndarray) -> np.ndarray:
+            with np.errstate(over="ignore", invalid="ignore"):
+                scaled = ((raw_values - split_mean) / split_scale).astype(np.float32)
+            return scaled <= split_threshold
+
+        low = np.full(split_threshold.shape, _float_to_key(np.array([-np.finfo(np.float64).max]))[0])
+        high = np.full(split_threshold.shape, _float_to_key(np.array([np.finfo(np.float64).max]))[0])
+        always_left = goes_left(_key_to_float(high))
+        always_right = ~goes_left(_key_to_float(low))
+
+        # Invariant: goes_left(low) is True and goes_left(high) is False.
+        while True:
+            pending = high - low > np.uint64(1)
+            if not pending.any():
+                break
+            middle = low + (high - low) // np.uint64(2)
+            middle_left = goes_left(_key_to_float(middle))
+            low = np.where(pending & middle_left, middle, low)
+            high = np.where(pending & ~middle_left, middle, high)
+
+        raw_threshold = _key_to_float(low)
+        raw_threshold = np.where(always_left, np.finfo(np.float64).max, raw_threshold)
+        raw_threshold = np.where(always_right, -np.inf, raw_threshold)
+
+        threshold = self.threshold.copy()
+        threshold[is_split] = raw_threshold
+
+        return CompiledForest(
+            feature=self.feature,
+            threshold=threshold,
+            children_left=self.children_left,
+            children_right=self.children_right,
+            values=self.values,
+            roots=self.roots,
+            max_depth=self.max_depth,
+            classes=self.classes,
+            n_features=self.n_features,
+            scaler_fused=True
+        )
+
+    def _prepare_input(self, matrix: Any) -> np.ndarray:
+        """
+        Validates the input matrix and converts it to the dtype of the trees.
+
+        Args:
+            matrix: N x n_features matrix of features (raw ones if the scaler
+                is fused, scaled ones otherwise).
+
+        Returns:
+            Contiguous array of `input_dtype`.
+
+        Raises:
+            ValueError: If the matrix has an invalid shape or non finite values.
+        """
+        input_array = np.asarray(matrix, dtype=np.float64)
+
+        if input_array.ndim != 2 or input_array.shape[1] != self.n_features:
+            raise ValueError(
+                f"Se esperaba una matriz de N x {self.n_features} características, "
+                f"pero se recibió una de forma {input_array.shape}"
+            )
+
+        if not np.isfinite(input_array).all():
+            raise ValueError("La entrada contiene valores no finitos")
+
+        return np.ascontiguousarray(input_array, dtype=self.input_dtype)
+
+    def apply(self, matrix: Any) -> np.ndarray:
+        """
+        Finds the leaf reached by every sample in every tree.
+
+        Args:
+            matrix: N x n_features matrix of features.
+
+        Returns:
+            N x n_trees array with the global index of the reached leaves.
+        """
+        input_array = self._prepare_input(matrix)
+        n_samples = input_array.shape[0]
+
+        if n_samples == 1:
+            # A single row is cheaper to resolve by evaluating every split of
+            # the forest at once and then just following the chosen children.
+            if self.feature_counts is not None:
+                node_values = np.repeat(input_array[0], self.feature_counts)
+            else:
+                node_values = input_array[0].take(self.feature)
+
+            go_right = node_values > self.threshold
+            next_nodes = np.where(go_right, self.children_right, self.children_left)
+            nodes = self.roots
+
+            for _ in range(self.max_depth):
+                nodes = next_nodes.take(nodes)
+
+            return nodes[np.newaxis, :]
+
+        # Large batches are traversed in blocks of rows, so the per-level
+        # node arrays stay in cache.
+        leaves = np.empty(
+            (n_samples, len(self.roots)), dtype=np.result_type(self.roots, self.children_left, self.children_right)
+        )
+        block_rows = min(n_samples, _APPLY_BLOCK_ROWS)
+        row_offsets = (np.arange(block_rows, dtype=np.intp) * self.n_features)[:, np.newaxis]
+
+        for start in range(0, n_samples, block_rows or 1):
+            block = input_array[start:start + block_rows]
+            flat_input = block.ravel()
+            block_offsets = row_offsets[:len(block)]
+            nodes = np.repeat(self.roots[np.newaxis, :], len(block), axis=0)
+
+            for _ in range(self.max_depth):
+                sample_values = flat_input.take(block_offsets + self.feature.take(nodes))
+                go_right = sample_values > self.threshold.take(nodes)
+                nodes = np.where(go_right, self.children_right.take(nodes), self.children_left.take(nodes))
+
+            leaves[start:start + len(block)] = nodes
+
+        return leaves
+
+    def predict_proba(self, matrix: Any) -> np.ndarray:
+        """
+        Computes the averaged class probabilities of the forest.
+
+        Args:
+            matrix: N x n_features matrix of features.
+
+        Returns:
+            N x n_classes array of probabilities.
+        """
+        leaves = self.apply(matrix)
+
+        # Summing over the leading (tree) axis accumulates one tree at a time,
+        # in the same order as sklearn's _accumulate_prediction.
+        proba = self.values.take(leaves.T, axis=0).sum(axis=0)
+        proba /= self.n_trees
+
+        return proba
+
+    def predict(self, matrix: Any) -> np.ndarray:
+        """
+        Predicts the class label of every sample.
+
+        Args:
+            matrix: N x n_features matrix of features.
+
+        Returns:
+            Array with one class label per sample.
+        """
+        if len(matrix) == 0:
+            return self.classes[:0]
+
+        return self.classes.take(np.argmax(self.predict_proba(matrix), axis=1))
+
+
+def sample_feature_space(feature_validations: Dict[str, Dict[str, Any]], feature_names,
+                         n_samples: int = 2000, seed: int = 0) -> np.ndarray:
+    """
+    Generates a reproducible grid of raw feature vectors over the valid ranges.
+
+    Each column is an evenly spaced grid from the feature's min to its max
+    (both included), shuffled independently so the rows mix every region of
+    every feature (a Latin hypercube over the `FEATURE_VALIDATIONS` box).
+
+    Args:
+        feature_validations: Min/max validation rules per feature.
+        feature_names: Ordered list of feature names.
+        n_samples: Number of rows to generate.
+        seed: Seed for the shuffling, so the samples are reproducible.
+
+    Returns:
+        n_samples x len(feature_names) float64 matrix.
+    """
+    rng = np.random.default_rng(seed)
+    columns = []
+
+    for name in feature_names:
+        validation = feature_validations[name]
+        column = np.linspace(validation["min"], validation["max"], n_samples)
+        rng.shuffle(column)
+        columns.append(column)
+
+    return np.column_stack(columns)
+
+
+def check_parity(compiled: CompiledForest, reference_predict: Callable[[np.ndarray], np.ndarray],
+                 samples: np.ndarray, seed: int = 0) -> Optional[str]:
+    """
+    Compares the compiled forest against a reference prediction function.
+
+    Besides the given samples, a second set is built by replacing every column
+    with split thresholds of that feature (and their neighbouring values in
+    the forest's input dtype), which exercises the `<=` decision boundary of
+    every node.
+
+    Args:
+        compiled: Compiled forest to check.
+        reference_predict: Function producing the expected labels for an input
+            matrix in the same feature space the compiled forest consumes.
+        samples: Feature matrix to compare on.
+        seed: Seed used to pick the boundary samples.
+
+    Returns:
+        None if every label matches, otherwise a description of the mismatch.
+    """
+    rng = np.random.default_rng(seed)
+    dtype = compiled.input_dtype
+    boundary_samples = np.array(samples, dtype=np.float64, copy=True)
+    is_split = np.isfinite(compiled.threshold)
+
+    for column in range(compiled.n_features):
+        column_thresholds = compiled.threshold[is_split & (compiled.feature == column)]
+
+        if column_thresholds.size == 0:
+            continue
+
+        picked = rng.choice(column_thresholds, size=len(boundary_samples)).astype(dtype)
+        shift = rng.integers(-1, 2, size=len(boundary_samples))
+        picked = np.where(shift < 0, np.nextafter(picked, dtype(-np.inf)), picked)
+        picked = np.where(shift > 0, np.nextafter(picked, dtype(np.inf)), picked)
+        boundary_samples[:, column] = np.where(np.isfinite(picked), picked, boundary_samples[:, column])
+
+    for check_samples in (samples, boundary_samples):
+        expected = reference_predict(check_samples)
+        actual = compiled.predict(check_samples)
+        mismatches = int(np.count_nonzero(expected != actual))
+
+        if mismatches:
+            return f"{mismatches} de {len(check_samples)} predicciones no coinciden con el modelo original"
+
+    return None
+
+
+class CompiledForestGroup:
+    """
+    Evaluates several compiled forests over the same input in one traversal.
+
+    The trees of every forest are concatenated into a single `CompiledForest`
+    (leaf values padded with zeros up to the widest class count), so all of
+    them are walked together; probabilities are then summed per forest over
+    its own slice of trees, in the same order as each forest on its own.
+    """
+
+    def __init__(self, forests):
+        """
+        Builds the merged forest.
+
+        Args:
+            forests: Compiled forests sharing the same input (feature count and
+                scaling), e.g. the position and physical condition models.
+
+        Raises:
+            ValueError: If the forests don't share the same input.
+        """
+        forests = list(forests)
+
+        if not forests:
+            raise ValueError("Se requiere al menos un modelo")
+
+        if len({(forest.n_features, forest.scaler_fused) for forest in forests}) != 1:
+            raise ValueError("Los modelos no comparten el mismo formato de entrada")
+
+        max_classes = max(len(forest.classes) for forest in forests)
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        self.tree_slices = []
+        node_offset = 0
+        tree_offset = 0
+
+        for forest in forests:
+            padded_values = np.zeros((len(forest.values), max_classes), dtype=np.float64)
+            padded_values[:, :len(forest.classes)] = forest.values
+
+            features.append(forest.feature)
+            thresholds.append(forest.threshold)
+            lefts.append(forest.children_left + node_offset)
+            rights.append(forest.children_right + node_offset)
+            values.append(padded_values)
+            roots.append(forest.roots + node_offset)
+
+            self.tree_slices.append(slice(tree_offset, tree_offset + forest.n_trees))
+            node_offset += len(forest.feature)
+            tree_offset += forest.n_trees
+
+        feature, threshold, children_left, children_right, values, roots = _sort_nodes_by_feature(
+            np.concatenate(features), np.concatenate(thresholds), np.concatenate(lefts),
+            np.concatenate(rights), np.concatenate(values), np.concatenate(roots)
+        )
+
+        self.forests = forests
+        self.forest = CompiledForest(
+            feature=feature,
+            threshold=threshold,
+            children_left=children_left,
+            children_right=children_right,
+            values=values,
+            roots=roots,
+            max_depth=max(forest.max_depth for forest in forests),
+            classes=np.arange(max_classes),
+            n_features=forests[0].n_features,
+            scaler_fused=forests[0].scaler_fused
+        )
+
+    def predict_proba(self, matrix: Any):
+        """
+        Computes the class probabilities of every forest.
+
+        Args:
+            matrix: N x n_features matrix of features.
+
+        Returns:
+            List with one N x n_classes probability array per forest.
+        """
+        leaves = self.forest.apply(matrix)
+        probabilities = []
+
+        for forest, tree_slice in zip(self.forests, self.tree_slices):
+            proba = self.forest.values.take(leaves[:, tree_slice].T, axis=0).sum(axis=0)
+            proba = proba[:, :len(forest.classes)]
+            proba /= forest.n_trees
+            probabilities.append(proba)
+
+        return probabilities
+
+    def predict(self, matrix: Any):
+        """
+        Predicts the class labels of every forest.
+
+        Args:
+            matrix: N x n_features matrix of features.
+
+        Returns:
+            List with one array of labels per forest.
+        """
+        if len(matrix) == 0:
+            return [forest.classes[:0] for forest in self.forests]
+
+        return [
+            forest.classes.take(np.argmax(proba, axis=1))
+            for forest, proba in zip(self.forests, self.predict_proba(matrix))
+        ]
@@ -0,0 +1,253 @@
+import io
+import json
+import os
+from typing import Any, BinaryIO, Iterator, List, Optional, Sequence, Union
+import pandas as pd
+
+
+CSV = "csv"
+PARQUET = "parquet"
+NDJSON = "ndjson"
+
+FILE_FORMATS = (CSV, PARQUET, NDJSON)
+
+MEDIA_TYPES = {
+    CSV: "text/csv",
+    PARQUET: "application/vnd.apache.parquet",
+    NDJSON: "application/x-ndjson",
+}
+
+_FORMAT_ALIASES = {
+    "text/csv": CSV,
+    "application/csv": CSV,
+    "application/vnd.apache.parquet": PARQUET,
+    "application/x-parquet": PARQUET,
+    "application/parquet": PARQUET,
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+}
+
+
+def format_from_path(path: str) -> Optional[str]:
+    """
+    Returns the file format of a path, from its extension.
+
+    Args:
+        path: Path of the file.
+
+    Returns:
+        One of `FILE_FORMATS`, or None if the extension isn't known.
+    """
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    return {"jsonl": NDJSON, "pq": PARQUET}.get(extension, extension if extension in FILE_FORMATS else None)
+
+
+def format_from_media_type(media_type: Optional[str]) -> Optional[str]:
+    """
+    Returns the file format of a media type.
+
+    Args:
+        media_type: Media type without parameters, e.g. `text/csv`.
+
+    Returns:
+        One of `FILE_FORMATS`, or None if the media type isn't supported.
+    """
+    return _FORMAT_ALIASES.get((media_type or "").lower())
+
+
+def _pyarrow():
+    """Imports pyarrow, only needed for Parquet files."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("El formato Parquet requiere el paquete pyarrow")
+
+    return pyarrow
+
+
+def read_feature_chunks(source: Union[str, BinaryIO], file_format: str, chunk_size: int,
+                        text_columns: Sequence[str] = ("id", "name")) -> Iterator[pd.DataFrame]:
+    """
+    Reads a tabular file in chunks of rows.
+
+    CSV and NDJSON (one JSON object per line) files are read sequentially,
+    so `source` can be a non-seekable stream such as a request body. Parquet
+    files are read one batch of rows at a time, but need a path or a
+    seekable file.
+
+    Args:
+        source: Path or binary file to read.
+        file_format: One of `FILE_FORMATS`.
+        chunk_size: Maximum number of rows per chunk.
+        text_columns: Columns read as text, so identifiers keep leading zeros.
+
+    Yields:
+        One `DataFrame` per chunk, with the columns of the file.
+
+    Raises:
+        ValueError: If the format isn't supported or the file can't be read.
+    """
+    if file_format == CSV:
+        try:
+            reader = pd.read_csv(
+                source, chunksize=chunk_size, encoding="utf-8-sig",
+                dtype={column: str for column in text_columns}
+            )
+            with reader:
+                yield from reader
+        except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+            raise ValueError(f"Archivo CSV inválido: {str(e)}")
+
+    elif file_format == PARQUET:
+        pyarrow = _pyarrow()
+
+        try:
+            parquet_file = pyarrow.parquet.ParquetFile(source)
+        except pyarrow.ArrowException as e:
+            raise ValueError(f"Archivo Parquet inválido: {str(e)}")
+
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
+    elif file_format == NDJSON:
+        try:
+            # Values are kept as sent (no type inference), like a JSON body.
+            reader = pd.read_json(source, lines=True, chunksize=chunk_size, dtype=False, convert_dates=False)
+            with reader:
+                yield from reader
+        except ValueError as e:
+            raise ValueError(f"Archivo NDJSON inválido: {str(e)}")
+
+    else:
+        raise ValueError(f"Formato de archivo no soportado: {file_format}")
+
+
+def read_json_lines(source: BinaryIO, batch_size: int) -> Iterator[List[Any]]:
+    """
+    Reads the values of an NDJSON stream in small batches.
+
+    Lines are decoded one at a time, so only one batch is held however long
+    the stream is, and a batch is yielded as soon as it's complete. Blank
+    lines are skipped, and lines that aren't valid JSON are returned as None
+    instead of aborting the stream.
+
+    Args:
+        source: Binary stream with one JSON value per line, e.g. a request body.
+        batch_size: Maximum number of values per batch.
+
+    Yields:
+        Lists of decoded values, in stream order.
+    """
+    if isinstance(source, io.RawIOBase):
+        # Raw streams would be read one byte at a time by readline.
+        source = io.BufferedReader(source, 1 << 16)
+
+    batch = []
+    first_line = True
+
+    for line in source:
+        if first_line:
+            line = line.lstrip(b"\xef\xbb\xbf")
+            first_line = False
+
+        line = line.strip()
+
+        if not line:
+            continue
+
+        try:
+            batch.append(json.loads(line))
+        except ValueError:
+            batch.append(None)
+
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+class FeatureFileWriter:
+    """
+    Incremental writer of tabular files.
+
+    Every chunk written is encoded right away and its bytes returned, so a
+    file can be streamed to a client (or appended to disk) without holding
+    more than one chunk. Parquet files get one row group per chunk, and
+    their footer is returned by `close`.
+    """
+
+    def __init__(self, file_format: str):
+        """
+        Initializes the writer.
+
+        Args:
+            file_format: One of `FILE_FORMATS`.
+
+        Raises:
+            ValueError: If the format isn't supported.
+        """
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"Formato de archivo no soportado: {file_format}")
+
+        self.file_format = file_format
+        self._header_written = False
+        self._buffer = io.BytesIO()
+        self._parquet_writer = None
+        self._schema = None
+
+    def _drain(self) -> bytes:
+        """Returns and discards the bytes encoded so far."""
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def write(self, frame: pd.DataFrame) -> bytes:
+        """
+        Encodes a chunk of rows.
+
+        Args:
+            frame: Rows to write. Every chunk must have the same columns.
+
+        Returns:
+            The encoded bytes of the chunk.
+        """
+        if self.file_format == CSV:
+            data = frame.to_csv(index=False, header=not self._header_written, lineterminator="\n")
+            self._header_written = True
+            return data.encode("utf-8")
+
+        if self.file_format == NDJSON:
+            if frame.empty:
+                return b""
+            data = frame.to_json(orient="records", lines=True, force_ascii=False)
+            return (data if data.endswith("\n") else data + "\n").encode("utf-8")
+
+        pyarrow = _pyarrow()
+        table = pyarrow.Table.from_pandas(frame, preserve_index=False)
+
+        if self._parquet_writer is None:
+            self._schema = table.schema
+            self._parquet_writer = pyarrow.parquet.ParquetWriter(self._buffer, self._schema)
+        else:
+            table = table.cast(self._schema)
+
+        self._parquet_writer.write_table(table)
+        return self._drain()
+
+    def close(self) -> bytes:
+        """
+        Finishes the file.
+
+        Returns:
+            The remaining bytes of the file (the Parquet footer).
+        """
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+        return self._drain()
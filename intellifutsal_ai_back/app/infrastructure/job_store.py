@@ -0,0 +1,300 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+
+class SQLiteJobStore:
+    """
+    Disk-backed store of asynchronous jobs.
+
+    Jobs live in a SQLite database in WAL mode shared by every gunicorn
+    worker, so their status can be polled from any worker and survives
+    restarts. Each job records the worker running it, so jobs left behind
+    by a dead worker can be queued again.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    def __init__(self, path: str, ttl: float = 86400.0):
+        """
+        Initializes the store, creating the database if needed.
+
+        Args:
+            path: Path of the SQLite database file.
+            ttl: Seconds finished jobs are kept. Zero or less keeps them forever.
+        """
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as connection:
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    partial TEXT,
+                    result TEXT,
+                    error TEXT,
+                    owner TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection of the current thread and process.
+
+        Connections are never shared across threads or inherited through a
+        fork, so each gunicorn worker thread opens its own.
+        """
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None or getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+
+        return connection
+
+    @staticmethod
+    def owner() -> str:
+        """Returns the identity of the current process, as `host:pid`."""
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def create(self, kind: str, payload: Dict[str, Any]) -> str:
+        """
+        Stores a new queued job.
+
+        Args:
+            kind: Job type, used to pick its handler.
+            payload: JSON serializable input of the job.
+
+        Returns:
+            The job id.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+
+        self._connection().execute(
+            "INSERT INTO jobs (id, kind, status, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, self.QUEUED, json.dumps(payload, ensure_ascii=False), now, now)
+        )
+
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns a job.
+
+        Args:
+            job_id: Job id.
+
+        Returns:
+            Dictionary with the job's fields (JSON fields decoded), or None if
+            it doesn't exist.
+        """
+        row = self._connection().execute(
+            "SELECT id, kind, status, payload, partial, result, error, owner, attempts, created_at, updated_at "
+            "FROM jobs WHERE id = ?",
+            (job_id,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            "id": row[0],
+            "kind": row[1],
+            "status": row[2],
+            "payload": json.loads(row[3]),
+            "partial": json.loads(row[4]) if row[4] is not None else None,
+            "result": json.loads(row[5]) if row[5] is not None else None,
+            "error": row[6],
+            "owner": row[7],
+            "attempts": row[8],
+            "createdAt": row[9],
+            "updatedAt": row[10]
+        }
+
+    def claim(self, job_id: str) -> bool:
+        """
+        Marks a queued job as running in the current process.
+
+        Args:
+            job_id: Job id.
+
+        Returns:
+            False if the job is no longer queued, e.g. another worker claimed it.
+        """
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = ?, owner = ?, attempts = attempts + 1, updated_at = ? "
+            "WHERE id = ? AND status = ?",
+            (self.RUNNING, self.owner(), time.time(), job_id, self.QUEUED)
+        )
+
+        return cursor.rowcount == 1
+
+    def update_partial(self, job_id: str, partial: Dict[str, Any]) -> bool:
+        """
+        Stores the partial results of a job running in the current process.
+
+        Args:
+            job_id: Job id.
+            partial: JSON serializable partial results.
+
+        Returns:
+            False if the job is no longer running in this process, e.g. it was
+            requeued as abandoned and another worker claimed it.
+        """
+        cursor = self._connection().execute(
+            "UPDATE jobs SET partial = ?, updated_at = ? WHERE id = ? AND status = ? AND owner = ?",
+            (json.dumps(partial, ensure_ascii=False), time.time(), job_id, self.RUNNING, self.owner())
+        )
+
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> bool:
+        """
+        Stores the final result of a job running in the current process.
+
+        Args:
+            job_id: Job id.
+            result: JSON serializable result.
+
+        Returns:
+            False if the job is no longer running in this process.
+        """
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = ?, result = ?, updated_at = ? WHERE id = ? AND status = ? AND owner = ?",
+            (self.COMPLETED, json.dumps(result, ensure_ascii=False), time.time(), job_id, self.RUNNING, self.owner())
+        )
+
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: str, error: str) -> bool:
+        """
+        Marks a job running in the current process as failed.
+
+        Args:
+            job_id: Job id.
+            error: Error message.
+
+        Returns:
+            False if the job is no longer running in this process.
+        """
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ? AND status = ? AND owner = ?",
+            (self.FAILED, error, time.time(), job_id, self.RUNNING, self.owner())
+        )
+
+        return cursor.rowcount == 1
+
+    def queued(self, limit: int = 100) -> List[str]:
+        """
+        Returns the oldest queued jobs.
+
+        Args:
+            limit: Maximum number of ids.
+
+        Returns:
+            Job ids, oldest first.
+        """
+        rows = self._connection().execute(
+            "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT ?",
+            (self.QUEUED, limit)
+        ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def requeue_abandoned(self, stale_after: float, max_attempts: int = 3) -> int:
+        """
+        Queues again the running jobs whose worker is gone.
+
+        A job is abandoned if its owner process no longer exists on this host,
+        or if it hasn't been updated in `stale_after` seconds. Jobs that have
+        already been attempted `max_attempts` times are marked as failed
+        instead. Expired finished jobs are removed as well.
+
+        Args:
+            stale_after: Seconds without updates after which a running job is abandoned.
+            max_attempts: Maximum number of times a job is started.
+
+        Returns:
+            Number of jobs queued again.
+        """
+        connection = self._connection()
+        now = time.time()
+        hostname = socket.gethostname()
+        requeued = 0
+
+        rows = connection.execute(
+            "SELECT id, owner, attempts, updated_at FROM jobs WHERE status = ?", (self.RUNNING,)
+        ).fetchall()
+
+        for job_id, owner, attempts, updated_at in rows:
+            host, _, pid = (owner or "").rpartition(":")
+
+            if now - updated_at < stale_after and (host != hostname or _process_exists(pid)):
+                continue
+
+            if attempts >= max_attempts:
+                connection.execute(
+                    "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ? AND status = ? AND owner = ?",
+                    (self.FAILED, "Trabajo abandonado demasiadas veces", now, job_id, self.RUNNING, owner)
+                )
+                continue
+
+            cursor = connection.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, updated_at = ? WHERE id = ? AND status = ? AND owner = ?",
+                (self.QUEUED, now, job_id, self.RUNNING, owner)
+            )
+            requeued += cursor.rowcount
+
+        if self.ttl > 0:
+            connection.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at <= ?",
+                (self.COMPLETED, self.FAILED, now - self.ttl)
+            )
+
+        return requeued
+
+
+def _process_exists(pid: str) -> bool:
+    """
+    Tells whether a process of this host is alive.
+
+    Args:
+        pid: Process id, as text.
+
+    Returns:
+        True if it exists (or can't be checked).
+    """
+    if not pid.isdigit():
+        return False
+
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+
+    return True
@@ -0,0 +1,265 @@
+import hashlib
+import json
+import logging
+import os
+import struct
+import numpy as np
+from typing import Any, Dict, Optional, Sequence, Tuple
+from app.exceptions import ModelLoadError
+from .compiled_forest import CompiledForest, check_parity
+
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_MAGIC = b"IFFOREST"
+ARTIFACT_FORMAT_VERSION = 1
+
+# Magic, format version and header length.
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGNMENT = 64
+
+_FOREST_ARRAYS = ("feature", "threshold", "children_left", "children_right", "values", "roots")
+
+
+class ArtifactScaler:
+    """
+    Standardization step of a model artifact whose scaler isn't fused.
+
+    Applies the same float64 arithmetic as `StandardScaler.transform`, from
+    the mean and scale arrays stored in the artifact.
+    """
+
+    def __init__(self, mean: Optional[np.ndarray], scale: Optional[np.ndarray]):
+        """
+        Initializes the scaler.
+
+        Args:
+            mean: Mean of each feature, or None if the data isn't centered.
+            scale: Scale of each feature, or None if the data isn't scaled.
+        """
+        self.mean_ = mean
+        self.scale_ = scale
+
+    def transform(self, matrix: Any) -> np.ndarray:
+        """
+        Standardizes a feature matrix.
+
+        Args:
+            matrix: N x n_features matrix of raw features.
+
+        Returns:
+            The scaled float64 matrix.
+        """
+        scaled = np.array(matrix, dtype=np.float64, copy=True)
+
+        if self.mean_ is not None:
+            scaled -= self.mean_
+        if self.scale_ is not None:
+            scaled /= self.scale_
+
+        return scaled
+
+
+def file_digest(path: str) -> str:
+    """Returns the SHA-256 of a file, in hex."""
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def _aligned(offset: int) -> int:
+    """Rounds an offset up to the array alignment."""
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class MemoryMappedModelLoader:
+    """
+    Loader for models stored as flat binary artifacts.
+
+    An artifact holds a compiled forest (and the scaler parameters, unless
+    the scaler is fused into it) as a small JSON header followed by its
+    contiguous, 64-byte aligned arrays. Loading maps the file read-only with
+    `np.memmap`, so startup doesn't deserialize anything and every process
+    on the host shares the same pages of the OS page cache.
+
+    Layout: `IFFOREST` magic, format version and header length (little
+    endian uint32), the JSON header, then the arrays at the offsets it lists.
+    """
+
+    @staticmethod
+    def export(path: str, compiled_model: CompiledForest, scaler: Any,
+               sources: Sequence[str] = ()) -> None:
+        """
+        Writes a compiled forest as an artifact, atomically replacing `path`.
+
+        Args:
+            path: Path of the artifact file.
+            compiled_model: Compiled forest to store.
+            scaler: Fitted `StandardScaler` of the model. Only its parameters
+                are stored, and only if the forest doesn't have it fused.
+            sources: Files the artifact was built from (model and scaler
+                pickles). Their digests are recorded so a stale artifact can
+                be detected.
+        """
+        arrays = {name: getattr(compiled_model, name) for name in _FOREST_ARRAYS}
+
+        if not compiled_model.scaler_fused:
+            if getattr(scaler, "with_mean", True) and getattr(scaler, "mean_", None) is not None:
+                arrays["scaler_mean"] = scaler.mean_
+            if getattr(scaler, "with_std", True) and getattr(scaler, "scale_", None) is not None:
+                arrays["scaler_scale"] = scaler.scale_
+
+        arrays = {
+            name: np.ascontiguousarray(array, dtype=np.dtype(array.dtype).newbyteorder("<"))
+            for name, array in arrays.items()
+        }
+
+        header = {
+            "maxDepth": int(compiled_model.max_depth),
+            "nFeatures": int(compiled_model.n_features),
+            "scalerFused": bool(compiled_model.scaler_fused),
+            "classes": np.asarray(compiled_model.classes).tolist(),
+            "sources": {os.path.basename(source): file_digest(source) for source in sources},
+            "arrays": {}
+        }
+
+        # Offsets depend on the header length, which depends on the offsets:
+        # lay the arrays out until the header stops growing.
+        header_length = 0
+        while True:
+            offset = _aligned(_PREAMBLE.size + header_length)
+            for name, array in arrays.items():
+                header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+                offset = _aligned(offset + array.nbytes)
+
+            encoded_header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+            if len(encoded_header) <= header_length:
+                break
+            header_length = len(encoded_header)
+
+        encoded_header = encoded_header.ljust(header_length, b" ")
+        temporary_path = f"{path}.tmp{os.getpid()}"
+
+        with open(temporary_path, "wb") as file:
+            file.write(_PREAMBLE.pack(ARTIFACT_MAGIC, ARTIFACT_FORMAT_VERSION, header_length))
+            file.write(encoded_header)
+
+            for name, array in arrays.items():
+                file.seek(header["arrays"][name]["offset"])
+                file.write(array.tobytes())
+
+            file.truncate(offset)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def read_header(path: str) -> Dict[str, Any]:
+        """
+        Reads the header of an artifact.
+
+        Args:
+            path: Path of the artifact file.
+
+        Returns:
+            The decoded header, with the format version under `formatVersion`.
+
+        Raises:
+            ModelLoadError: If the file doesn't exist or isn't a supported artifact.
+        """
+        try:
+            with open(path, "rb") as file:
+                magic, version, header_length = _PREAMBLE.unpack(file.read(_PREAMBLE.size))
+                if magic != ARTIFACT_MAGIC:
+                    raise ValueError("formato de archivo desconocido")
+                if version != ARTIFACT_FORMAT_VERSION:
+                    raise ValueError(f"versión de formato {version} no soportada")
+                header = json.loads(file.read(header_length).decode("utf-8"))
+        except FileNotFoundError:
+            raise ModelLoadError(f"Archivo de modelo no encontrado en: {path}")
+        except Exception as e:
+            raise ModelLoadError(f"Error al cargar el modelo: {str(e)}")
+
+        header["formatVersion"] = version
+        return header
+
+    @staticmethod
+    def load(path: str, sources: Sequence[str] = ()) -> Tuple[CompiledForest, Optional[ArtifactScaler]]:
+        """
+        Maps an artifact into memory.
+
+        Args:
+            path: Path of the artifact file.
+            sources: Files the artifact is expected to be built from. Those
+                that exist are checked against the digests recorded at export.
+
+        Returns:
+            Tuple with the compiled forest, whose arrays are read-only views of
+            the mapped file, and its scaler (None if the scaler is fused).
+
+        Raises:
+            ModelLoadError: If the artifact is missing, invalid or stale.
+        """
+        header = MemoryMappedModelLoader.read_header(path)
+
+        for source in sources:
+            expected = header["sources"].get(os.path.basename(source))
+            if expected is not None and os.path.exists(source) and file_digest(source) != expected:
+                raise ModelLoadError(f"El artefacto {path} no corresponde a {source}")
+
+        try:
+            mapped = np.memmap(path, dtype=np.uint8, mode="r")
+            arrays = {
+                name: np.ndarray(tuple(spec["shape"]), dtype=np.dtype(spec["dtype"]), buffer=mapped, offset=spec["offset"])
+                for name, spec in header["arrays"].items()
+            }
+
+            compiled_model = CompiledForest(
+                feature=arrays["feature"],
+                threshold=arrays["threshold"],
+                children_left=arrays["children_left"],
+                children_right=arrays["children_right"],
+                values=arrays["values"],
+                roots=arrays["roots"],
+                max_depth=header["maxDepth"],
+                classes=np.asarray(header["classes"]),
+                n_features=header["nFeatures"],
+                scaler_fused=header["scalerFused"]
+            )
+        except Exception as e:
+            raise ModelLoadError(f"Error al cargar el modelo: {str(e)}")
+
+        scaler = None
+        if not compiled_model.scaler_fused:
+            scaler = ArtifactScaler(arrays.get("scaler_mean"), arrays.get("scaler_scale"))
+
+        return compiled_model, scaler
+
+    @staticmethod
+    def check_export(path: str, model: Any, scaler: Any, samples: np.ndarray) -> Optional[str]:
+        """
+        Checks that an exported artifact predicts like the original model.
+
+        Args:
+            path: Path of the artifact file.
+            model: Original scikit-learn forest.
+            scaler: Original scaler.
+            samples: Raw feature matrix to compare on.
+
+        Returns:
+            None if every label matches, otherwise a description of the mismatch.
+        """
+        compiled_model, artifact_scaler = MemoryMappedModelLoader.load(path)
+
+        if compiled_model.scaler_fused:
+            return check_parity(compiled_model, lambda raw: model.predict(scaler.transform(raw)), samples)
+
+        if not np.array_equal(artifact_scaler.transform(samples), scaler.transform(samples)):
+            return "El escalador del artefacto no coincide con el original"
+
+        return check_parity(compiled_model, model.predict, scaler.transform(samples))
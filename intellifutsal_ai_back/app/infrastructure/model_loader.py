@@ -1,8 +1,16 @@
+import logging
+import os
 import pickle
-from typing import Any, Dict, List
-from app.domain import ModelInterface, FEATURES
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence
+from app.domain import ModelInterface, FEATURES, FEATURE_VALIDATIONS
 from app.core import Config
 from app.exceptions import ModelLoadError
+from .compiled_forest import CompiledForest, sample_feature_space, check_parity
+from .model_artifact import MemoryMappedModelLoader
+
+
+logger = logging.getLogger(__name__)
 
 
 class PickleModelLoader:
@@ -33,20 +41,172 @@ class PickleModelLoader:
         except Exception as e:
             raise ModelLoadError(f"Error al cargar el modelo: {str(e)}")
 
+    @staticmethod
+    def compile_model(model: Any, scaler: Any, fuse_scaler: bool = False) -> Optional[CompiledForest]:
+        """
+        Compiles a loaded forest into its flat-array evaluator.
+
+        The compiled forest is only returned after checking that it predicts the
+        same labels as the original model on a grid covering the valid range of
+        every feature (see `FEATURE_VALIDATIONS`). When `fuse_scaler` is set, the
+        scaler is folded into the thresholds first; if that fused version fails
+        the check, the plain compiled forest is tried instead.
+
+        Args:
+            model: Loaded scikit-learn forest classifier.
+            scaler: Scaler fitted for the model.
+            fuse_scaler: If True, try to build a forest that consumes raw features.
+
+        Returns:
+            The compiled forest, or None if the model can't be compiled or the
+            parity check fails (the adapter then keeps using sklearn).
+        """
+        try:
+            compiled_model = CompiledForest.from_sklearn(model)
+            raw_samples = sample_feature_space(FEATURE_VALIDATIONS, FEATURES)
+        except Exception as e:
+            logger.warning(f"Model compilation skipped: {str(e)}")
+            return None
+
+        if fuse_scaler:
+            try:
+                fused_model = compiled_model.fuse_scaler(scaler)
+                mismatch = check_parity(
+                    fused_model,
+                    lambda samples: model.predict(scaler.transform(samples)),
+                    raw_samples
+                )
+
+                if not mismatch:
+                    return fused_model
+
+                logger.warning(f"Fused model discarded, parity check failed: {mismatch}")
+            except Exception as e:
+                logger.warning(f"Scaler fusion skipped: {str(e)}")
+
+        try:
+            mismatch = check_parity(compiled_model, model.predict, scaler.transform(raw_samples))
+        except Exception as e:
+            logger.warning(f"Model compilation skipped: {str(e)}")
+            return None
+
+        if mismatch:
+            logger.warning(f"Compiled model discarded, parity check failed: {mismatch}")
+            return None
+
+        return compiled_model
+
+    @staticmethod
+    def load_adapter(model_path: str, scaler_path: str, artifact_path: Optional[str] = None) -> "SklearnModelAdapter":
+        """
+        Loads a model and its scaler into an adapter, following the configuration.
+
+        If model artifacts are enabled and `artifact_path` holds a valid artifact
+        built from these pickles, it is memory-mapped and the pickles are never
+        unpickled. Otherwise the pickles are loaded and, if enabled, compiled
+        (see `compile_model`) and their sklearn objects released.
+
+        Args:
+            model_path: Path to the model pickle.
+            scaler_path: Path to the scaler pickle.
+            artifact_path: Path to the exported artifact of the model, if any.
+
+        Returns:
+            The model adapter.
+
+        Raises:
+            ModelLoadError: If there's an issue loading the pickles.
+        """
+        if Config.COMPILED_MODELS and Config.MODEL_ARTIFACTS and artifact_path and os.path.exists(artifact_path):
+            try:
+                compiled_model, scaler = MemoryMappedModelLoader.load(artifact_path, (model_path, scaler_path))
+                logger.info(f"Model mapped from {artifact_path}")
+                return SklearnModelAdapter(None, scaler, compiled_model)
+            except ModelLoadError as e:
+                logger.warning(f"Model artifact skipped, loading the pickles instead: {str(e)}")
+
+        model = PickleModelLoader.load_model(model_path)
+        scaler = PickleModelLoader.load_model(scaler_path)
+        compiled_model = None
+
+        if Config.COMPILED_MODELS:
+            logger.info(f"Compiling model {model_path}")
+            compiled_model = PickleModelLoader.compile_model(model, scaler, Config.FUSED_SCALERS)
+
+        adapter = SklearnModelAdapter(model, scaler, compiled_model)
+
+        if Config.RELEASE_SKLEARN_MODELS and not adapter.release_sklearn_objects():
+            logger.warning(f"Model {model_path} not compiled, keeping the scikit-learn objects")
+
+        return adapter
+
 
 class SklearnModelAdapter(ModelInterface):
     """Adapter for scikit-learn models."""
 
-    def __init__(self, model: Any, scaler: Any):
+    def __init__(self, model: Any, scaler: Any, compiled_model: Optional[CompiledForest] = None):
         """
         Initializes the adapter with a scikit-learn model and scaler.
 
         Args:
             model: A scikit-learn compatible model (must implement `predict` method).
             scaler: A scaler used to normalize input features.
+            compiled_model: Optional flat-array version of `model`. When given, it
+                replaces `model.predict` on the prediction path, and if it has
+                the scaler fused in, `scaler.transform` is skipped as well.
         """
         self.model = model
         self.scaler = scaler
+        self.compiled_model = compiled_model
+
+    @property
+    def classes(self) -> np.ndarray:
+        """Labels of the classes, in the order of the columns of `predict_proba_batch`."""
+        if self.compiled_model is not None:
+            return self.compiled_model.classes
+
+        return np.asarray(self.model.classes_)
+
+    def release_sklearn_objects(self) -> bool:
+        """
+        Drops the scikit-learn objects the compiled model makes unnecessary.
+
+        A forest is thousands of small Python objects; once released, the
+        adapter only holds the compiled NumPy buffers (plus the scaler, unless
+        it is fused), which preloaded gunicorn workers share without copying.
+
+        Returns:
+            False if there's no compiled model, so nothing could be released.
+        """
+        if self.compiled_model is None:
+            return False
+
+        self.model = None
+
+        if self.compiled_model.scaler_fused:
+            self.scaler = None
+
+        return True
+
+    def _predict_array(self, input_array: np.ndarray) -> np.ndarray:
+        """
+        Scales (when needed) and runs the forest over a raw feature matrix.
+
+        Args:
+            input_array: Raw N x len(FEATURES) matrix.
+
+        Returns:
+            Array of predicted labels.
+        """
+        if self.compiled_model is not None and self.compiled_model.scaler_fused:
+            return self.compiled_model.predict(input_array)
+
+        input_array = self.scaler.transform(input_array)
+
+        if self.compiled_model is not None:
+            return self.compiled_model.predict(input_array)
+
+        return self.model.predict(input_array)
 
     def predict(self, features: List[float]) -> Any:
         """
@@ -62,15 +222,91 @@ class SklearnModelAdapter(ModelInterface):
             RuntimeError: If any error occurs during prediction.
         """
         try:
-            import numpy as np
-
             input_array = np.array([features])
+
+            return int(self._predict_array(input_array)[0])
+        except Exception as e:
+            raise RuntimeError(f"Error de predicción: {str(e)}")
+
+    def predict_batch(self, matrix: Sequence[Sequence[float]]) -> List[int]:
+        """
+        Performs prediction for a whole matrix of features at once.
+
+        The matrix is scaled and passed through the model in a single call, so
+        sklearn's input validation and the forest traversal run once per batch
+        instead of once per player.
+
+        Args:
+            matrix: N x len(FEATURES) matrix of input features.
+
+        Returns:
+            List with one prediction per row.
+
+        Raises:
+            RuntimeError: If any error occurs during prediction.
+        """
+        try:
+            input_array = self._as_feature_matrix(matrix)
+
+            if input_array.shape[0] == 0:
+                return []
+
+            return [int(prediction) for prediction in self._predict_array(input_array)]
+        except Exception as e:
+            raise RuntimeError(f"Error de predicción: {str(e)}")
+
+    def predict_proba_batch(self, matrix: Sequence[Sequence[float]]) -> np.ndarray:
+        """
+        Computes class probabilities for a whole matrix of features at once.
+
+        Args:
+            matrix: N x len(FEATURES) matrix of input features.
+
+        Returns:
+            N x n_classes array of probabilities.
+
+        Raises:
+            RuntimeError: If any error occurs during prediction.
+        """
+        try:
+            input_array = self._as_feature_matrix(matrix)
+
+            if self.compiled_model is not None and self.compiled_model.scaler_fused:
+                return self.compiled_model.predict_proba(input_array)
+
             input_array = self.scaler.transform(input_array)
 
-            return int(self.model.predict(input_array)[0])
+            if self.compiled_model is not None:
+                return self.compiled_model.predict_proba(input_array)
+
+            return self.model.predict_proba(input_array)
         except Exception as e:
             raise RuntimeError(f"Error de predicción: {str(e)}")
 
+    @staticmethod
+    def _as_feature_matrix(matrix: Sequence[Sequence[float]]) -> np.ndarray:
+        """
+        Converts the input to a float64 N x len(FEATURES) array.
+
+        Args:
+            matrix: Matrix-like input.
+
+        Returns:
+            The input as a NumPy array.
+
+        Raises:
+            ValueError: If the input doesn't have the expected shape.
+        """
+        input_array = np.asarray(matrix, dtype=np.float64)
+
+        if input_array.ndim != 2 or input_array.shape[1] != len(FEATURES):
+            raise ValueError(
+                f"Se esperaba una matriz de N x {len(FEATURES)} características, "
+                f"pero se recibió una de forma {input_array.shape}"
+            )
+
+        return input_array
+
     def validate_features(self, features: List[float]) -> Dict[str, str]:
         """
         Validates input features before prediction.
@@ -0,0 +1,102 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class PooledSession(requests.Session):
+    """
+    HTTP session whose connection pool outlives `close()`.
+
+    `openai==0.28` keeps one session per thread and closes it every few
+    minutes. When all threads share this session, that would drop every
+    kept-alive connection of the process, so `close` is a no-op and the
+    pool is only released by `shutdown`.
+    """
+
+    def close(self) -> None:
+        """Keeps the pool open; see `shutdown`."""
+
+    def shutdown(self) -> None:
+        """Closes every pooled connection."""
+        super().close()
+
+
+class OpenAISessionFactory:
+    """
+    Builds the HTTP session used by `openai` for every request of a process.
+
+    Assigned to `openai.requestssession`, every thread of a worker shares a
+    single keep-alive connection pool, so the TLS handshake is paid once per
+    connection instead of once per request. Sessions are never inherited
+    through a fork: each gunicorn worker builds its own.
+    """
+
+    def __init__(self, pool_size: int = 10, max_retries: int = 2, backoff_factor: float = 0.5,
+                 backoff_jitter: float = 0.5):
+        """
+        Initializes the factory.
+
+        Args:
+            pool_size: Maximum number of kept-alive connections per host.
+            max_retries: Retries of a request answered with 429 or 5xx, or
+                failing to connect.
+            backoff_factor: Base of the exponential delay between retries, in
+                seconds. A `Retry-After` header takes precedence.
+            backoff_jitter: Maximum random seconds added to every delay.
+        """
+        self.pool_size = max(1, pool_size)
+        self.max_retries = max(0, max_retries)
+        self.backoff_factor = backoff_factor
+        self.backoff_jitter = backoff_jitter
+        self._session = None
+        self._session_pid = None
+        self._lock = threading.Lock()
+
+    def _retry(self) -> Retry:
+        """
+        Builds the retry policy.
+
+        After the last retry the error response is returned as is, so the
+        caller still gets the API's own error (e.g. `RateLimitError`).
+
+        Returns:
+            The urllib3 retry policy.
+        """
+        return Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=0,
+            status=self.max_retries,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=None,
+            backoff_factor=self.backoff_factor,
+            backoff_jitter=self.backoff_jitter,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+
+    def __call__(self) -> requests.Session:
+        """
+        Returns the session of the current process, creating it if needed.
+
+        Returns:
+            The pooled session.
+        """
+        with self._lock:
+            if self._session is None or self._session_pid != os.getpid():
+                session = PooledSession()
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_size,
+                    pool_maxsize=self.pool_size,
+                    max_retries=self._retry()
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session, self._session_pid = session, os.getpid()
+
+            return self._session
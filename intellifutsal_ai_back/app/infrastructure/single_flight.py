@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    The first caller of a key (the leader) runs the function; callers arriving
+    while it is in flight wait for the leader's result instead of running it
+    again. Once the call ends, the key is forgotten.
+    """
+
+    def __init__(self):
+        """Initializes the registry of in-flight calls."""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Runs `function`, or waits for the in-flight call with the same key.
+
+        Args:
+            key: Identity of the call.
+            function: Function to run if no call with that key is in flight.
+
+        Returns:
+            The result of the leader's call.
+
+        Raises:
+            Exception: Whatever the leader's call raised.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+
+            if call is None:
+                call = self._calls[key] = Future()
+                self.leaders += 1
+                leader = True
+            else:
+                self.followers += 1
+                leader = False
+
+        if not leader:
+            return call.result()
+
+        try:
+            result = function()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the coalescing counters.
+
+        Returns:
+            Dictionary with in-flight calls, leaders and coalesced followers.
+        """
+        with self._lock:
+            return {
+                "inFlight": len(self._calls),
+                "leaders": self.leaders,
+                "followers": self.followers
+            }
+
+
+@contextmanager
+def file_lock(path: Optional[str], timeout: float = 30.0, poll_interval: float = 0.05) -> Iterator[bool]:
+    """
+    Holds an exclusive advisory lock on a file, shared by every process of the host.
+
+    The lock file is removed on release. A process still waiting on the removed
+    file may then run concurrently with a later one, which at worst duplicates
+    work, so callers must re-check their shared state after acquiring it.
+
+    Args:
+        path: Lock file path. None, or a platform without `fcntl`, disables the lock.
+        timeout: Seconds to wait for the lock before giving up.
+        poll_interval: Seconds between attempts.
+
+    Yields:
+        True if the lock is held, False if it was disabled or timed out.
+    """
+    if path is None or fcntl is None:
+        yield False
+        return
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    descriptor = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    deadline = time.monotonic() + timeout
+    locked = False
+
+    try:
+        while True:
+            try:
+                fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                locked = True
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(poll_interval)
+
+        yield locked
+    finally:
+        if locked:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            fcntl.flock(descriptor, fcntl.LOCK_UN)
+
+        os.close(descriptor)
@@ -1,4 +1,7 @@
 from .analysis_routes import init_analysis_bp
 from .physical_routes import init_physical_bp
 from .position_routes import init_position_bp
-from .main_routes import init_main_bp
\ No newline at end of file
+from .main_routes import init_main_bp
+from .jobs_routes import init_jobs_bp
+from .admin_routes import init_admin_bp
+from .bulk_routes import init_bulk_bp
\ No newline at end of file
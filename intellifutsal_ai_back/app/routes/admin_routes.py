@@ -0,0 +1,205 @@
+import hmac
+from flask import Blueprint, request, jsonify
+from flasgger import swag_from
+from app.core import Config
+
+
+admin_bp = Blueprint("admin", __name__)
+model_registry_instance = None
+
+def init_admin_bp(app, model_registry):
+    """
+    Registers the routes in the Flask application.
+
+    Args:
+        app: Flask application instance.
+        model_registry: Registry of the served models.
+    """
+    global model_registry_instance
+    model_registry_instance = model_registry
+
+    app.register_blueprint(admin_bp)
+
+def check_admin_token():
+    """
+    Checks the `X-Admin-Token` header of the current request.
+
+    Returns:
+        None if the request is authorized, otherwise the error response.
+    """
+    if not Config.ADMIN_TOKEN:
+        return jsonify({"error": "La administración está deshabilitada"}), 503
+
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), Config.ADMIN_TOKEN):
+        return jsonify({"error": "Token de administración inválido"}), 401
+
+    return None
+
+ADMIN_ERROR_RESPONSES = {
+    "401": {
+        "description": "Token de administración ausente o inválido",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "error": {"type": "string"},
+            },
+        },
+    },
+    "503": {
+        "description": "La administración está deshabilitada (ADMIN_TOKEN no configurado)",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "error": {"type": "string"},
+            },
+        },
+    },
+}
+
+ADMIN_TOKEN_PARAMETER = {
+    "name": "X-Admin-Token",
+    "in": "header",
+    "type": "string",
+    "required": True,
+    "description": "Token de administración (ADMIN_TOKEN)",
+}
+
+MODELS_STATUS_SCHEMA = {
+    "type": "object",
+    "additionalProperties": {
+        "type": "object",
+        "properties": {
+            "version": {"type": "integer", "example": 2},
+            "label": {"type": "string", "example": "hierarchical_classifier@3f9a1c0b7e2d"},
+            "loadedAt": {"type": "number"},
+            "shadows": {"type": "array", "items": {"type": "string"}},
+            "error": {"type": "string"},
+        },
+    },
+}
+
+@admin_bp.route("/api/admin/models", methods=["GET"])
+@swag_from({
+    "tags": ["Administración"],
+    "summary": "Consulta la versión de los modelos servidos",
+    "description": "Devuelve, para cada modelo, la versión cargada por el proceso que atiende la petición, cuándo se cargó y el error de la última versión rechazada.",
+    "produces": ["application/json"],
+    "parameters": [ADMIN_TOKEN_PARAMETER],
+    "responses": {
+        "200": {
+            "description": "Versiones de los modelos",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "models": MODELS_STATUS_SCHEMA,
+                },
+            },
+        },
+        **ADMIN_ERROR_RESPONSES,
+    },
+})
+def api_models_status():
+    """
+    Endpoint para consultar las versiones de los modelos cargados.
+    """
+    try:
+        error_response = check_admin_token()
+
+        if error_response is not None:
+            return error_response
+
+        return jsonify({"models": model_registry_instance.status()})
+
+    except Exception as error:
+        return jsonify({"error": str(error)}), 500
+
+@admin_bp.route("/api/admin/models/reload", methods=["POST"])
+@swag_from({
+    "tags": ["Administración"],
+    "summary": "Recarga los modelos sin reiniciar el servicio",
+    "description": "Carga y valida los modelos desde sus archivos y los sustituye sin interrumpir las peticiones en curso. El resto de procesos los recargan en su siguiente comprobación.",
+    "produces": ["application/json"],
+    "parameters": [ADMIN_TOKEN_PARAMETER],
+    "responses": {
+        "200": {
+            "description": "Modelos recargados",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "success": {"type": "boolean", "example": True},
+                    "reloaded": {"type": "array", "items": {"type": "string"}, "example": ["positions", "physicalConditions"]},
+                    "models": MODELS_STATUS_SCHEMA,
+                },
+            },
+        },
+        **ADMIN_ERROR_RESPONSES,
+    },
+})
+def api_models_reload():
+    """
+    Endpoint para recargar los modelos desde sus archivos.
+    """
+    try:
+        error_response = check_admin_token()
+
+        if error_response is not None:
+            return error_response
+
+        reloaded = model_registry_instance.request_reload()
+
+        return jsonify({
+            "success": True,
+            "reloaded": reloaded,
+            "models": model_registry_instance.status()
+        })
+
+    except Exception as error:
+        return jsonify({"error": str(error)}), 500
+
+@admin_bp.route("/api/admin/models/metrics", methods=["GET"])
+@swag_from({
+    "tags": ["Administración"],
+    "summary": "Métricas de las versiones principal y en sombra de los modelos",
+    "description": "Devuelve, para cada modelo, las filas puntuadas y la latencia de cada versión y, para las versiones en sombra, su tasa de acuerdo con la versión principal. Las métricas son del proceso que atiende la petición.",
+    "produces": ["application/json"],
+    "parameters": [ADMIN_TOKEN_PARAMETER],
+    "responses": {
+        "200": {
+            "description": "Métricas de los modelos",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "models": {
+                        "type": "object",
+                        "additionalProperties": {
+                            "type": "object",
+                            "properties": {
+                                "primaryVersion": {"type": "string"},
+                                "shadowVersions": {"type": "array", "items": {"type": "string"}},
+                                "sampleRate": {"type": "number", "example": 0.1},
+                                "dropped": {"type": "integer"},
+                                "queued": {"type": "integer"},
+                                "versions": {"type": "object"},
+                            },
+                        },
+                    },
+                },
+            },
+        },
+        **ADMIN_ERROR_RESPONSES,
+    },
+})
+def api_models_metrics():
+    """
+    Endpoint para consultar las métricas de las versiones de los modelos.
+    """
+    try:
+        error_response = check_admin_token()
+
+        if error_response is not None:
+            return error_response
+
+        return jsonify({"models": model_registry_instance.metrics()})
+
+    except Exception as error:
+        return jsonify({"error": str(error)}), 500
\ No newline at end of file
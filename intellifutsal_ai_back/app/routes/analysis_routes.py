@@ -1,17 +1,26 @@
-from flask import Blueprint, request, jsonify
+from concurrent.futures import as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context, url_for
 from flasgger import swag_from
+from werkzeug.exceptions import HTTPException
+from app.core import Config
 from app.domain import (
     FEATURES, POSITIONS_CATEGORIES, PHYSICAL_CONDITIONS_CATEGORIES, 
-    PHYSICAL_CONDITION_CHARACTERISTICS, POSITION_PHYSICAL_RECOMMENDATIONS
+    POSITION_PHYSICAL_RECOMMENDATIONS
 )
+from app.infrastructure import read_json_lines, format_from_media_type
+from app.services import parse_features, physical_condition_fragments
 
 
 analysis_prediction_bp = Blueprint("analysis_prediction", __name__)
 positions_predictor_instance = None
 physical_conditions_predictor_instance = None
+profile_scorer_instance = None
 openai_service = None
+job_service_instance = None
 
-def init_analysis_bp(app, positions_predictor, physical_conditions_predictor, ai_service):
+def init_analysis_bp(app, positions_predictor, physical_conditions_predictor, ai_service, profile_scorer,
+                     job_service=None):
     """
     Registers the routes in the Flask application.
     
@@ -20,14 +29,503 @@ def init_analysis_bp(app, positions_predictor, physical_conditions_predictor, ai
         positions_predictor: Prediction service for position profiles.
         physical_conditions_predictor: Prediction service for physical conditions.
         ai_service: OpenAI service for advanced analysis.
+        profile_scorer: Combined scorer for position and physical condition clusters.
+        job_service: Optional background job service for asynchronous analyses.
     """
-    global positions_predictor_instance, physical_conditions_predictor_instance, openai_service
+    global positions_predictor_instance, physical_conditions_predictor_instance, openai_service, profile_scorer_instance
+    global job_service_instance
     positions_predictor_instance = positions_predictor
     physical_conditions_predictor_instance = physical_conditions_predictor
+    profile_scorer_instance = profile_scorer
     openai_service = ai_service
+    job_service_instance = job_service
+    
+    if job_service is not None:
+        job_service.register("teamAnalysis", team_analysis_job)
     
     app.register_blueprint(analysis_prediction_bp)
 
+def use_analysis_cache(data, headers=None) -> bool:
+    """
+    Tells whether the client allows serving the analysis from the cache.
+    
+    Clients opt out with `"useCache": false` in the body or a
+    `Cache-Control: no-cache` header.
+    
+    Args:
+        data: Parsed JSON body of the request.
+        headers: Request headers; defaults to those of the current Flask request.
+        
+    Returns:
+        False if the client opted out, True otherwise.
+    """
+    headers = request.headers if headers is None else headers
+    
+    if "no-cache" in headers.get("Cache-Control", "").lower():
+        return False
+    
+    return not (isinstance(data, dict) and data.get("useCache") is False)
+
+def score_team_players(players_data) -> Tuple[List[Tuple[int, Any, str, List[float], int, int]], List[Dict[str, Any]]]:
+    """
+    Parses every player of a team payload and predicts both of their clusters.
+    
+    Args:
+        players_data: List of player dictionaries from the request body.
+        
+    Returns:
+        Tuple with the scored players, as (index, id, name, features, position id,
+        physical id), and the list of per-player errors.
+    """
+    errors = []
+    parsed_players = []
+    
+    player_names = [player_data.get("name", f"Jugador {i+1}") for i, player_data in enumerate(players_data)]
+    parsed = parse_features(players_data, player_names)
+    
+    for i, player_data in enumerate(players_data):
+        if parsed.valid[i]:
+            player_id = player_data.get("id", f"player_{i}")
+            parsed_players.append((i, player_id, player_names[i], parsed.matrix[i].tolist()))
+        else:
+            errors.append({
+                "playerIndex": i,
+                "playerName": player_names[i],
+                "error": parsed.errors[i]
+            })
+    
+    try:
+        scores = profile_scorer_instance.score(parsed.matrix[parsed.valid])
+    except Exception:
+        scores = None
+    
+    scored_players = []
+    
+    for position, (i, player_id, player_name, user_features) in enumerate(parsed_players):
+        try:
+            if scores is not None:
+                position_id = scores["positionIds"][position]
+                physical_id = scores["physicalIds"][position]
+            else:
+                player_scores = profile_scorer_instance.score_one(user_features)
+                position_id = player_scores["positionId"]
+                physical_id = player_scores["physicalId"]
+            
+            scored_players.append((i, player_id, player_name, user_features, position_id, physical_id))
+            
+        except Exception as e:
+            errors.append({
+                "playerIndex": i,
+                "playerName": player_name,
+                "error": str(e)
+            })
+    
+    return scored_players, errors
+
+def complete_player_result(analysis_result: Dict[str, Any], player_id, player_name: str,
+                           position_id: int, physical_id: int) -> Dict[str, Any]:
+    """
+    Adds the player identification and cluster names to an analysis result.
+    
+    Args:
+        analysis_result: Result of `OpenAIService.analyze_player_profile`.
+        player_id: Player identifier.
+        player_name: Player name.
+        position_id: Predicted position cluster.
+        physical_id: Predicted physical condition cluster.
+        
+    Returns:
+        The same dictionary, completed.
+    """
+    analysis_result["playerId"] = player_id
+    analysis_result["playerName"] = player_name
+    analysis_result["positionName"] = POSITIONS_CATEGORIES.get(position_id, f"Perfil desconocido ({position_id})")
+    analysis_result["physicalName"] = PHYSICAL_CONDITIONS_CATEGORIES.get(physical_id, f"Perfil desconocido ({physical_id})")
+    
+    return analysis_result
+
+def build_team_data(team_name: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Builds the team summary sent to `OpenAIService.analyze_team`.
+    
+    Args:
+        team_name: Name of the team.
+        results: Completed player analysis results.
+        
+    Returns:
+        Team data dictionary.
+    """
+    return {
+        "teamName": team_name,
+        "playerCount": len(results),
+        "positions": [p["positionName"] for p in results],
+        "physicalConditions": [p["physicalName"] for p in results],
+        "playerProfiles": [
+            {
+                "name": p["playerName"],
+                "position": p["positionName"],
+                "physical": p["physicalName"],
+                "strengths": p.get("strengths", []),
+                "weaknesses": p.get("weaknesses", [])
+            } for p in results
+        ]
+    }
+
+
+def run_team_analysis(players_data, team_name: str, use_cache: bool = True,
+                      report_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Analyzes every player of a team and then the team as a whole.
+    
+    Args:
+        players_data: List of player dictionaries from the request body.
+        team_name: Name of the team.
+        use_cache: If False, bypasses the persistent analysis cache.
+        report_progress: Optional callback receiving the partial results after
+            scoring and after each player analysis.
+        
+    Returns:
+        The response body of `/api/team/analyze`.
+    """
+    results = []
+    
+    scored_players, errors = score_team_players(players_data)
+    
+    analysis_futures = openai_service.submit_player_analyses(
+        [(user_features, position_id, physical_id) for _, _, _, user_features, position_id, physical_id in scored_players],
+        FEATURES,
+        use_cache
+    )
+    
+    def progress():
+        if report_progress is not None:
+            report_progress({
+                "teamName": team_name,
+                "predictions": [
+                    {
+                        "playerIndex": i,
+                        "playerId": player_id,
+                        "playerName": player_name,
+                        "positionId": position_id,
+                        "physicalId": physical_id
+                    } for i, player_id, player_name, _, position_id, physical_id in scored_players
+                ],
+                "playerResults": results,
+                "errors": sorted(errors, key=lambda error: error["playerIndex"]),
+                "totalPlayers": len(players_data),
+                "processedPlayers": len(results),
+                "failedPlayers": len(errors)
+            })
+    
+    progress()
+    
+    for (i, player_id, player_name, _, position_id, physical_id), analysis_future in zip(scored_players, analysis_futures):
+        try:
+            results.append(complete_player_result(
+                analysis_future.result(), player_id, player_name, position_id, physical_id
+            ))
+        except Exception as e:
+            errors.append({
+                "playerIndex": i,
+                "playerName": player_name,
+                "error": str(e)
+            })
+        
+        progress()
+    
+    errors.sort(key=lambda error: error["playerIndex"])
+    
+    team_analysis = None
+    if len(results) > 1:
+        try:
+            team_analysis = openai_service.analyze_team(build_team_data(team_name, results), use_cache)
+        except Exception as e:
+            team_analysis = {"error": f"Error al analizar el equipo: {str(e)}"}
+    
+    return {
+        "success": True,
+        "teamName": team_name,
+        "playerResults": results,
+        "errors": errors,
+        "totalPlayers": len(players_data),
+        "processedPlayers": len(results),
+        "failedPlayers": len(errors),
+        "teamAnalysis": team_analysis
+    }
+
+def team_analysis_job(payload: Dict[str, Any], report_progress: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+    """
+    Job handler running a team analysis submitted to `/api/team/analyze/jobs`.
+    
+    Args:
+        payload: Dictionary with `players`, `teamName` and `useCache`.
+        report_progress: Callback publishing the partial results.
+        
+    Returns:
+        The response body of `/api/team/analyze`.
+    """
+    return run_team_analysis(payload["players"], payload["teamName"], payload["useCache"], report_progress)
+
+def wants_event_stream() -> bool:
+    """
+    Tells whether the client asked for Server-Sent Events instead of NDJSON.
+    
+    Returns:
+        True if the `Accept` header prefers `text/event-stream`.
+    """
+    return request.accept_mimetypes.best_match(["application/x-ndjson", "text/event-stream"]) == "text/event-stream"
+
+def format_stream_event(event: str, payload: Dict[str, Any], event_stream: bool) -> str:
+    """
+    Encodes one event of a streamed response.
+    
+    Args:
+        event: Event name.
+        payload: JSON serializable event data.
+        event_stream: If True, encodes a Server-Sent Event; otherwise an NDJSON
+            line with the event name in its `event` key.
+        
+    Returns:
+        The encoded event.
+    """
+    if event_stream:
+        return f"event: {event}\ndata: {current_app.json.dumps(payload)}\n\n"
+    
+    return current_app.json.dumps({"event": event, **payload}) + "\n"
+
+def team_prediction_stream_spec(summary: str, team_route: str, prediction_fields: str) -> Dict[str, Any]:
+    """
+    Builds the Swagger specification of a team prediction streaming route.
+    
+    Args:
+        summary: Summary of the route.
+        team_route: Non-streaming route returning the same predictions.
+        prediction_fields: Fields of the prediction events besides the
+            player's index, id, name, cluster id and features.
+    
+    Returns:
+        The specification, for `swag_from`.
+    """
+    return {
+        "tags": ["Predicciones IA"],
+        "summary": summary,
+        "description": (
+            f"Igual que {team_route}, pero recibe los jugadores en NDJSON (application/x-ndjson, "
+            "un objeto JSON por línea) y envía la predicción de cada jugador en cuanto se calcula, sin esperar al "
+            "resto del equipo. Los jugadores se leen y se puntúan por lotes pequeños (STREAM_BATCH_SIZE), por lo que "
+            "la memoria usada no depende del tamaño de la plantilla y el cuerpo puede superar el límite de las demás "
+            "rutas (BULK_MAX_CONTENT_LENGTH). Responde con NDJSON (un objeto por línea con su tipo en 'event') o con "
+            "Server-Sent Events si el cliente envía 'Accept: text/event-stream'. Eventos: prediction, error y done."
+        ),
+        "consumes": ["application/x-ndjson"],
+        "produces": ["application/x-ndjson", "text/event-stream"],
+        "parameters": [
+            {
+                "name": "body",
+                "in": "body",
+                "required": True,
+                "description": "Un jugador por línea",
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "string", "example": "player_1"},
+                        "name": {"type": "string", "example": "Juan Pérez"},
+                        **{
+                            field: {"type": "number", "example": 10.0}
+                            for field in FEATURES
+                        }
+                    },
+                    "required": ["name", *FEATURES]
+                }
+            },
+            {
+                "name": "teamName",
+                "in": "query",
+                "type": "string",
+                "required": False,
+                "description": "Nombre del equipo, devuelto en el evento done"
+            },
+            {
+                "name": "includeFeatures",
+                "in": "query",
+                "type": "boolean",
+                "default": True,
+                "required": False,
+                "description": "Si es false, las predicciones no repiten las características del jugador"
+            }
+        ],
+        "responses": {
+            "200": {
+                "description": (
+                    f"Flujo de eventos: un evento prediction (playerIndex, playerId, playerName, clusterId, {prediction_fields} "
+                    "y features) o error (playerIndex, playerName y error) por jugador, y un evento done final con "
+                    "teamName, totalPlayers, processedPlayers y failedPlayers"
+                )
+            },
+            "400": {
+                "description": "El cuerpo de la solicitud no es NDJSON",
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "error": {"type": "string"}
+                    }
+                }
+            },
+            "413": {
+                "description": "El cuerpo supera BULK_MAX_CONTENT_LENGTH"
+            },
+            "500": {
+                "description": "Error interno del servidor durante la predicción de equipo",
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "error": {"type": "string"}
+                    }
+                }
+            }
+        }
+    }
+
+def predict_streamed_players(predictor, players_data: List[Any], offset: int, include_features: bool,
+                             build_result: Callable[[int], Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Predicts the clusters of a batch of players read from an NDJSON body.
+    
+    Args:
+        predictor: Prediction service of the clusters.
+        players_data: Decoded lines of the batch, None for lines that aren't valid JSON.
+        offset: Index of the batch's first player in the body.
+        include_features: If True, each prediction echoes the player's features.
+        build_result: Returns the fields of a prediction that depend on its
+            cluster id (e.g. its name).
+    
+    Returns:
+        One `prediction` or `error` event per player, in body order.
+    """
+    players = [player_data if isinstance(player_data, dict) else {} for player_data in players_data]
+    player_names = [player.get("name", f"Jugador {offset + i + 1}") for i, player in enumerate(players)]
+    parsed = parse_features(players, player_names)
+    
+    try:
+        cluster_ids = iter(predictor.predict_batch(parsed.matrix[parsed.valid]))
+    except Exception:
+        cluster_ids = None
+    
+    events = []
+    
+    for i, player in enumerate(players):
+        player_index = offset + i
+        
+        if not isinstance(players_data[i], dict):
+            events.append(("error", {
+                "playerIndex": player_index,
+                "playerName": player_names[i],
+                "error": "Formato inválido. Se espera un objeto JSON por línea"
+            }))
+            continue
+        
+        if not parsed.valid[i]:
+            events.append(("error", {
+                "playerIndex": player_index,
+                "playerName": player_names[i],
+                "error": parsed.errors[i]
+            }))
+            continue
+        
+        user_features = parsed.matrix[i].tolist()
+        
+        try:
+            if cluster_ids is not None:
+                cluster_id = next(cluster_ids)
+            else:
+                cluster_id = predictor.predict(user_features)
+            
+            result = {
+                "playerIndex": player_index,
+                "playerId": player.get("id", f"player_{player_index}"),
+                "playerName": player_names[i],
+                "clusterId": cluster_id,
+                **build_result(cluster_id)
+            }
+            
+            if include_features:
+                result["features"] = {field: user_features[j] for j, field in enumerate(FEATURES)}
+            
+            events.append(("prediction", result))
+        
+        except Exception as e:
+            events.append(("error", {
+                "playerIndex": player_index,
+                "playerName": player_names[i],
+                "error": str(e)
+            }))
+    
+    return events
+
+def stream_team_predictions(predictor, build_result: Callable[[int], Dict[str, Any]]):
+    """
+    Answers a team prediction streaming request (see `team_prediction_stream_spec`).
+    
+    Players are read from the NDJSON body in batches of `STREAM_BATCH_SIZE`,
+    and the events of each batch are sent as soon as it is scored. The
+    stream ends with a `done` event, or with an `error` event if reading the
+    body fails once the response has started.
+    
+    Args:
+        predictor: Prediction service of the clusters.
+        build_result: Returns the fields of a prediction that depend on its
+            cluster id (see `predict_streamed_players`).
+    
+    Returns:
+        The streamed response, or an error response.
+    """
+    try:
+        if format_from_media_type(request.mimetype) != "ndjson":
+            return jsonify({"error": "Se requiere NDJSON (application/x-ndjson)"}), 400
+        
+        team_name = request.args.get("teamName", "Equipo sin nombre")
+        include_features = request.args.get("includeFeatures", "true").lower() != "false"
+        event_stream = wants_event_stream()
+        
+        request.max_content_length = Config.BULK_MAX_CONTENT_LENGTH if Config.BULK_MAX_CONTENT_LENGTH > 0 else None
+        body = request.stream
+        
+        def generate():
+            total_players = 0
+            processed_players = 0
+            
+            try:
+                for players_data in read_json_lines(body, Config.STREAM_BATCH_SIZE):
+                    events = predict_streamed_players(predictor, players_data, total_players, include_features, build_result)
+                    total_players += len(players_data)
+                    processed_players += sum(event == "prediction" for event, _ in events)
+                    
+                    yield "".join(format_stream_event(event, payload, event_stream) for event, payload in events)
+            except Exception as e:
+                # The status is already sent, so the stream ends with an error
+                # event instead of the done event.
+                yield format_stream_event("error", {"error": str(e)}, event_stream)
+                return
+            
+            yield format_stream_event("done", {
+                "success": True,
+                "teamName": team_name,
+                "totalPlayers": total_players,
+                "processedPlayers": processed_players,
+                "failedPlayers": total_players - processed_players
+            }, event_stream)
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype="text/event-stream" if event_stream else "application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as error:
+        return jsonify({"error": str(error)}), 500
+
 @analysis_prediction_bp.route("/api/analyze", methods=["POST"])
 @swag_from({
     "tags": ["Análisis IA"],
@@ -43,8 +541,11 @@ def init_analysis_bp(app, positions_predictor, physical_conditions_predictor, ai
             "schema": {
                 "type": "object",
                 "properties": {
-                    field: {"type": "number", "example": 10.0}
-                    for field in FEATURES
+                    **{
+                        field: {"type": "number", "example": 10.0}
+                        for field in FEATURES
+                    },
+                    "useCache": {"type": "boolean", "example": True, "description": "Permite reutilizar un análisis idéntico previo"}
                 },
                 "required": list(FEATURES),
             },
@@ -98,24 +599,23 @@ def api_analyze():
             return jsonify({"error": "Se requiere JSON"}), 400
         
         data = request.json
-        user_features = []
+        parsed = parse_features([data])
         
-        for field in FEATURES:
-            if field not in data:
-                return jsonify({"error": f"Campo requerido no encontrado: '{field}'"}), 400
-            try:
-                user_features.append(float(data[field]))
-            except ValueError:
-                return jsonify({"error": f"Formato inválido para el campo: '{field}'"}), 400
+        if not parsed.valid[0]:
+            return jsonify({"error": parsed.errors[0]}), 400
+        
+        user_features = parsed.matrix[0].tolist()
         
-        position_id = positions_predictor_instance.model.predict(user_features)
-        physical_id = physical_conditions_predictor_instance.model.predict(user_features)
+        scores = profile_scorer_instance.score_one(user_features)
+        position_id = scores["positionId"]
+        physical_id = scores["physicalId"]
         
         analysis_result = openai_service.analyze_player_profile(
             user_features, 
             position_id,
             physical_id,
-            FEATURES
+            FEATURES,
+            use_analysis_cache(data)
         )
         
         analysis_result["positionName"] = POSITIONS_CATEGORIES.get(position_id, f"Perfil desconocido ({position_id})")
@@ -126,6 +626,111 @@ def api_analyze():
     except Exception as error:
         return jsonify({"error": str(error)}), 500
 
+@analysis_prediction_bp.route("/api/analyze/stream", methods=["POST"])
+@swag_from({
+    "tags": ["Análisis IA"],
+    "summary": "Análisis detallado de un jugador en streaming",
+    "description": (
+        "Igual que /api/analyze, pero la respuesta de OpenAI se recibe en streaming y cada sección "
+        "(ANÁLISIS GENERAL, FORTALEZAS, ÁREAS DE MEJORA, RECOMENDACIONES DE ENTRENAMIENTO, PERFIL DE RENDIMIENTO) "
+        "se envía en cuanto está completa. Responde con NDJSON (application/x-ndjson, un objeto por línea con su "
+        "tipo en 'event') o con Server-Sent Events si el cliente envía 'Accept: text/event-stream'. "
+        "Eventos: prediction, section y analysis (el mismo resultado que /api/analyze)."
+    ),
+    "consumes": ["application/json"],
+    "produces": ["application/x-ndjson", "text/event-stream"],
+    "parameters": [
+        {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    **{
+                        field: {"type": "number", "example": 10.0}
+                        for field in FEATURES
+                    },
+                    "useCache": {"type": "boolean", "example": True, "description": "Permite reutilizar un análisis idéntico previo"}
+                },
+                "required": list(FEATURES),
+            },
+        }
+    ],
+    "responses": {
+        "200": {
+            "description": "Flujo de eventos con las secciones del análisis",
+        },
+        "400": {
+            "description": "Error de validación en el cuerpo de la solicitud",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "error": {"type": "string"}
+                }
+            }
+        },
+        "500": {
+            "description": "Error interno del servidor durante el análisis",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "error": {"type": "string"}
+                }
+            }
+        }
+    }
+})
+def api_analyze_stream():
+    """
+    Endpoint para realizar el análisis de un jugador enviando cada sección en cuanto está lista.
+    """
+    try:
+        if not request.is_json:
+            return jsonify({"error": "Se requiere JSON"}), 400
+        
+        data = request.json
+        parsed = parse_features([data])
+        
+        if not parsed.valid[0]:
+            return jsonify({"error": parsed.errors[0]}), 400
+        
+        user_features = parsed.matrix[0].tolist()
+        
+        scores = profile_scorer_instance.score_one(user_features)
+        position_id = scores["positionId"]
+        physical_id = scores["physicalId"]
+        position_name = POSITIONS_CATEGORIES.get(position_id, f"Perfil desconocido ({position_id})")
+        physical_name = PHYSICAL_CONDITIONS_CATEGORIES.get(physical_id, f"Perfil desconocido ({physical_id})")
+        use_cache = use_analysis_cache(data)
+        event_stream = wants_event_stream()
+        
+        def generate():
+            yield format_stream_event("prediction", {
+                "positionId": position_id,
+                "positionName": position_name,
+                "physicalId": physical_id,
+                "physicalName": physical_name
+            }, event_stream)
+            
+            for event, payload in openai_service.stream_player_analysis(
+                user_features, position_id, physical_id, FEATURES, use_cache
+            ):
+                if event == "analysis":
+                    payload["positionName"] = position_name
+                    payload["physicalName"] = physical_name
+                
+                yield format_stream_event(event, payload, event_stream)
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype="text/event-stream" if event_stream else "application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+        
+    except Exception as error:
+        return jsonify({"error": str(error)}), 500
+
 @analysis_prediction_bp.route("/api/team/analyze", methods=["POST"])
 @swag_from({
     "tags": ["Análisis IA"],
@@ -142,6 +747,7 @@ def api_analyze():
                 "type": "object",
                 "properties": {
                     "teamName": {"type": "string", "example": "IntelliFutsal FC"},
+                    "useCache": {"type": "boolean", "example": True, "description": "Permite reutilizar análisis idénticos previos"},
                     "players": {
                         "type": "array",
                         "items": {
@@ -243,80 +849,270 @@ def api_team_analyze():
         
         players_data = data["players"]
         team_name = data.get("teamName", "Equipo sin nombre")
-        results = []
-        errors = []
+        use_cache = use_analysis_cache(data)
         
-        for i, player_data in enumerate(players_data):
-            try:
-                user_features = []
-                player_id = player_data.get("id", f"player_{i}")
-                player_name = player_data.get("name", f"Jugador {i+1}")
-                
-                for field in FEATURES:
-                    if field not in player_data:
-                        raise ValueError(f"Campo requerido no encontrado para {player_name}: '{field}'")
-                    try:
-                        user_features.append(float(player_data[field]))
-                    except ValueError:
-                        raise ValueError(f"Formato inválido para el campo '{field}' en jugador {player_name}")
-                
-                position_id = positions_predictor_instance.model.predict(user_features)
-                physical_id = physical_conditions_predictor_instance.model.predict(user_features)
-                
-                analysis_result = openai_service.analyze_player_profile(
-                    user_features, 
-                    position_id,
-                    physical_id,
-                    FEATURES
-                )
-                
-                analysis_result["playerId"] = player_id
-                analysis_result["playerName"] = player_name
-                analysis_result["positionName"] = POSITIONS_CATEGORIES.get(position_id, f"Perfil desconocido ({position_id})")
-                analysis_result["physicalName"] = PHYSICAL_CONDITIONS_CATEGORIES.get(physical_id, f"Perfil desconocido ({physical_id})")
-                
-                results.append(analysis_result)
-                
-            except Exception as e:
-                errors.append({
-                    "playerIndex": i,
-                    "playerName": player_data.get("name", f"Jugador {i+1}"),
-                    "error": str(e)
-                })
+        return jsonify(run_team_analysis(players_data, team_name, use_cache))
         
-        team_analysis = None
-        if len(results) > 1:
-            try:
-                team_data = {
-                    "teamName": team_name,
-                    "playerCount": len(results),
-                    "positions": [p["positionName"] for p in results],
-                    "physicalConditions": [p["physicalName"] for p in results],
-                    "playerProfiles": [
-                        {
-                            "name": p["playerName"],
-                            "position": p["positionName"],
-                            "physical": p["physicalName"],
-                            "strengths": p.get("strengths", []),
-                            "weaknesses": p.get("weaknesses", [])
-                        } for p in results
-                    ]
-                }
-                
-                team_analysis = openai_service.analyze_team(team_data)
-            except Exception as e:
-                team_analysis = {"error": f"Error al analizar el equipo: {str(e)}"}
+    except Exception as error:
+        return jsonify({"error": str(error)}), 500
+
+@analysis_prediction_bp.route("/api/team/analyze/jobs", methods=["POST"])
+@swag_from({
+    "tags": ["Análisis IA"],
+    "summary": "Encola el análisis detallado de un equipo completo",
+    "description": (
+        "Igual que /api/team/analyze, pero responde inmediatamente con el identificador de un trabajo que se "
+        "ejecuta en segundo plano. El estado, los resultados parciales y el resultado final se consultan en "
+        "/api/jobs/{jobId}."
+    ),
+    "consumes": ["application/json"],
+    "produces": ["application/json"],
+    "parameters": [
+        {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "teamName": {"type": "string", "example": "IntelliFutsal FC"},
+                    "useCache": {"type": "boolean", "example": True, "description": "Permite reutilizar análisis idénticos previos"},
+                    "players": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "string", "example": "player_1"},
+                                "name": {"type": "string", "example": "Juan Pérez"},
+                                **{
+                                    field: {"type": "number", "example": 10.0}
+                                    for field in FEATURES
+                                }
+                            },
+                            "required": ["name", *FEATURES],
+                        },
+                    },
+                },
+                "required": ["players"],
+            },
+        }
+    ],
+    "responses": {
+        "202": {
+            "description": "Trabajo encolado correctamente",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "success": {"type": "boolean"},
+                    "jobId": {"type": "string"},
+                    "status": {"type": "string", "example": "queued"},
+                    "statusUrl": {"type": "string"},
+                },
+            },
+        },
+        "400": {
+            "description": "Formato inválido en el cuerpo de la solicitud",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "error": {"type": "string"},
+                },
+            },
+        },
+        "503": {
+            "description": "Los trabajos en segundo plano están deshabilitados",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "error": {"type": "string"},
+                },
+            },
+        },
+    },
+})
+def api_team_analyze_job():
+    """
+    Endpoint para encolar el análisis de un equipo completo como trabajo en segundo plano.
+    """
+    try:
+        if job_service_instance is None:
+            return jsonify({"error": "Los trabajos en segundo plano están deshabilitados"}), 503
+        
+        if not request.is_json:
+            return jsonify({"error": "Se requiere JSON"}), 400
+        
+        data = request.json
+        
+        if not isinstance(data, dict) or "players" not in data or not isinstance(data["players"], list):
+            return jsonify({"error": "Formato inválido. Se espera un objeto JSON con una lista de jugadores en 'players'"}), 400
+        
+        job_id = job_service_instance.submit("teamAnalysis", {
+            "players": data["players"],
+            "teamName": data.get("teamName", "Equipo sin nombre"),
+            "useCache": use_analysis_cache(data)
+        })
+        status_url = url_for("jobs.api_job_status", job_id=job_id)
         
         return jsonify({
             "success": True,
-            "teamName": team_name,
-            "playerResults": results,
-            "errors": errors,
-            "totalPlayers": len(players_data),
-            "processedPlayers": len(results),
-            "failedPlayers": len(errors),
-            "teamAnalysis": team_analysis
-        })
+            "jobId": job_id,
+            "status": "queued",
+            "statusUrl": status_url
+        }), 202, {"Location": status_url}
+        
+    except Exception as error:
+        return jsonify({"error": str(error)}), 500
+
+@analysis_prediction_bp.route("/api/team/analyze/stream", methods=["POST"])
+@swag_from({
+    "tags": ["Análisis IA"],
+    "summary": "Análisis detallado de un equipo completo en streaming",
+    "description": (
+        "Igual que /api/team/analyze, pero envía cada resultado en cuanto está listo: primero los clusters "
+        "de cada jugador, luego su análisis de OpenAI a medida que se completa y por último el análisis del equipo. "
+        "Responde con NDJSON (application/x-ndjson, un objeto por línea con su tipo en 'event') o con "
+        "Server-Sent Events si el cliente envía 'Accept: text/event-stream'. "
+        "Eventos: prediction, error, analysis, teamAnalysis y done."
+    ),
+    "consumes": ["application/json"],
+    "produces": ["application/x-ndjson", "text/event-stream"],
+    "parameters": [
+        {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "teamName": {"type": "string", "example": "IntelliFutsal FC"},
+                    "useCache": {"type": "boolean", "example": True, "description": "Permite reutilizar análisis idénticos previos"},
+                    "players": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "string", "example": "player_1"},
+                                "name": {"type": "string", "example": "Juan Pérez"},
+                                **{
+                                    field: {"type": "number", "example": 10.0}
+                                    for field in FEATURES
+                                }
+                            },
+                            "required": ["name", *FEATURES],
+                        },
+                    },
+                },
+                "required": ["players"],
+            },
+        }
+    ],
+    "responses": {
+        "200": {
+            "description": "Flujo de eventos con los resultados del análisis del equipo",
+        },
+        "400": {
+            "description": "Formato inválido en el cuerpo de la solicitud",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "error": {"type": "string"},
+                },
+            },
+        },
+        "500": {
+            "description": "Error interno del servidor durante el análisis del equipo",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "error": {"type": "string"},
+                },
+            },
+        },
+    },
+})
+def api_team_analyze_stream():
+    """
+    Endpoint para realizar el análisis de un equipo completo enviando los resultados a medida que están listos.
+    """
+    try:
+        if not request.is_json:
+            return jsonify({"error": "Se requiere JSON"}), 400
+        
+        data = request.json
+        
+        if not isinstance(data, dict) or "players" not in data or not isinstance(data["players"], list):
+            return jsonify({"error": "Formato inválido. Se espera un objeto JSON con una lista de jugadores en 'players'"}), 400
+        
+        players_data = data["players"]
+        team_name = data.get("teamName", "Equipo sin nombre")
+        use_cache = use_analysis_cache(data)
+        event_stream = wants_event_stream()
+        
+        def generate():
+            results = []
+            scored_players, errors = score_team_players(players_data)
+            
+            analysis_futures = openai_service.submit_player_analyses(
+                [(user_features, position_id, physical_id) for _, _, _, user_features, position_id, physical_id in scored_players],
+                FEATURES,
+                use_cache
+            )
+            
+            for error in sorted(errors, key=lambda error: error["playerIndex"]):
+                yield format_stream_event("error", error, event_stream)
+            
+            for i, player_id, player_name, _, position_id, physical_id in scored_players:
+                yield format_stream_event("prediction", {
+                    "playerIndex": i,
+                    "playerId": player_id,
+                    "playerName": player_name,
+                    "positionId": position_id,
+                    "positionName": POSITIONS_CATEGORIES.get(position_id, f"Perfil desconocido ({position_id})"),
+                    "physicalId": physical_id,
+                    "physicalName": PHYSICAL_CONDITIONS_CATEGORIES.get(physical_id, f"Perfil desconocido ({physical_id})")
+                }, event_stream)
+            
+            players_by_future = dict(zip(analysis_futures, scored_players))
+            
+            for analysis_future in as_completed(analysis_futures):
+                i, player_id, player_name, _, position_id, physical_id = players_by_future[analysis_future]
+                
+                try:
+                    analysis_result = complete_player_result(
+                        analysis_future.result(), player_id, player_name, position_id, physical_id
+                    )
+                except Exception as e:
+                    error = {"playerIndex": i, "playerName": player_name, "error": str(e)}
+                    errors.append(error)
+                    yield format_stream_event("error", error, event_stream)
+                    continue
+                
+                results.append((i, analysis_result))
+                yield format_stream_event("analysis", {"playerIndex": i, **analysis_result}, event_stream)
+            
+            results = [analysis_result for _, analysis_result in sorted(results, key=lambda result: result[0])]
+            
+            if len(results) > 1:
+                try:
+                    team_analysis = openai_service.analyze_team(build_team_data(team_name, results), use_cache)
+                except Exception as e:
+                    team_analysis = {"error": f"Error al analizar el equipo: {str(e)}"}
+                
+                yield format_stream_event("teamAnalysis", {"teamName": team_name, "teamAnalysis": team_analysis}, event_stream)
+            
+            yield format_stream_event("done", {
+                "success": True,
+                "teamName": team_name,
+                "totalPlayers": len(players_data),
+                "processedPlayers": len(results),
+                "failedPlayers": len(errors)
+            }, event_stream)
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype="text/event-stream" if event_stream else "application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
         
     except Exception as error:
         return jsonify({"error": str(error)}), 500
@@ -419,24 +1215,20 @@ def api_full_recommendations():
             return jsonify({"error": "Se requiere JSON"}), 400
         
         data = request.json
-        user_features = []
+        parsed = parse_features([data])
         
-        for field in FEATURES:
-            if field not in data:
-                return jsonify({"error": f"Campo requerido no encontrado: '{field}'"}), 400
-            try:
-                user_features.append(float(data[field]))
-            except ValueError:
-                return jsonify({"error": f"Formato inválido para el campo: '{field}'"}), 400
+        if not parsed.valid[0]:
+            return jsonify({"error": parsed.errors[0]}), 400
         
-        position_id = positions_predictor_instance.model.predict(user_features)
-        physical_id = physical_conditions_predictor_instance.model.predict(user_features)
+        user_features = parsed.matrix[0].tolist()
+        
+        scores = profile_scorer_instance.score_one(user_features)
+        position_id = scores["positionId"]
+        physical_id = scores["physicalId"]
         
         position_name = POSITIONS_CATEGORIES.get(position_id, f"Perfil desconocido ({position_id})")
         physical_name = PHYSICAL_CONDITIONS_CATEGORIES.get(physical_id, f"Perfil desconocido ({physical_id})")
         
-        condition_characteristics = PHYSICAL_CONDITION_CHARACTERISTICS.get(physical_id, {})
-        
         specific_recommendations = []
         if position_id in POSITION_PHYSICAL_RECOMMENDATIONS and physical_id in POSITION_PHYSICAL_RECOMMENDATIONS[position_id]:
             specific_recommendations = POSITION_PHYSICAL_RECOMMENDATIONS[position_id][physical_id]
@@ -450,10 +1242,7 @@ def api_full_recommendations():
             "physicalCondition": {
                 "clusterId": int(physical_id),
                 "clusterName": physical_name,
-                "description": condition_characteristics.get("description", ""),
-                "strengths": condition_characteristics.get("strengths", []),
-                "developmentAreas": condition_characteristics.get("development_areas", []),
-                "trainingRecommendations": condition_characteristics.get("training_recommendations", [])
+                **current_app.json.splice(physical_condition_fragments(physical_id))
             },
             "specificRecommendations": specific_recommendations,
             "features": {field: user_features[i] for i, field in enumerate(FEATURES)}
@@ -0,0 +1,177 @@
+import logging
+import shutil
+import tempfile
+import traceback
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flasgger import swag_from
+from werkzeug.exceptions import HTTPException
+from app.core import Config
+from app.infrastructure import FeatureFileWriter, read_feature_chunks, format_from_media_type, FILE_FORMATS, MEDIA_TYPES
+
+
+logger = logging.getLogger(__name__)
+
+bulk_bp = Blueprint("bulk", __name__)
+bulk_scorer_instance = None
+
+def init_bulk_bp(app, bulk_scorer):
+    """
+    Registers the routes in the Flask application.
+
+    Args:
+        app: Flask application instance.
+        bulk_scorer: Scorer of tabular files.
+    """
+    global bulk_scorer_instance
+    bulk_scorer_instance = bulk_scorer
+
+    app.register_blueprint(bulk_bp)
+
+@bulk_bp.route("/api/bulk/score", methods=["POST"])
+@swag_from({
+    "tags": ["Predicciones IA"],
+    "summary": "Puntúa un archivo CSV, Parquet o NDJSON de jugadores",
+    "description": (
+        "Recibe en el cuerpo de la solicitud un archivo CSV (text/csv), Parquet (application/vnd.apache.parquet) "
+        "o NDJSON (application/x-ndjson) con una columna (o campo) por característica y columnas opcionales 'id' y 'name', y devuelve en streaming un archivo "
+        "con el clúster posicional y físico de cada fila, o su error. El archivo se procesa por bloques de filas, "
+        "por lo que admite archivos mayores que el límite de las demás rutas (BULK_MAX_CONTENT_LENGTH). "
+        "Si el procesamiento falla una vez enviada la respuesta, un archivo CSV o NDJSON termina con una fila "
+        "sin playerIndex cuyo error empieza por 'Procesamiento interrumpido:', y un archivo Parquet queda "
+        "incompleto (sin pie), por lo que no se puede leer."
+    ),
+    "consumes": ["text/csv", "application/vnd.apache.parquet", "application/x-ndjson"],
+    "produces": ["text/csv", "application/vnd.apache.parquet", "application/x-ndjson"],
+    "parameters": [
+        {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "description": "Archivo con las características de los jugadores",
+            "schema": {"type": "string", "format": "binary"}
+        },
+        {
+            "name": "format",
+            "in": "query",
+            "type": "string",
+            "enum": list(FILE_FORMATS),
+            "required": False,
+            "description": "Formato del archivo enviado, si el Content-Type no lo indica"
+        },
+        {
+            "name": "outputFormat",
+            "in": "query",
+            "type": "string",
+            "enum": list(FILE_FORMATS),
+            "required": False,
+            "description": "Formato del archivo devuelto (por defecto, el del archivo enviado)"
+        }
+    ],
+    "responses": {
+        "200": {
+            "description": (
+                "Archivo con una fila por jugador: playerIndex, playerId, playerName, positionId, positionName, "
+                "physicalId, physicalName y error. Si el procesamiento se interrumpe, termina con una fila de error "
+                "(CSV y NDJSON) o queda incompleto (Parquet)"
+            ),
+            "schema": {"type": "string", "format": "binary"}
+        },
+        "400": {
+            "description": "Archivo inválido o formato de salida no soportado",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "error": {"type": "string"}
+                }
+            }
+        },
+        "413": {
+            "description": "El archivo supera BULK_MAX_CONTENT_LENGTH"
+        },
+        "415": {
+            "description": "Formato de archivo no soportado",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "error": {"type": "string"}
+                }
+            }
+        }
+    }
+})
+def api_bulk_score():
+    """
+    Endpoint para puntuar un archivo con las características de muchos jugadores.
+    """
+    spooled_file = None
+    streaming = False
+
+    try:
+        input_format = request.args.get("format") or format_from_media_type(request.mimetype)
+
+        if input_format not in FILE_FORMATS:
+            return jsonify({
+                "error": "Formato no soportado. Se espera un archivo CSV (text/csv), Parquet (application/vnd.apache.parquet) o NDJSON (application/x-ndjson)"
+            }), 415
+
+        output_format = request.args.get("outputFormat", input_format)
+
+        if output_format not in FILE_FORMATS:
+            return jsonify({"error": f"Formato de salida no soportado: '{output_format}'"}), 400
+
+        request.max_content_length = Config.BULK_MAX_CONTENT_LENGTH if Config.BULK_MAX_CONTENT_LENGTH > 0 else None
+        source = request.stream
+
+        if input_format == "parquet":
+            # Parquet keeps its metadata at the end of the file, so the body
+            # is spooled to disk (not memory) before reading it.
+            spooled_file = tempfile.TemporaryFile()
+            shutil.copyfileobj(request.stream, spooled_file, 1 << 20)
+            spooled_file.seek(0)
+            source = spooled_file
+
+        chunks = read_feature_chunks(source, input_format, bulk_scorer_instance.chunk_size)
+        scored_chunks = bulk_scorer_instance.score_chunks(chunks)
+
+        # Scoring the first chunk before answering reports an unreadable
+        # file as a 400 instead of a truncated 200.
+        first_chunk = next(scored_chunks)
+        writer = FeatureFileWriter(output_format)
+
+        def generate():
+            try:
+                yield writer.write(first_chunk)
+
+                for scored_chunk in scored_chunks:
+                    yield writer.write(scored_chunk)
+
+                yield writer.close()
+            except Exception as e:
+                # The status is already sent, so a CSV or NDJSON file ends
+                # with an error row instead; a Parquet file is left without
+                # its footer, so it can't be read as if it were complete.
+                logger.error(f"Bulk scoring interrupted: {traceback.format_exc()}")
+
+                if writer.file_format != "parquet":
+                    yield writer.write(bulk_scorer_instance.interrupted_frame(str(e)))
+            finally:
+                if spooled_file is not None:
+                    spooled_file.close()
+
+        streaming = True
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype=MEDIA_TYPES[output_format],
+            headers={"Content-Disposition": f'attachment; filename="jugadores_puntuados.{output_format}"'}
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+    except Exception as error:
+        return jsonify({"error": str(error)}), 500
+    finally:
+        if spooled_file is not None and not streaming:
+            spooled_file.close()
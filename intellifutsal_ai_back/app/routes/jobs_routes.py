@@ -0,0 +1,100 @@
+from flask import Blueprint, jsonify
+from flasgger import swag_from
+
+
+jobs_bp = Blueprint("jobs", __name__)
+job_service_instance = None
+
+def init_jobs_bp(app, job_service):
+    """
+    Registers the routes in the Flask application.
+    
+    Args:
+        app: Flask application instance.
+        job_service: Background job service, or None if jobs are disabled.
+    """
+    global job_service_instance
+    job_service_instance = job_service
+    
+    app.register_blueprint(jobs_bp)
+
+@jobs_bp.route("/api/jobs/<job_id>", methods=["GET"])
+@swag_from({
+    "tags": ["Trabajos"],
+    "summary": "Consulta el estado de un trabajo en segundo plano",
+    "description": "Devuelve el estado (queued, running, completed o failed), los resultados parciales y el resultado final de un trabajo.",
+    "produces": ["application/json"],
+    "parameters": [
+        {
+            "name": "job_id",
+            "in": "path",
+            "type": "string",
+            "required": True,
+            "description": "Identificador devuelto al encolar el trabajo",
+        }
+    ],
+    "responses": {
+        "200": {
+            "description": "Estado del trabajo",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "jobId": {"type": "string"},
+                    "kind": {"type": "string"},
+                    "status": {"type": "string"},
+                    "attempts": {"type": "integer"},
+                    "createdAt": {"type": "number"},
+                    "updatedAt": {"type": "number"},
+                    "partial": {"type": "object"},
+                    "result": {"type": "object"},
+                    "error": {"type": "string"},
+                },
+            },
+        },
+        "404": {
+            "description": "Trabajo no encontrado",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "error": {"type": "string"},
+                },
+            },
+        },
+        "503": {
+            "description": "Los trabajos en segundo plano están deshabilitados",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "error": {"type": "string"},
+                },
+            },
+        },
+    },
+})
+def api_job_status(job_id):
+    """
+    Endpoint para consultar el estado y los resultados de un trabajo.
+    """
+    try:
+        if job_service_instance is None:
+            return jsonify({"error": "Los trabajos en segundo plano están deshabilitados"}), 503
+        
+        job = job_service_instance.get(job_id)
+        
+        if job is None:
+            return jsonify({"error": f"Trabajo no encontrado: '{job_id}'"}), 404
+        
+        return jsonify({
+            "jobId": job["id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "attempts": job["attempts"],
+            "createdAt": job["createdAt"],
+            "updatedAt": job["updatedAt"],
+            "partial": job["partial"],
+            "result": job["result"],
+            "error": job["error"]
+        })
+        
+    except Exception as error:
+        return jsonify({"error": str(error)}), 500
\ No newline at end of file
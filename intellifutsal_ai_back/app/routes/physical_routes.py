@@ -1,10 +1,9 @@
-from flask import Blueprint, request, jsonify
+from typing import Any, Dict
+from flask import Blueprint, current_app, request, jsonify
 from flasgger import swag_from
-from app.domain import (
-    FEATURES, PHYSICAL_CONDITIONS_CATEGORIES, 
-    PHYSICAL_CONDITION_CHARACTERISTICS
-)
-
+from app.domain import FEATURES, PHYSICAL_CONDITIONS_CATEGORIES
+from app.services import parse_features, physical_condition_fragments
+from .analysis_routes import stream_team_predictions, team_prediction_stream_spec
 
 physical_prediction_bp = Blueprint("physical_prediction", __name__)
 physical_conditions_predictor_instance = None
@@ -100,29 +99,21 @@ def api_predict_physical():
             return jsonify({"error": "Se requiere JSON"}), 400
         
         data = request.json
-        user_features = []
+        parsed = parse_features([data])
         
-        for field in FEATURES:
-            if field not in data:
-                return jsonify({"error": f"Campo requerido no encontrado: '{field}'"}), 400
-            try:
-                user_features.append(float(data[field]))
-            except ValueError:
-                return jsonify({"error": f"Formato inválido para el campo: '{field}'"}), 400
+        if not parsed.valid[0]:
+            return jsonify({"error": parsed.errors[0]}), 400
         
-        cluster_id = physical_conditions_predictor_instance.model.predict(user_features)
-        cluster_name = PHYSICAL_CONDITIONS_CATEGORIES.get(cluster_id, f"Perfil desconocido ({cluster_id})")
+        user_features = parsed.matrix[0].tolist()
         
-        condition_characteristics = PHYSICAL_CONDITION_CHARACTERISTICS.get(cluster_id, {})
+        cluster_id = physical_conditions_predictor_instance.predict(user_features)
+        cluster_name = PHYSICAL_CONDITIONS_CATEGORIES.get(cluster_id, f"Perfil desconocido ({cluster_id})")
         
         return jsonify({
             "success": True,
-            "clusterId": int(cluster_id),
+            "clusterId": cluster_id,
             "clusterName": cluster_name,
-            "description": condition_characteristics.get("description", ""),
-            "strengths": condition_characteristics.get("strengths", []),
-            "developmentAreas": condition_characteristics.get("development_areas", []),
-            "trainingRecommendations": condition_characteristics.get("training_recommendations", []),
+            **current_app.json.splice(physical_condition_fragments(cluster_id)),
             "features": {field: user_features[i] for i, field in enumerate(FEATURES)}
         })
         
@@ -256,44 +247,54 @@ def api_team_predict_physical():
         results = []
         errors = []
         
+        parsed_players = []
+        
+        player_names = [player_data.get("name", f"Jugador {i+1}") for i, player_data in enumerate(players_data)]
+        parsed = parse_features(players_data, player_names)
+        
         for i, player_data in enumerate(players_data):
-            try:
-                user_features = []
+            if parsed.valid[i]:
                 player_id = player_data.get("id", f"player_{i}")
-                player_name = player_data.get("name", f"Jugador {i+1}")
-                
-                for field in FEATURES:
-                    if field not in player_data:
-                        raise ValueError(f"Campo requerido no encontrado para {player_name}: '{field}'")
-                    try:
-                        user_features.append(float(player_data[field]))
-                    except ValueError:
-                        raise ValueError(f"Formato inválido para el campo '{field}' en jugador {player_name}")
+                parsed_players.append((i, player_id, player_names[i], parsed.matrix[i].tolist()))
+            else:
+                errors.append({
+                    "playerIndex": i,
+                    "playerName": player_names[i],
+                    "error": parsed.errors[i]
+                })
+        
+        try:
+            cluster_ids = physical_conditions_predictor_instance.predict_batch(parsed.matrix[parsed.valid])
+        except Exception:
+            cluster_ids = None
+        
+        for position, (i, player_id, player_name, user_features) in enumerate(parsed_players):
+            try:
+                if cluster_ids is not None:
+                    cluster_id = cluster_ids[position]
+                else:
+                    cluster_id = physical_conditions_predictor_instance.predict(user_features)
                 
-                cluster_id = physical_conditions_predictor_instance.model.predict(user_features)
                 cluster_name = PHYSICAL_CONDITIONS_CATEGORIES.get(cluster_id, f"Perfil desconocido ({cluster_id})")
                 
-                condition_characteristics = PHYSICAL_CONDITION_CHARACTERISTICS.get(cluster_id, {})
-                
                 results.append({
                     "playerId": player_id,
                     "playerName": player_name,
-                    "clusterId": int(cluster_id),
+                    "clusterId": cluster_id,
                     "clusterName": cluster_name,
-                    "description": condition_characteristics.get("description", ""),
-                    "strengths": condition_characteristics.get("strengths", []),
-                    "developmentAreas": condition_characteristics.get("development_areas", []),
-                    "trainingRecommendations": condition_characteristics.get("training_recommendations", []),
-                    "features": {field: user_features[i] for i, field in enumerate(FEATURES)}
+                    **current_app.json.splice(physical_condition_fragments(cluster_id)),
+                    "features": {field: user_features[j] for j, field in enumerate(FEATURES)}
                 })
                 
             except Exception as e:
                 errors.append({
                     "playerIndex": i,
-                    "playerName": player_data.get("name", f"Jugador {i+1}"),
+                    "playerName": player_name,
                     "error": str(e)
                 })
         
+        errors.sort(key=lambda error: error["playerIndex"])
+        
         return jsonify({
             "success": True,
             "teamName": team_name,
@@ -305,4 +306,23 @@ def api_team_predict_physical():
         })
         
     except Exception as error:
-        return jsonify({"error": str(error)}), 500
\ No newline at end of file
+        return jsonify({"error": str(error)}), 500
+
+def streamed_physical_result(cluster_id: int) -> Dict[str, Any]:
+    """Returns the fields of a streamed physical condition prediction that depend on its cluster."""
+    return {
+        "clusterName": PHYSICAL_CONDITIONS_CATEGORIES.get(cluster_id, f"Perfil desconocido ({cluster_id})"),
+        **current_app.json.splice(physical_condition_fragments(cluster_id))
+    }
+
+@physical_prediction_bp.route("/api/team/predict-physical/stream", methods=["POST"])
+@swag_from(team_prediction_stream_spec(
+    "Predice la condición física de un equipo completo en streaming",
+    "/api/team/predict-physical",
+    "clusterName, description, strengths, developmentAreas, trainingRecommendations"
+))
+def api_team_predict_physical_stream():
+    """
+    Endpoint para predecir la condición física de un equipo completo leyendo y enviando los jugadores a medida que llegan.
+    """
+    return stream_team_predictions(physical_conditions_predictor_instance, streamed_physical_result)
\ No newline at end of file
@@ -1,2 +1,11 @@
+from .analysis_parser import SectionParser, PLAYER_ANALYSIS_SECTIONS, TEAM_ANALYSIS_SECTIONS
+from .job_service import JobService
 from .openai_service import OpenAIService
-from .predictor_service import PlayerProfilePredictor
\ No newline at end of file
+from .prediction_cache import PredictionCache
+from .predictor_service import PlayerProfilePredictor
+from .profile_scorer import ProfileScorer
+from .model_registry import ModelRegistry, ModelSource, parse_shadow_sources
+from .shadow_scorer import ShadowScorer
+from .feature_parser import FeatureParser, ParsedFeatures, parse_features, parse_feature_columns
+from .bulk_scorer import BulkScorer
+from .response_fragments import PHYSICAL_CONDITION_FRAGMENTS, physical_condition_fragments
\ No newline at end of file
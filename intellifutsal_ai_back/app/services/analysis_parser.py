@@ -0,0 +1,334 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class AnalysisSection(NamedTuple):
+    """Section of a structured analysis returned by the model."""
+
+    header: str
+    key: str
+    is_list: bool
+
+
+PLAYER_ANALYSIS_SECTIONS = (
+    AnalysisSection("ANÁLISIS GENERAL", "generalAnalysis", False),
+    AnalysisSection("FORTALEZAS", "strengths", True),
+    AnalysisSection("ÁREAS DE MEJORA", "weaknesses", True),
+    AnalysisSection("RECOMENDACIONES DE ENTRENAMIENTO", "trainingRecommendations", True),
+    AnalysisSection("PERFIL DE RENDIMIENTO", "performanceProfile", False),
+)
+
+TEAM_ANALYSIS_SECTIONS = (
+    AnalysisSection("ANÁLISIS GENERAL", "generalAnalysis", False),
+    AnalysisSection("PUNTOS FUERTES", "teamStrengths", True),
+    AnalysisSection("ÁREAS DE MEJORA", "teamWeaknesses", True),
+    AnalysisSection("RECOMENDACIONES TÁCTICAS", "tacticalRecommendations", True),
+    AnalysisSection("SUGERENCIAS DE ENTRENAMIENTOS", "trainingRecommendations", True),
+    AnalysisSection("AJUSTES EN LA ALINEACIÓN", "lineupAdjustments", False),
+)
+
+_HEADER_DECORATIONS = "#*_ \t"
+_BULLETS = "-•*"
+
+
+class SectionParser:
+    """
+    Line-oriented parser for the sectioned analyses requested in the system prompts.
+
+    The text is consumed in a single pass, either at once or in arbitrary
+    chunks as it is streamed by the model. Every line is either a section
+    header from the table, a list item or plain text belonging to the current
+    section. A section is reported as complete as soon as the next header
+    starts, so streamed sections can be forwarded before the completion ends.
+    """
+
+    def __init__(self, sections: Sequence[AnalysisSection]):
+        """
+        Initializes the parser.
+
+        Args:
+            sections: Header table of the analysis type, e.g. `PLAYER_ANALYSIS_SECTIONS`.
+        """
+        self.sections = tuple(sections)
+        self._headers = [(section.header.upper(), section) for section in self.sections]
+        self._pending = ""
+        self._current = None
+        self._lines = []
+        self._preamble = []
+        self._values = {}
+
+    @classmethod
+    def parse(cls, content: str, sections: Sequence[AnalysisSection]) -> Dict[str, Any]:
+        """
+        Parses a complete response.
+
+        Args:
+            content: Text returned by the model.
+            sections: Header table of the analysis type.
+
+        Returns:
+            Dictionary with one entry per section, as returned by `result`.
+        """
+        parser = cls(sections)
+        parser.feed(content or "")
+        parser.close()
+        return parser.result()
+
+    def _match_header(self, line: str) -> Optional[Tuple[AnalysisSection, str]]:
+        """
+        Recognizes a section header line, tolerating Markdown decorations.
+
+        Args:
+            line: Stripped line.
+
+        Returns:
+            The section and the text following the header on the same line, or
+            None if the line is not a header.
+        """
+        colon = line.find(":")
+
+        if colon < 0:
+            return None
+
+        header = line[:colon].strip(_HEADER_DECORATIONS).upper()
+
+        for candidate, section in self._headers:
+            if header == candidate:
+                return section, line[colon + 1:].strip(_HEADER_DECORATIONS)
+
+        return None
+
+    def _finish_section(self) -> List[Tuple[str, Any]]:
+        """
+        Closes the current section.
+
+        Returns:
+            A list with the (key, value) pair of the closed section, or an empty
+            list if there was none.
+        """
+        if self._current is None:
+            return []
+
+        section, lines = self._current, self._lines
+        self._current, self._lines = None, []
+
+        if section.is_list:
+            value = _list_items(lines)
+        else:
+            value = _text(lines)
+
+        self._values[section.key] = value
+        return [(section.key, value)]
+
+    def _feed_line(self, line: str) -> List[Tuple[str, Any]]:
+        """
+        Processes one line of the response.
+
+        Args:
+            line: Line without its line break.
+
+        Returns:
+            The (key, value) pairs of the sections completed by this line.
+        """
+        stripped = line.strip()
+        header = self._match_header(stripped)
+
+        if header is None:
+            (self._lines if self._current is not None else self._preamble).append(stripped)
+            return []
+
+        completed = self._finish_section()
+        self._current, rest = header
+
+        if rest:
+            self._lines.append(rest)
+
+        return completed
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Consumes a chunk of the response.
+
+        Args:
+            chunk: Next piece of text, of any length.
+
+        Returns:
+            The (key, value) pairs of the sections completed by this chunk, in
+            order of appearance.
+        """
+        completed = []
+        text = self._pending + chunk
+        start = 0
+        end = text.find("\n")
+
+        while end >= 0:
+            completed.extend(self._feed_line(text[start:end]))
+            start = end + 1
+            end = text.find("\n", start)
+
+        self._pending = text[start:]
+        return completed
+
+    def close(self) -> List[Tuple[str, Any]]:
+        """
+        Signals the end of the response.
+
+        Returns:
+            The (key, value) pairs of the sections still open.
+        """
+        completed = []
+
+        if self._pending:
+            completed.extend(self._feed_line(self._pending))
+            self._pending = ""
+
+        completed.extend(self._finish_section())
+        return completed
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Returns every section parsed so far.
+
+        Missing sections get an empty value. Text before the first header is
+        used as the general analysis when that section is missing.
+
+        Returns:
+            Dictionary keyed by the section keys of the header table.
+        """
+        result = {
+            section.key: list(self._values.get(section.key, [])) if section.is_list
+            else self._values.get(section.key, "")
+            for section in self.sections
+        }
+        general_key = self.sections[0].key
+
+        if not result[general_key]:
+            result[general_key] = _text(self._preamble)
+
+        return result
+
+
+def _text(lines: List[str]) -> str:
+    """
+    Joins the lines of a text section, dropping surrounding blank lines.
+
+    Args:
+        lines: Stripped lines of the section.
+
+    Returns:
+        The section text.
+    """
+    return "\n".join(lines).strip()
+
+
+def _list_items(lines: List[str]) -> List[str]:
+    """
+    Extracts the items of a list section.
+
+    Items start with a bullet (`-`, `•`, `*`) or a number (`1.`, `1)`); other
+    non-empty lines continue the previous item.
+
+    Args:
+        lines: Stripped lines of the section.
+
+    Returns:
+        The list items.
+    """
+    items = []
+    continues = False
+
+    for line in lines:
+        if not line:
+            continues = False
+            continue
+
+        item = _strip_marker(line)
+
+        if item is None:
+            if continues and items:
+                items[-1] = f"{items[-1]} {line}"
+            else:
+                items.append(line)
+                continues = True
+            continue
+
+        if item:
+            items.append(item)
+            continues = True
+
+    return items
+
+
+def _strip_marker(line: str) -> Optional[str]:
+    """
+    Removes the bullet or number marker of a list item.
+
+    Args:
+        line: Stripped, non-empty line.
+
+    Returns:
+        The item text, or None if the line has no marker.
+    """
+    if line[0] in _BULLETS:
+        return line[1:].strip()
+
+    digits = 0
+    while digits < len(line) and line[digits].isdigit():
+        digits += 1
+
+    if 0 < digits < len(line) and line[digits] in ".)":
+        return line[digits + 1:].strip()
+
+    return None
+
+
+def player_block_start(number: int) -> str:
+    """Returns the line opening the analysis of the given player in a batched response."""
+    return f"=== JUGADOR {number} ==="
+
+
+def player_block_end(number: int) -> str:
+    """Returns the line closing the analysis of the given player in a batched response."""
+    return f"=== FIN JUGADOR {number} ==="
+
+
+def split_player_blocks(content: str, count: int) -> List[Optional[str]]:
+    """
+    Splits a batched response into the analysis of each player.
+
+    Players are numbered from 1 and delimited by `player_block_start` and
+    `player_block_end` lines (Markdown decorations are tolerated). Only
+    blocks with their closing line are kept: a block cut off by the next
+    opening line or by the end of the response (e.g. a completion truncated
+    at the token limit) may be incomplete, so that player is left missing.
+
+    Args:
+        content: Batched response text.
+        count: Number of players requested.
+
+    Returns:
+        One entry per player, in order: the text of their analysis, or None if
+        it is missing or empty.
+    """
+    blocks = [None] * count
+    number = None
+    lines = []
+
+    def close_block():
+        if number is not None and 1 <= number <= count and blocks[number - 1] is None:
+            text = "\n".join(lines).strip()
+            blocks[number - 1] = text or None
+
+    for line in (content or "").splitlines():
+        marker = line.strip().strip("#*=_ \t").upper()
+        words = marker.split()
+
+        if len(words) == 2 and words[0] == "JUGADOR" and words[1].isdigit():
+            number, lines = int(words[1]), []
+        elif len(words) == 3 and words[:2] == ["FIN", "JUGADOR"] and words[2].isdigit():
+            if number == int(words[2]):
+                close_block()
+            number, lines = None, []
+        elif number is not None:
+            lines.append(line)
+
+    return blocks
@@ -0,0 +1,146 @@
+import logging
+from typing import Iterable, Iterator
+import numpy as np
+import pandas as pd
+from app.domain import FEATURES, POSITIONS_CATEGORIES, PHYSICAL_CONDITIONS_CATEGORIES
+from .feature_parser import parse_feature_columns
+from .profile_scorer import ProfileScorer
+
+
+logger = logging.getLogger(__name__)
+
+RESULT_COLUMNS = [
+    "playerIndex", "playerId", "playerName",
+    "positionId", "positionName", "physicalId", "physicalName", "error"
+]
+
+
+def _text(value, default: str) -> str:
+    """Returns a cell as text, or the default if it's empty."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return default
+
+    return str(value)
+
+
+class BulkScorer:
+    """
+    Scores tabular files of players chunk by chunk.
+
+    Each chunk is parsed column by column with the same validation as the
+    JSON routes, and its valid rows are scored in one `ProfileScorer` call
+    that bypasses the prediction caches. Only one chunk is held at a time,
+    so memory stays flat whatever the size of the file.
+    """
+
+    def __init__(self, profile_scorer: ProfileScorer, chunk_size: int = 2000):
+        """
+        Initializes the scorer.
+
+        Args:
+            profile_scorer: Scorer of both clusters.
+            chunk_size: Number of rows read and scored at a time.
+        """
+        self.profile_scorer = profile_scorer
+        self.chunk_size = max(1, chunk_size)
+
+    def score_frame(self, frame: pd.DataFrame, offset: int = 0) -> pd.DataFrame:
+        """
+        Scores a chunk of players.
+
+        Args:
+            frame: One row per player, with a column per feature of `FEATURES`
+                and optional `id` and `name` columns.
+            offset: Index of the chunk's first row in the whole file.
+
+        Returns:
+            One row per player with the `RESULT_COLUMNS`: its index, id and
+            name, both clusters if it was scored, or the error otherwise.
+        """
+        n_rows = len(frame)
+        indices = range(offset, offset + n_rows)
+        names = frame["name"] if "name" in frame else [None] * n_rows
+        ids = frame["id"] if "id" in frame else [None] * n_rows
+
+        player_names = [_text(name, f"Jugador {i+1}") for i, name in zip(indices, names)]
+        player_ids = [_text(player_id, f"player_{i}") for i, player_id in zip(indices, ids)]
+
+        parsed = parse_feature_columns(frame, n_rows, player_names)
+        errors = list(parsed.errors)
+        position_ids = [None] * n_rows
+        physical_ids = [None] * n_rows
+        valid_rows = np.flatnonzero(parsed.valid).tolist()
+
+        if valid_rows:
+            try:
+                scores = self.profile_scorer.score(parsed.matrix[parsed.valid], use_cache=False)
+
+                for i, position_id, physical_id in zip(valid_rows, scores["positionIds"], scores["physicalIds"]):
+                    position_ids[i] = position_id
+                    physical_ids[i] = physical_id
+            except Exception as e:
+                logger.error(f"Error scoring rows {offset}-{offset + n_rows - 1}: {str(e)}")
+                for i in valid_rows:
+                    errors[i] = str(e)
+
+        return pd.DataFrame({
+            "playerIndex": pd.array(indices, dtype="int64"),
+            "playerId": pd.array(player_ids, dtype="string"),
+            "playerName": pd.array(player_names, dtype="string"),
+            "positionId": pd.array(position_ids, dtype="Int64"),
+            "positionName": pd.array([
+                None if cluster_id is None else POSITIONS_CATEGORIES.get(cluster_id, f"Perfil desconocido ({cluster_id})")
+                for cluster_id in position_ids
+            ], dtype="string"),
+            "physicalId": pd.array(physical_ids, dtype="Int64"),
+            "physicalName": pd.array([
+                None if cluster_id is None else PHYSICAL_CONDITIONS_CATEGORIES.get(cluster_id, f"Perfil desconocido ({cluster_id})")
+                for cluster_id in physical_ids
+            ], dtype="string"),
+            "error": pd.array(errors, dtype="string"),
+        }, columns=RESULT_COLUMNS)
+
+    @staticmethod
+    def interrupted_frame(error: str) -> pd.DataFrame:
+        """
+        Builds the row that ends a file whose scoring failed midway.
+
+        Args:
+            error: Description of the failure.
+
+        Returns:
+            A single row with the `RESULT_COLUMNS`, empty except for the
+            error, so it can't be mistaken for a player.
+        """
+        return pd.DataFrame({
+            "playerIndex": pd.array([None], dtype="Int64"),
+            "playerId": pd.array([None], dtype="string"),
+            "playerName": pd.array([None], dtype="string"),
+            "positionId": pd.array([None], dtype="Int64"),
+            "positionName": pd.array([None], dtype="string"),
+            "physicalId": pd.array([None], dtype="Int64"),
+            "physicalName": pd.array([None], dtype="string"),
+            "error": pd.array([f"Procesamiento interrumpido: {error}"], dtype="string"),
+        }, columns=RESULT_COLUMNS)
+
+    def score_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Scores a file read in chunks.
+
+        Args:
+            chunks: Chunks of players, in file order.
+
+        Yields:
+            The scored rows of each chunk. At least one (possibly empty)
+            frame is yielded, so an empty file still gets a header.
+        """
+        offset = 0
+        scored_any = False
+
+        for frame in chunks:
+            yield self.score_frame(frame, offset)
+            offset += len(frame)
+            scored_any = True
+
+        if not scored_any:
+            yield self.score_frame(pd.DataFrame(columns=FEATURES))
@@ -0,0 +1,196 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from app.infrastructure import SQLiteJobStore
+
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any], Callable[[Dict[str, Any]], None]], Dict[str, Any]]
+
+
+class _JobLost(Exception):
+    """Raised by the partial results callback of a job no longer owned by this process."""
+
+
+class JobService:
+    """Runs long analyses in a background thread pool, tracking them in a job store."""
+
+    def __init__(self, store: SQLiteJobStore, max_workers: int = 2, stale_after: float = 900.0,
+                 max_attempts: int = 3, requeue_interval: float = 60.0):
+        """
+        Initializes the service.
+
+        Args:
+            store: Persistent job store.
+            max_workers: Jobs run at the same time in each process.
+            stale_after: Seconds without updates after which a running job is
+                considered abandoned and queued again.
+            max_attempts: Maximum number of times a job is started.
+            requeue_interval: Seconds between checks for abandoned jobs in
+                each process.
+        """
+        self.store = store
+        self.max_workers = max(1, max_workers)
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.requeue_interval = requeue_interval
+        self._handlers: Dict[str, JobHandler] = {}
+        self._executor = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
+        self._requeued_at = None
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """
+        Registers the handler of a job type.
+
+        The handler receives the job payload and a callback to publish partial
+        results, and returns the final result. Both must be JSON serializable.
+
+        Args:
+            kind: Job type.
+            handler: Function running the job.
+        """
+        self._handlers[kind] = handler
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Returns the thread pool running jobs in this process.
+
+        The pool is created lazily in each process, since threads don't survive
+        the fork of gunicorn workers. Pending jobs are resumed when it is
+        created and then every `requeue_interval` seconds (see
+        `_resume_pending`).
+
+        Returns:
+            Thread pool bounded to `max_workers` workers.
+        """
+        with self._executor_lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="jobs")
+                self._executor_pid = os.getpid()
+                self._requeued_at = None
+
+            executor = self._executor
+
+        self._resume_pending(executor)
+        return executor
+
+    def _resume_pending(self, executor: ThreadPoolExecutor) -> None:
+        """
+        Queues again the jobs abandoned by dead workers and schedules every queued job.
+
+        Runs at most once every `requeue_interval` seconds per process, so
+        jobs abandoned while the workers keep running are picked up as well.
+        Jobs already scheduled are skipped by `_run`, which claims them first.
+
+        Args:
+            executor: Thread pool of this process.
+        """
+        now = time.monotonic()
+
+        with self._executor_lock:
+            if self._requeued_at is not None and now - self._requeued_at < self.requeue_interval:
+                return
+
+            self._requeued_at = now
+
+        try:
+            requeued = self.store.requeue_abandoned(self.stale_after, self.max_attempts)
+
+            if requeued:
+                logger.warning(f"Requeued {requeued} abandoned jobs")
+
+            for job_id in self.store.queued():
+                executor.submit(self._run, job_id)
+        except sqlite3.Error as e:
+            logger.warning(f"Pending jobs not resumed: {str(e)}")
+
+    def resume(self) -> None:
+        """
+        Starts the pool of this process, resuming pending jobs.
+
+        Cheap enough to call on every request: it only reaches the job store
+        when the pool is created and every `requeue_interval` seconds.
+        """
+        self._get_executor()
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> str:
+        """
+        Queues a job.
+
+        Args:
+            kind: Job type, which must have a registered handler.
+            payload: JSON serializable input of the job.
+
+        Returns:
+            The job id.
+
+        Raises:
+            ValueError: If there's no handler for the job type.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Tipo de trabajo desconocido: '{kind}'")
+
+        executor = self._get_executor()
+        job_id = self.store.create(kind, payload)
+        executor.submit(self._run, job_id)
+
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the status of a job.
+
+        Args:
+            job_id: Job id.
+
+        Returns:
+            The job as stored, or None if it doesn't exist.
+        """
+        self._get_executor()
+        return self.store.get(job_id)
+
+    def _run(self, job_id: str) -> None:
+        """
+        Runs a queued job, unless another worker already claimed it.
+
+        The job stops at its next partial result if it is no longer running
+        in this process (e.g. it was requeued as abandoned and claimed by
+        another worker), and its result is then discarded.
+
+        Args:
+            job_id: Job id.
+        """
+        if not self.store.claim(job_id):
+            return
+
+        job = self.store.get(job_id)
+        handler = self._handlers.get(job["kind"])
+
+        if handler is None:
+            self.store.fail(job_id, f"Tipo de trabajo desconocido: '{job['kind']}'")
+            return
+
+        def publish(partial: Dict[str, Any]) -> None:
+            if not self.store.update_partial(job_id, partial):
+                raise _JobLost()
+
+        try:
+            result = handler(job["payload"], publish)
+        except _JobLost:
+            logger.warning(f"Job {job_id} stopped, it is no longer owned by this process")
+            return
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {traceback.format_exc()}")
+            self.store.fail(job_id, str(e))
+            return
+
+        if not self.store.complete(job_id, result):
+            logger.warning(f"Result of job {job_id} discarded, it is no longer owned by this process")
@@ -0,0 +1,299 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from app.domain import FEATURES, FEATURE_VALIDATIONS, POSITIONS_CATEGORIES, PHYSICAL_CONDITIONS_CATEGORIES
+from app.infrastructure import PickleModelLoader
+from app.infrastructure.compiled_forest import sample_feature_space
+from app.infrastructure.model_artifact import file_digest
+from .profile_scorer import ProfileScorer
+from .shadow_scorer import ShadowScorer
+
+
+logger = logging.getLogger(__name__)
+
+POSITIONS = "positions"
+PHYSICAL_CONDITIONS = "physicalConditions"
+
+
+class ModelSource(NamedTuple):
+    """Files a model is loaded from."""
+    model_path: str
+    scaler_path: str
+    artifact_path: Optional[str] = None
+
+
+def parse_shadow_sources(model_paths: str, scaler_paths: str, default_scaler_path: str) -> List[ModelSource]:
+    """
+    Builds the shadow versions of a model from comma-separated settings.
+
+    Args:
+        model_paths: Comma-separated model pickles.
+        scaler_paths: Comma-separated scaler pickles, one per model. Missing
+            entries use `default_scaler_path`.
+        default_scaler_path: Scaler of the primary model.
+
+    Returns:
+        One source per shadow model.
+    """
+    models = [path.strip() for path in model_paths.split(",") if path.strip()]
+    scalers = [path.strip() for path in scaler_paths.split(",")]
+
+    return [
+        ModelSource(model, scalers[i] if i < len(scalers) and scalers[i] else default_scaler_path)
+        for i, model in enumerate(models)
+    ]
+
+
+def version_label(source: ModelSource) -> str:
+    """
+    Returns the version label of a model, `<file name>@<digest prefix>`.
+
+    The label only depends on the contents of the model and scaler files,
+    so every worker (and every deployment) names a version the same way.
+    """
+    digests = "".join(file_digest(path) for path in (source.model_path, source.scaler_path))
+    digest = hashlib.sha256(digests.encode("ascii")).hexdigest()
+
+    return f"{os.path.splitext(os.path.basename(source.model_path))[0]}@{digest[:12]}"
+
+
+class ModelRegistry:
+    """
+    Reloads the models when their files change, without restarting workers.
+
+    Each process watches the model, scaler and artifact files of both models.
+    When any of them changes, the new version is loaded and validated in a
+    background thread while the current one keeps serving requests, and then
+    swapped in through `ProfileScorer.set_models`, which also invalidates the
+    cached predictions. A version that fails to load or validate is logged
+    and ignored until its files change again.
+
+    A reload can also be requested explicitly (`request_reload`); it touches a
+    marker file so the other workers, which watch it too, reload as well.
+
+    Besides the served (primary) version, each model can have shadow
+    versions: a sample of the live traffic is also scored by them off the
+    request path (see `ShadowScorer`) to compare them with the primary
+    before promoting them. Shadow versions are configuration, so they are
+    loaded once, when the registry is created.
+    """
+
+    def __init__(self, profile_scorer: ProfileScorer, sources: Dict[str, ModelSource],
+                 poll_interval: float = 30.0, marker_path: Optional[str] = None,
+                 shadow_sources: Optional[Dict[str, List[ModelSource]]] = None,
+                 shadow_sample_rate: float = 0.1, shadow_queue_size: int = 1000):
+        """
+        Initializes the registry with the models already loaded by the scorer.
+
+        Args:
+            profile_scorer: Scorer whose predictors hold the served models.
+            sources: Files of each model, keyed by `POSITIONS` and `PHYSICAL_CONDITIONS`.
+            poll_interval: Seconds between checks of the files. Zero or less
+                disables watching; reloads can still be requested with `reload`.
+            marker_path: File touched by `request_reload` to make every worker
+                reload both models.
+            shadow_sources: Files of the shadow versions of each model.
+            shadow_sample_rate: Fraction of scored batches sent to the shadows.
+            shadow_queue_size: Maximum number of batches waiting for the shadows.
+
+        Raises:
+            ModelLoadError: If a shadow version can't be loaded.
+        """
+        self.profile_scorer = profile_scorer
+        self.sources = sources
+        self.poll_interval = poll_interval
+        self.marker_path = marker_path
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._fingerprints = {name: self._fingerprint(source) for name, source in sources.items()}
+        self._marker_fingerprint = self._fingerprint((marker_path,))
+        self._versions = {
+            name: {"version": 1, "label": version_label(source), "loadedAt": time.time(), "error": None}
+            for name, source in sources.items()
+        }
+        self._watcher_pid = None
+        self.shadow_scorers = {}
+
+        for name in sources:
+            shadow_scorer = ShadowScorer(name, shadow_sample_rate, shadow_queue_size)
+            shadow_scorer.set_primary(self._versions[name]["label"])
+
+            for shadow_source in (shadow_sources or {}).get(name, []):
+                label = version_label(shadow_source)
+
+                if label == self._versions[name]["label"]:
+                    logger.warning(f"Shadow version {label} of {name} is the primary version, ignored")
+                    continue
+
+                adapter = PickleModelLoader.load_adapter(*shadow_source)
+                self._validate(name, adapter)
+                shadow_scorer.add_shadow(label, adapter)
+
+            self._predictor(name).shadow = shadow_scorer
+            self.shadow_scorers[name] = shadow_scorer
+
+    def _predictor(self, name: str):
+        """Returns the predictor serving a model."""
+        if name == POSITIONS:
+            return self.profile_scorer.positions_predictor
+
+        return self.profile_scorer.physical_conditions_predictor
+
+    @staticmethod
+    def _fingerprint(paths) -> Tuple:
+        """Returns the size and modification time of some files."""
+        fingerprint = []
+
+        for path in paths:
+            try:
+                stat = os.stat(path) if path else None
+            except OSError:
+                stat = None
+            fingerprint.append((stat.st_size, stat.st_mtime_ns) if stat else None)
+
+        return tuple(fingerprint)
+
+    @staticmethod
+    def _validate(name: str, adapter: Any) -> None:
+        """
+        Checks that a loaded model predicts known clusters over the valid feature ranges.
+
+        Raises:
+            ValueError: If the model fails or predicts an unknown cluster.
+        """
+        categories = POSITIONS_CATEGORIES if name == POSITIONS else PHYSICAL_CONDITIONS_CATEGORIES
+        predictions = adapter.predict_batch(sample_feature_space(FEATURE_VALIDATIONS, FEATURES, n_samples=500))
+        unknown = set(predictions) - set(categories)
+
+        if unknown:
+            raise ValueError(f"El modelo predice categorías desconocidas: {sorted(unknown)}")
+
+    def ensure_watching(self) -> None:
+        """
+        Starts the watcher thread of this process, if not running.
+
+        Cheap enough to call on every request: threads don't survive the fork
+        of gunicorn workers, so each worker starts its own on first use.
+        """
+        if self.poll_interval <= 0 or self._watcher_pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._watcher_pid == os.getpid():
+                return
+
+            self._watcher_pid = os.getpid()
+            threading.Thread(target=self._watch, name="model-watcher", daemon=True).start()
+
+    def _watch(self) -> None:
+        """Checks the model files every `poll_interval` seconds."""
+        while True:
+            time.sleep(self.poll_interval)
+
+            try:
+                self.reload()
+            except Exception:
+                logger.error(f"Model watcher failed: {traceback.format_exc()}")
+
+    def reload(self, force: bool = False) -> List[str]:
+        """
+        Loads, validates and swaps in the models whose files changed, or both
+        of them if the reload marker changed.
+
+        Args:
+            force: If True, reloads both models even if their files didn't change.
+
+        Returns:
+            Names of the models that were replaced.
+        """
+        with self._reload_lock:
+            loaded = {}
+            marker_fingerprint = self._fingerprint((self.marker_path,))
+
+            if marker_fingerprint != self._marker_fingerprint:
+                self._marker_fingerprint = marker_fingerprint
+                force = True
+
+            for name, source in self.sources.items():
+                fingerprint = self._fingerprint(source)
+
+                if not force and fingerprint == self._fingerprints[name]:
+                    continue
+
+                self._fingerprints[name] = fingerprint
+
+                try:
+                    adapter = PickleModelLoader.load_adapter(*source)
+                    self._validate(name, adapter)
+                    label = version_label(source)
+                except Exception as e:
+                    logger.error(f"New version of the {name} model rejected: {str(e)}")
+                    with self._lock:
+                        self._versions[name]["error"] = str(e)
+                    continue
+
+                loaded[name] = (adapter, label)
+
+            if loaded:
+                self.profile_scorer.set_models(
+                    loaded[POSITIONS][0] if POSITIONS in loaded else None,
+                    loaded[PHYSICAL_CONDITIONS][0] if PHYSICAL_CONDITIONS in loaded else None
+                )
+
+                for name, (_, label) in loaded.items():
+                    self.shadow_scorers[name].set_primary(label)
+
+                    with self._lock:
+                        self._versions[name] = {
+                            "version": self._versions[name]["version"] + 1,
+                            "label": label,
+                            "loadedAt": time.time(),
+                            "error": None
+                        }
+                    logger.info(f"Model {name} reloaded (version {self._versions[name]['version']}, {label})")
+
+            return list(loaded)
+
+    def request_reload(self) -> List[str]:
+        """
+        Reloads both models in this process and signals the other workers to do so.
+
+        Returns:
+            Names of the models that were replaced in this process.
+        """
+        if self.marker_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.marker_path)), exist_ok=True)
+
+            with self._reload_lock:
+                with open(self.marker_path, "w") as file:
+                    file.write(f"{time.time()}\n")
+                self._marker_fingerprint = self._fingerprint((self.marker_path,))
+
+        return self.reload(force=True)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the version served by this process for each model.
+
+        Returns:
+            Dictionary with the version number and label, load time, shadow
+            versions and last rejected version error of each model.
+        """
+        with self._lock:
+            return {
+                name: dict(version, shadows=self.shadow_scorers[name].shadow_versions)
+                for name, version in self._versions.items()
+            }
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the scoring metrics of every version of each model in this process.
+
+        Returns:
+            Dictionary with the `ShadowScorer.metrics` of each model.
+        """
+        return {name: shadow_scorer.metrics() for name, shadow_scorer in self.shadow_scorers.items()}
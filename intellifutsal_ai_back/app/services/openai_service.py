@@ -1,20 +1,873 @@
+import asyncio
+import os
+import random
+import threading
+import time
+import aiohttp
 import openai
-from typing import Dict, List, Any
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Any, Optional, Sequence, Tuple
 from app.core import Config
 from app.domain import PHYSICAL_CONDITION_CHARACTERISTICS, POSITION_PHYSICAL_RECOMMENDATIONS
+from app.exceptions import CircuitOpenError
+from app.infrastructure import CircuitBreaker, OpenAISessionFactory, SingleFlight, SQLiteAnalysisCache, file_lock
+from .analysis_parser import (
+    AnalysisSection, PLAYER_ANALYSIS_SECTIONS, TEAM_ANALYSIS_SECTIONS, SectionParser,
+    player_block_end, player_block_start, split_player_blocks
+)
+
+
+PLAYER_ANALYSIS_SYSTEM_PROMPT = (
+    """Eres un asistente especializado en análisis deportivo para 
+                            fútbol sala. Tu trabajo es analizar datos antropométricos y 
+                            físicos de jugadores para proporcionar recomendaciones precisas 
+                            y útiles al cuerpo técnico.
+                            
+                            IMPORTANTE: Debes responder estrictamente siguiendo esta estructura:
+                            
+                            ANÁLISIS GENERAL:
+                            [Escribe aquí tu análisis general]
+                            
+                            FORTALEZAS:
+                            - [Fortaleza 1]
+                            - [Fortaleza 2]
+                            - [Fortaleza 3]
+                            
+                            ÁREAS DE MEJORA:
+                            - [Área de mejora 1]
+                            - [Área de mejora 2]
+                            - [Área de mejora 3]
+                            
+                            RECOMENDACIONES DE ENTRENAMIENTO:
+                            - [Recomendación 1]
+                            - [Recomendación 2]
+                            - [Recomendación 3]
+                            
+                            PERFIL DE RENDIMIENTO:
+                            [Escribe aquí el perfil de rendimiento]
+                            
+                            Es crucial que mantengas EXACTAMENTE este formato con los mismos encabezados
+                            y estructura para que el sistema pueda procesar correctamente tu respuesta.
+                            Usa siempre guiones para los elementos de las listas.
+                            
+                            Sé conciso pero completo. Cada sección debe ser precisa y directa para asegurar
+                            que la respuesta completa se ajuste dentro del límite de tokens disponible."""
+)
+
+TEAM_ANALYSIS_SYSTEM_PROMPT = (
+    """Eres un asistente especializado en análisis deportivo y
+                            entrenador experto de fútbol sala. Tu trabajo es analizar 
+                            datos antropométricos y físicos de jugadores para proporcionar
+                            análisis tácticos y estratégicos precisos para equipos.
+                            
+                            IMPORTANTE: Debes responder estrictamente siguiendo esta estructura:
+                            
+                            ANÁLISIS GENERAL:
+                            [Escribe aquí tu análisis general]
+                            
+                            PUNTOS FUERTES:
+                            - [Punto fuerte 1]
+                            - [Punto fuerte 2]
+                            - [Punto fuerte 3]
+                            
+                            ÁREAS DE MEJORA:
+                            - [Área de mejora 1]
+                            - [Área de mejora 2]
+                            - [Área de mejora 3]
+                            
+                            RECOMENDACIONES TÁCTICAS:
+                            - [Recomendación 1]
+                            - [Recomendación 2]
+                            - [Recomendación 3]
+                            
+                            SUGERENCIAS DE ENTRENAMIENTOS:
+                            - [Sugerencia 1]
+                            - [Sugerencia 2]
+                            - [Sugerencia 3]
+                            
+                            AJUSTES EN LA ALINEACIÓN:
+                            [Escribe aquí los posibles ajustes]
+                            
+                            Es crucial que mantengas EXACTAMENTE este formato con los mismos encabezados
+                            y estructura para que el sistema pueda procesar correctamente tu respuesta.
+                            Usa siempre guiones para los elementos de las listas.
+                            
+                            Sé conciso pero completo. Cada sección debe ser precisa y directa para asegurar
+                            que la respuesta completa se ajuste dentro del límite de tokens disponible."""
+)
+
+BATCH_PLAYER_ANALYSIS_SYSTEM_PROMPT = (
+    f"""Eres un asistente especializado en análisis deportivo para 
+                            fútbol sala. Tu trabajo es analizar datos antropométricos y 
+                            físicos de varios jugadores para proporcionar recomendaciones precisas 
+                            y útiles al cuerpo técnico.
+                            
+                            IMPORTANTE: Analiza cada jugador por separado y en el mismo orden en que
+                            se te envían. La respuesta de cada jugador debe empezar con la línea
+                            "{player_block_start(1)}" (con su número) y terminar con la línea
+                            "{player_block_end(1)}", y entre ambas seguir estrictamente esta estructura:
+                            
+                            ANÁLISIS GENERAL:
+                            [Escribe aquí tu análisis general]
+                            
+                            FORTALEZAS:
+                            - [Fortaleza 1]
+                            - [Fortaleza 2]
+                            - [Fortaleza 3]
+                            
+                            ÁREAS DE MEJORA:
+                            - [Área de mejora 1]
+                            - [Área de mejora 2]
+                            - [Área de mejora 3]
+                            
+                            RECOMENDACIONES DE ENTRENAMIENTO:
+                            - [Recomendación 1]
+                            - [Recomendación 2]
+                            - [Recomendación 3]
+                            
+                            PERFIL DE RENDIMIENTO:
+                            [Escribe aquí el perfil de rendimiento]
+                            
+                            Es crucial que mantengas EXACTAMENTE este formato con los mismos delimitadores,
+                            encabezados y estructura para que el sistema pueda procesar correctamente tu respuesta.
+                            Usa siempre guiones para los elementos de las listas.
+                            
+                            Sé conciso pero completo. Cada sección debe ser precisa y directa para asegurar
+                            que la respuesta de todos los jugadores se ajuste dentro del límite de tokens disponible."""
+)
+
+
+# Errors caused by the request itself (4xx), not by the health of the API;
+# the circuit breaker doesn't count them.
+OPENAI_CLIENT_ERRORS = (
+    openai.error.InvalidRequestError, openai.error.AuthenticationError, openai.error.PermissionError
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimates the number of tokens of a text (about four characters each).
+    
+    Args:
+        text: Prompt text.
+    
+    Returns:
+        Estimated token count.
+    """
+    return (len(text) + 3) // 4
 
 
 class OpenAIService:
     """Service for integration with the OpenAI API."""
     
-    def __init__(self):
-        """Initializes the service with the OpenAI API key."""
-        openai.api_key = Config.OPENAI_API_KEY
+    def __init__(self, cache: Optional[SQLiteAnalysisCache] = None):
+        """
+        Initializes the service with the OpenAI API key.
+        
+        Requests go through a keep-alive connection pool per worker, with the
+        timeouts and retry policy of the `OPENAI_*` settings. `OPENAI_API_BASE`
+        points them to another server, e.g. a local stand-in for load tests.
+        A circuit breaker stops calling OpenAI while it keeps failing or
+        answering too slowly; analyses are then built from the cluster
+        characteristics and flagged as `degraded`.
+        
+        Args:
+            cache: Optional persistent cache for completions.
+        """
+        openai.api_key = Config.OPENAI_API_KEY
+        
+        if Config.OPENAI_API_BASE:
+            openai.api_base = Config.OPENAI_API_BASE
+        
+        openai.requestssession = OpenAISessionFactory(
+            pool_size=Config.OPENAI_POOL_SIZE,
+            max_retries=Config.OPENAI_MAX_RETRIES,
+            backoff_factor=Config.OPENAI_RETRY_BACKOFF,
+            backoff_jitter=Config.OPENAI_RETRY_JITTER
+        )
+        self.request_timeout = (Config.OPENAI_CONNECT_TIMEOUT, Config.OPENAI_READ_TIMEOUT)
+        self.cache = cache
+        self.single_flight = SingleFlight() if Config.OPENAI_SINGLE_FLIGHT else None
+        self.circuit_breaker = None
+        
+        if Config.OPENAI_CIRCUIT_BREAKER:
+            self.circuit_breaker = CircuitBreaker(
+                "openai",
+                failure_rate_threshold=Config.OPENAI_BREAKER_FAILURE_RATE,
+                slow_call_threshold=Config.OPENAI_BREAKER_SLOW_CALL_SECONDS,
+                window_size=Config.OPENAI_BREAKER_WINDOW,
+                min_calls=Config.OPENAI_BREAKER_MIN_CALLS,
+                open_duration=Config.OPENAI_BREAKER_OPEN_SECONDS,
+                half_open_max_calls=Config.OPENAI_BREAKER_HALF_OPEN_CALLS,
+                ignored_exceptions=OPENAI_CLIENT_ERRORS
+            )
+        self.max_concurrency = max(1, Config.OPENAI_MAX_CONCURRENCY)
+        self._executor = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
+        self._async_flights = {}
+        self._aiohttp_session = None
+        self._aiohttp_loop = None
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Returns the thread pool used for concurrent requests.
+        
+        The pool is created lazily in each process, since threads don't survive
+        the fork of gunicorn workers.
+        
+        Returns:
+            Thread pool bounded to `OPENAI_MAX_CONCURRENCY` workers.
+        """
+        with self._executor_lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="openai"
+                )
+                self._executor_pid = os.getpid()
+            
+            return self._executor
+    
+    def submit_player_analyses(self, players: Sequence[Tuple[List[float], int, int]],
+                               feature_names: List[str], use_cache: bool = True) -> List[Future]:
+        """
+        Dispatches several player analyses concurrently.
+        
+        At most `OPENAI_MAX_CONCURRENCY` requests run at the same time in this
+        process; the rest wait in the pool's queue. With `OPENAI_BATCH_ANALYSIS`
+        enabled, players are packed into batched requests (see
+        `analyze_player_batch`) instead of one request each.
+        
+        Args:
+            players: Tuples of (features, position category, physical category).
+            feature_names: Names of the features.
+            use_cache: If False, bypasses the persistent analysis cache.
+        
+        Returns:
+            One future per player, in the same order, resolving to the result of
+            `analyze_player_profile`.
+        """
+        executor = self._get_executor()
+        
+        if not Config.OPENAI_BATCH_ANALYSIS or len(players) < 2:
+            return [
+                executor.submit(
+                    self.analyze_player_profile,
+                    features, position_category, physical_category, feature_names, use_cache
+                )
+                for features, position_category, physical_category in players
+            ]
+        
+        futures = [Future() for _ in players]
+        
+        for start, end in self._batch_bounds(players, feature_names):
+            executor.submit(
+                self._resolve_player_batch,
+                players[start:end], feature_names, use_cache, futures[start:end]
+            )
+        
+        return futures
+    
+    def _batch_bounds(self, players: Sequence[Tuple[List[float], int, int]],
+                      feature_names: List[str]) -> List[Tuple[int, int]]:
+        """
+        Splits the players into batches sized from the estimated prompt tokens.
+        
+        A batch holds as many players as fit in `OPENAI_BATCH_MAX_PROMPT_TOKENS`
+        (system prompt plus the prompt of each player) and whose expected
+        answers, `OPENAI_BATCH_TOKENS_PER_PLAYER` each, fit in
+        `OPENAI_BATCH_MAX_COMPLETION_TOKENS`, up to `OPENAI_BATCH_MAX_PLAYERS`.
+        
+        Args:
+            players: Tuples of (features, position category, physical category).
+            feature_names: Names of the features.
+        
+        Returns:
+            (start, end) slice bounds of every batch, in order.
+        """
+        prompt_budget = Config.OPENAI_BATCH_MAX_PROMPT_TOKENS - estimate_tokens(BATCH_PLAYER_ANALYSIS_SYSTEM_PROMPT)
+        max_players = max(1, min(
+            Config.OPENAI_BATCH_MAX_PLAYERS,
+            Config.OPENAI_BATCH_MAX_COMPLETION_TOKENS // max(1, Config.OPENAI_BATCH_TOKENS_PER_PLAYER)
+        ))
+        bounds = []
+        start = 0
+        tokens = 0
+        
+        for i, (features, position_category, physical_category) in enumerate(players):
+            _, prompt = self._player_analysis_prompt(features, position_category, physical_category, feature_names)
+            player_tokens = estimate_tokens(self._build_batch_analysis_prompt([prompt]))
+            
+            if i > start and (i - start >= max_players or tokens + player_tokens > prompt_budget):
+                bounds.append((start, i))
+                start, tokens = i, 0
+            
+            tokens += player_tokens
+        
+        bounds.append((start, len(players)))
+        return bounds
+    
+    def _resolve_player_batch(self, players: Sequence[Tuple[List[float], int, int]],
+                              feature_names: List[str], use_cache: bool, futures: List[Future]) -> None:
+        """
+        Runs a batched analysis and resolves the futures of its players.
+        
+        Args:
+            players: Tuples of (features, position category, physical category).
+            feature_names: Names of the features.
+            use_cache: If False, bypasses the persistent analysis cache.
+            futures: One pending future per player.
+        """
+        try:
+            results = self.analyze_player_batch(players, feature_names, use_cache)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        
+        for future, result in zip(futures, results):
+            future.set_result(result)
+    
+    def analyze_player_batch(self, players: Sequence[Tuple[List[float], int, int]],
+                             feature_names: List[str], use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        Analyzes several players with a single request to GPT.
+        
+        The system instructions are sent once and the model answers each
+        player between numbered delimiters, which are split back per player.
+        Each player's answer is cached under the same key as an individual
+        analysis, so both modes share the cache; players already cached are
+        not sent. Only answers with their closing delimiter are kept, so
+        players missing from the batched answer or cut off in it (e.g. if it
+        was truncated at the token limit) are analyzed individually.
+        
+        Args:
+            players: Tuples of (features, position category, physical category).
+            feature_names: Names of the features.
+            use_cache: If False, bypasses the persistent analysis cache.
+        
+        Returns:
+            One dictionary per player, in order, as returned by `analyze_player_profile`.
+        """
+        if not Config.OPENAI_API_KEY:
+            return [self.analyze_player_profile(*player, feature_names, use_cache) for player in players]
+        
+        prepared = [
+            self._player_analysis_prompt(features, position_category, physical_category, feature_names)
+            for features, position_category, physical_category in players
+        ]
+        contents = [None] * len(players)
+        cache_keys = [self._cache_key(PLAYER_ANALYSIS_SYSTEM_PROMPT, prompt, use_cache) for _, prompt in prepared]
+        
+        for i, cache_key in enumerate(cache_keys):
+            if cache_key is not None:
+                contents[i] = self.cache.get(cache_key)
+        
+        missing = [i for i, content in enumerate(contents) if content is None]
+        
+        if len(missing) > 1:
+            try:
+                batch_content = self._chat_completion(
+                    BATCH_PLAYER_ANALYSIS_SYSTEM_PROMPT,
+                    self._build_batch_analysis_prompt([prepared[i][1] for i in missing]),
+                    use_cache=False,
+                    max_tokens=min(
+                        Config.OPENAI_BATCH_MAX_COMPLETION_TOKENS,
+                        Config.OPENAI_BATCH_TOKENS_PER_PLAYER * len(missing)
+                    )
+                )
+            except Exception:
+                batch_content = ""
+            
+            for i, block in zip(missing, split_player_blocks(batch_content, len(missing))):
+                if block is not None:
+                    contents[i] = block
+                    
+                    if cache_keys[i] is not None:
+                        self.cache.set(cache_keys[i], block)
+        
+        results = []
+        
+        for (features, position_category, physical_category), (player_data, _), content in zip(players, prepared, contents):
+            if content is None:
+                results.append(self.analyze_player_profile(
+                    features, position_category, physical_category, feature_names, use_cache
+                ))
+            else:
+                results.append(self._player_analysis_result(content, position_category, physical_category, player_data))
+        
+        return results
+    
+    def _completion_key(self, system_prompt: str, prompt: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Builds the key identifying a completion request.
+        
+        Args:
+            system_prompt: System instructions for the model.
+            prompt: User prompt.
+            max_tokens: Completion token limit; defaults to `OPENAI_MAX_TOKENS`.
+        
+        Returns:
+            Content-addressed key of everything that shapes the completion.
+        """
+        return SQLiteAnalysisCache.make_key(
+            model=Config.OPENAI_MODEL,
+            temperature=Config.OPENAI_TEMPERATURE,
+            max_tokens=max_tokens or Config.OPENAI_MAX_TOKENS,
+            system_prompt=system_prompt,
+            prompt=prompt
+        )
+    
+    def _cache_key(self, system_prompt: str, prompt: str, use_cache: bool,
+                   max_tokens: Optional[int] = None) -> Optional[str]:
+        """
+        Builds the cache key of a completion request.
+        
+        Args:
+            system_prompt: System instructions for the model.
+            prompt: User prompt.
+            use_cache: If False, the cache is not used.
+            max_tokens: Completion token limit; defaults to `OPENAI_MAX_TOKENS`.
+        
+        Returns:
+            The key, or None if the cache is disabled for this request.
+        """
+        if self.cache is None or not use_cache:
+            return None
+        
+        return self._completion_key(system_prompt, prompt, max_tokens)
+    
+    @staticmethod
+    def _is_complete(finish_reason: Optional[str]) -> bool:
+        """
+        Tells whether a completion can be cached.
+        
+        Only completions the model ended itself are complete; one cut off at
+        the token limit (`length`) or by the content filter is returned to the
+        caller but never cached, so it isn't served again.
+        
+        Args:
+            finish_reason: `finish_reason` of the completion's choice.
+        
+        Returns:
+            True if the completion finished with `stop`.
+        """
+        return finish_reason == "stop"
+    
+    def _chat_completion(self, system_prompt: str, prompt: str, use_cache: bool = True,
+                         max_tokens: Optional[int] = None) -> str:
+        """
+        Requests a chat completion, serving it from the cache when possible.
+        
+        Identical requests already in flight in this process are not sent
+        again: callers wait for the first one's completion instead (see
+        `OPENAI_SINGLE_FLIGHT`).
+        
+        Args:
+            system_prompt: System instructions for the model.
+            prompt: User prompt.
+            use_cache: If False, the cache is neither read nor written.
+            max_tokens: Completion token limit; defaults to `OPENAI_MAX_TOKENS`.
+        
+        Returns:
+            The completion text.
+        
+        Raises:
+            CircuitOpenError: If the circuit breaker rejects the request.
+        """
+        cache_key = self._cache_key(system_prompt, prompt, use_cache, max_tokens)
+        
+        if cache_key is not None:
+            cached_content = self.cache.get(cache_key)
+            
+            if cached_content is not None:
+                return cached_content
+        
+        def request():
+            return self._request_completion(system_prompt, prompt, cache_key, max_tokens)
+        
+        if self.single_flight is None:
+            return request()
+        
+        return self.single_flight.do(cache_key or self._completion_key(system_prompt, prompt, max_tokens), request)
+    
+    def _request_completion(self, system_prompt: str, prompt: str, cache_key: Optional[str],
+                            max_tokens: Optional[int] = None) -> str:
+        """
+        Sends a chat completion request and caches its result.
+        
+        Cached requests hold a lock file named after their key while they run,
+        so identical requests from other gunicorn workers wait for it and are
+        then served from the shared cache. Only the call to the API goes
+        through the circuit breaker, so neither the wait nor a cache hit
+        counts as its outcome.
+        
+        Args:
+            system_prompt: System instructions for the model.
+            prompt: User prompt.
+            cache_key: Cache key, or None if the cache is not used.
+            max_tokens: Completion token limit; defaults to `OPENAI_MAX_TOKENS`.
+        
+        Returns:
+            The completion text.
+        
+        Raises:
+            CircuitOpenError: If the circuit breaker rejects the request.
+        """
+        lock_path = None
+        
+        if cache_key is not None and self.single_flight is not None and Config.OPENAI_SINGLE_FLIGHT_LOCK_DIR:
+            lock_path = os.path.join(Config.OPENAI_SINGLE_FLIGHT_LOCK_DIR, f"{cache_key}.lock")
+        
+        with file_lock(lock_path, Config.OPENAI_SINGLE_FLIGHT_TIMEOUT) as locked:
+            if locked:
+                cached_content = self.cache.get(cache_key)
+                
+                if cached_content is not None:
+                    return cached_content
+            
+            def create():
+                return openai.ChatCompletion.create(
+                    model=Config.OPENAI_MODEL,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=Config.OPENAI_TEMPERATURE,
+                    max_tokens=max_tokens or Config.OPENAI_MAX_TOKENS,
+                    request_timeout=self.request_timeout
+                )
+            
+            response = create() if self.circuit_breaker is None else self.circuit_breaker.call(create)
+            choice = response.choices[0]
+            content = choice.message.content
+            
+            if cache_key is not None and content and self._is_complete(choice.get("finish_reason")):
+                self.cache.set(cache_key, content)
+            
+            return content
+    
+    async def _get_aiohttp_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the HTTP session used by the async client in this event loop.
+        
+        Every coroutine of the worker shares its keep-alive connection pool,
+        of up to `OPENAI_ASYNC_POOL_SIZE` connections.
+        
+        Returns:
+            The aiohttp session.
+        """
+        loop = asyncio.get_running_loop()
+        session = self._aiohttp_session
+        
+        if session is None or session.closed or self._aiohttp_loop is not loop:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=max(1, Config.OPENAI_ASYNC_POOL_SIZE), keepalive_timeout=60)
+            )
+            self._aiohttp_session, self._aiohttp_loop = session, loop
+        
+        return session
+    
+    async def aclose(self) -> None:
+        """Closes the HTTP session of the async client."""
+        if self._aiohttp_session is not None and not self._aiohttp_session.closed:
+            await self._aiohttp_session.close()
+        
+        self._aiohttp_session = None
+        self._aiohttp_loop = None
+    
+    async def _achat_completion(self, system_prompt: str, prompt: str, use_cache: bool = True,
+                                max_tokens: Optional[int] = None) -> str:
+        """
+        Async version of `_chat_completion`.
+        
+        Identical requests in flight in the event loop are coalesced, and
+        cache lookups run in a thread so they never block the loop.
+        
+        Args:
+            system_prompt: System instructions for the model.
+            prompt: User prompt.
+            use_cache: If False, the cache is neither read nor written.
+            max_tokens: Completion token limit; defaults to `OPENAI_MAX_TOKENS`.
+        
+        Returns:
+            The completion text.
+        
+        Raises:
+            CircuitOpenError: If the circuit breaker rejects the request.
+        """
+        cache_key = self._cache_key(system_prompt, prompt, use_cache, max_tokens)
+        
+        if cache_key is not None:
+            cached_content = await asyncio.to_thread(self.cache.get, cache_key)
+            
+            if cached_content is not None:
+                return cached_content
+        
+        if self.single_flight is None:
+            return await self._arequest_completion(system_prompt, prompt, cache_key, max_tokens)
+        
+        flight_key = cache_key or self._completion_key(system_prompt, prompt, max_tokens)
+        flight = self._async_flights.get(flight_key)
+        
+        if flight is None or flight.get_loop() is not asyncio.get_running_loop():
+            flight = asyncio.ensure_future(self._arequest_completion(system_prompt, prompt, cache_key, max_tokens))
+            self._async_flights[flight_key] = flight
+            flight.add_done_callback(lambda _: self._async_flights.pop(flight_key, None))
+        
+        return await asyncio.shield(flight)
+    
+    async def _arequest_completion(self, system_prompt: str, prompt: str, cache_key: Optional[str],
+                                   max_tokens: Optional[int] = None) -> str:
+        """
+        Sends a chat completion request with the async client and caches its result.
+        
+        Goes through the circuit breaker, and retries connection errors,
+        timeouts and 429/5xx responses like the sync client, with the same
+        jittered exponential backoff.
+        
+        Args:
+            system_prompt: System instructions for the model.
+            prompt: User prompt.
+            cache_key: Cache key, or None if the cache is not used.
+            max_tokens: Completion token limit; defaults to `OPENAI_MAX_TOKENS`.
+        
+        Returns:
+            The completion text.
+        
+        Raises:
+            CircuitOpenError: If the circuit breaker rejects the request.
+        """
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+            raise CircuitOpenError("Servicio 'openai' no disponible temporalmente")
+        
+        start = time.monotonic()
+        openai.aiosession.set(await self._get_aiohttp_session())
+        
+        try:
+            for attempt in range(max(0, Config.OPENAI_MAX_RETRIES) + 1):
+                try:
+                    response = await openai.ChatCompletion.acreate(
+                        model=Config.OPENAI_MODEL,
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=Config.OPENAI_TEMPERATURE,
+                        max_tokens=max_tokens or Config.OPENAI_MAX_TOKENS,
+                        request_timeout=self.request_timeout
+                    )
+                    break
+                except (openai.error.APIError, openai.error.APIConnectionError, openai.error.Timeout) as e:
+                    status = getattr(e, "http_status", None)
+                    
+                    if attempt >= Config.OPENAI_MAX_RETRIES or (status is not None and status != 429 and status < 500):
+                        raise
+                    
+                    await asyncio.sleep(
+                        Config.OPENAI_RETRY_BACKOFF * (2 ** attempt) + random.uniform(0, Config.OPENAI_RETRY_JITTER)
+                    )
+        except BaseException as e:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_error(e, time.monotonic() - start)
+            raise
+        
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(True, time.monotonic() - start)
+        
+        choice = response.choices[0]
+        content = choice.message.content
+        
+        if cache_key is not None and content and self._is_complete(choice.get("finish_reason")):
+            await asyncio.to_thread(self.cache.set, cache_key, content)
+        
+        return content
+    
+    def _chat_completion_stream(self, system_prompt: str, prompt: str, use_cache: bool = True) -> Iterator[str]:
+        """
+        Requests a chat completion with streaming enabled.
+        
+        A cached completion is yielded as a single chunk. Otherwise the text is
+        yielded as the tokens arrive and the full completion is cached once the
+        stream ends, if it is complete (see `_is_complete`).
+        
+        Args:
+            system_prompt: System instructions for the model.
+            prompt: User prompt.
+            use_cache: If False, the cache is neither read nor written.
+        
+        Yields:
+            Pieces of the completion text, in order.
+        
+        Raises:
+            CircuitOpenError: If the circuit breaker rejects the request.
+        """
+        cache_key = self._cache_key(system_prompt, prompt, use_cache)
+        
+        if cache_key is not None:
+            cached_content = self.cache.get(cache_key)
+            
+            if cached_content is not None:
+                yield cached_content
+                return
+        
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+            raise CircuitOpenError("Servicio 'openai' no disponible temporalmente")
+        
+        start = time.monotonic()
+        pieces = []
+        finish_reason = None
+        
+        try:
+            response = openai.ChatCompletion.create(
+                model=Config.OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=Config.OPENAI_TEMPERATURE,
+                max_tokens=Config.OPENAI_MAX_TOKENS,
+                stream=True,
+                request_timeout=self.request_timeout
+            )
+            
+            for chunk in response:
+                piece = chunk["choices"][0]["delta"].get("content") if chunk["choices"] else None
+                
+                if chunk["choices"] and chunk["choices"][0].get("finish_reason"):
+                    finish_reason = chunk["choices"][0]["finish_reason"]
+                
+                if piece:
+                    pieces.append(piece)
+                    yield piece
+        except BaseException as e:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_error(e, time.monotonic() - start)
+            raise
+        
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(True, time.monotonic() - start)
+        
+        if cache_key is not None and pieces and self._is_complete(finish_reason):
+            self.cache.set(cache_key, "".join(pieces))
+    
+    @staticmethod
+    def _parse_analysis(content: str, sections: Sequence[AnalysisSection]) -> Dict[str, Any]:
+        """
+        Splits a completion into the sections requested in the system prompt.
+        
+        Args:
+            content: Completion text.
+            sections: Header table of the analysis type.
+        
+        Returns:
+            Dictionary with one entry per section. If no section is recognized,
+            the whole text is returned as the general analysis.
+        """
+        analysis = SectionParser.parse(content, sections)
+        
+        if content and not any(analysis.values()):
+            analysis[sections[0].key] = content.strip()
+        
+        return analysis
+    
+    def _player_analysis_result(self, content: str, position_category: int, physical_category: int,
+                                player_data: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Builds the result of a player analysis from the completion text.
+        
+        Args:
+            content: Completion text.
+            position_category: Predicted position cluster/category.
+            physical_category: Predicted physical condition cluster/category.
+            player_data: Player data by feature name.
+        
+        Returns:
+            Dictionary with the detailed profile analysis.
+        """
+        return {
+            "success": True,
+            "positionCategory": position_category,
+            "physicalCategory": physical_category,
+            **self._parse_analysis(content, PLAYER_ANALYSIS_SECTIONS),
+            "rawAnalysis": content,
+            "rawFeatures": player_data
+        }
+    
+    def degraded_player_analysis(self, position_category: int, physical_category: int,
+                                 player_data: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Builds a player analysis without OpenAI, from the cluster characteristics.
+        
+        Used while the circuit breaker is open.
+        
+        Args:
+            position_category: Predicted position cluster/category.
+            physical_category: Predicted physical condition cluster/category.
+            player_data: Player data by feature name.
+        
+        Returns:
+            Dictionary with the same keys as `analyze_player_profile`, plus
+            `degraded` set to True.
+        """
+        physical_info = PHYSICAL_CONDITION_CHARACTERISTICS.get(physical_category, {})
+        specific_recommendations = POSITION_PHYSICAL_RECOMMENDATIONS.get(position_category, {}).get(physical_category, [])
+        
+        return {
+            "success": True,
+            "degraded": True,
+            "positionCategory": position_category,
+            "physicalCategory": physical_category,
+            "generalAnalysis": physical_info.get("description", ""),
+            "strengths": list(physical_info.get("strengths", [])),
+            "weaknesses": list(physical_info.get("development_areas", [])),
+            "trainingRecommendations": [*specific_recommendations, *physical_info.get("training_recommendations", [])],
+            "performanceProfile": "",
+            "rawAnalysis": "",
+            "rawFeatures": player_data
+        }
     
-    def analyze_player_profile(self, features: List[float], position_category: int, 
-                                physical_category: int, feature_names: List[str]) -> Dict[str, Any]:
+    def degraded_team_analysis(self, team_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Analyzes the player's profile using GPT to provide insights.
+        Builds a team analysis without OpenAI, from the players' profiles.
+        
+        Used while the circuit breaker is open. Strengths and weaknesses are the
+        ones most repeated among the players.
+        
+        Args:
+            team_data: Team data as dictionary.
+        
+        Returns:
+            Dictionary with the same keys as `analyze_team`, plus `degraded` set to True.
+        """
+        profiles = team_data.get("playerProfiles", [])
+        strengths = Counter(item for profile in profiles for item in profile.get("strengths", []))
+        weaknesses = Counter(item for profile in profiles for item in profile.get("weaknesses", []))
+        physical_conditions = Counter(team_data.get("physicalConditions", []))
+        
+        composition = "; ".join(f"{name}: {count}" for name, count in physical_conditions.most_common())
+        
+        return {
+            "success": True,
+            "degraded": True,
+            "generalAnalysis": (
+                f"{team_data.get('teamName', 'Equipo sin nombre')}: {team_data.get('playerCount', len(profiles))} jugadores. "
+                f"Condiciones físicas: {composition}."
+            ),
+            "teamStrengths": [item for item, _ in strengths.most_common(3)],
+            "teamWeaknesses": [item for item, _ in weaknesses.most_common(3)],
+            "tacticalRecommendations": [],
+            "trainingRecommendations": [],
+            "lineupAdjustments": "",
+            "rawAnalysis": ""
+        }
+    
+    def _player_analysis_prompt(self, features: List[float], position_category: int,
+                                physical_category: int, feature_names: List[str]) -> Tuple[Dict[str, float], str]:
+        """
+        Builds the prompt of a player analysis.
         
         Args:
             features: List of player's characteristics as float values.
@@ -23,133 +876,177 @@ class OpenAIService:
             feature_names: Names of the features.
         
         Returns:
-            Dictionary with the detailed profile analysis.
+            Tuple with the player data by feature name and the prompt.
+        """
+        player_data = {name: value for name, value in zip(feature_names, features)}
+        
+        physical_info = PHYSICAL_CONDITION_CHARACTERISTICS.get(physical_category, {})
+        specific_recommendations = []
+        
+        if position_category in POSITION_PHYSICAL_RECOMMENDATIONS and physical_category in POSITION_PHYSICAL_RECOMMENDATIONS[position_category]:
+            specific_recommendations = POSITION_PHYSICAL_RECOMMENDATIONS[position_category][physical_category]
+        
+        prompt = self._build_analysis_prompt(player_data, position_category, physical_category, physical_info, specific_recommendations)
+        
+        return player_data, prompt
+    
+    def stream_player_analysis(self, features: List[float], position_category: int,
+                               physical_category: int, feature_names: List[str],
+                               use_cache: bool = True) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Analyzes the player's profile streaming the completion from GPT.
+        
+        Sections are parsed while the tokens arrive, so each one is available
+        as soon as the model starts writing the next.
+        
+        Args:
+            features: List of player's characteristics as float values.
+            position_category: Predicted position cluster/category.
+            physical_category: Predicted physical condition cluster/category.
+            feature_names: Names of the features.
+            use_cache: If False, bypasses the persistent analysis cache.
+        
+        Yields:
+            ("section", {"section", "header", "value"}) for every completed
+            section, and finally ("analysis", result) with the same dictionary
+            returned by `analyze_player_profile`.
         """
         if not Config.OPENAI_API_KEY:
-            return {
+            yield "analysis", {
                 "error": "API key not configured",
                 "analysis": "No se pudo realizar el análisis detallado. Configure la clave de API de OpenAI."
             }
+            return
+        
+        headers = {section.key: section.header for section in PLAYER_ANALYSIS_SECTIONS}
+        player_data, prompt = self._player_analysis_prompt(features, position_category, physical_category, feature_names)
         
         try:
-            player_data = {name: value for name, value in zip(feature_names, features)}
+            parser = SectionParser(PLAYER_ANALYSIS_SECTIONS)
+            pieces = []
             
-            physical_info = PHYSICAL_CONDITION_CHARACTERISTICS.get(physical_category, {})
-            specific_recommendations = []
+            for piece in self._chat_completion_stream(PLAYER_ANALYSIS_SYSTEM_PROMPT, prompt, use_cache):
+                pieces.append(piece)
+                
+                for key, value in parser.feed(piece):
+                    yield "section", {"section": key, "header": headers[key], "value": value}
             
-            if position_category in POSITION_PHYSICAL_RECOMMENDATIONS and physical_category in POSITION_PHYSICAL_RECOMMENDATIONS[position_category]:
-                specific_recommendations = POSITION_PHYSICAL_RECOMMENDATIONS[position_category][physical_category]
+            for key, value in parser.close():
+                yield "section", {"section": key, "header": headers[key], "value": value}
             
-            prompt = self._build_analysis_prompt(player_data, position_category, physical_category, physical_info, specific_recommendations)
+        except CircuitOpenError:
+            analysis = self.degraded_player_analysis(position_category, physical_category, player_data)
             
-            response = openai.ChatCompletion.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system", "content": (
-                            """Eres un asistente especializado en análisis deportivo para 
-                            fútbol sala. Tu trabajo es analizar datos antropométricos y 
-                            físicos de jugadores para proporcionar recomendaciones precisas 
-                            y útiles al cuerpo técnico.
-                            
-                            IMPORTANTE: Debes responder estrictamente siguiendo esta estructura:
-                            
-                            ANÁLISIS GENERAL:
-                            [Escribe aquí tu análisis general]
-                            
-                            FORTALEZAS:
-                            - [Fortaleza 1]
-                            - [Fortaleza 2]
-                            - [Fortaleza 3]
-                            
-                            ÁREAS DE MEJORA:
-                            - [Área de mejora 1]
-                            - [Área de mejora 2]
-                            - [Área de mejora 3]
-                            
-                            RECOMENDACIONES DE ENTRENAMIENTO:
-                            - [Recomendación 1]
-                            - [Recomendación 2]
-                            - [Recomendación 3]
-                            
-                            PERFIL DE RENDIMIENTO:
-                            [Escribe aquí el perfil de rendimiento]
-                            
-                            Es crucial que mantengas EXACTAMENTE este formato con los mismos encabezados
-                            y estructura para que el sistema pueda procesar correctamente tu respuesta.
-                            Usa siempre guiones para los elementos de las listas.
-                            
-                            Sé conciso pero completo. Cada sección debe ser precisa y directa para asegurar
-                            que la respuesta completa se ajuste dentro del límite de tokens disponible."""
-                        )
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=1500
-            )
+            for section in PLAYER_ANALYSIS_SECTIONS:
+                yield "section", {"section": section.key, "header": section.header, "value": analysis[section.key]}
             
-            content = response.choices[0].message.content
+            yield "analysis", analysis
+            return
             
-            import re
+        except Exception as e:
+            import traceback
+            yield "analysis", {
+                "error": str(e),
+                "traceback": traceback.format_exc(),
+                "analysis": "No se pudo completar el análisis. Error en la integración con OpenAI."
+            }
+            return
+        
+        try:
+            content = "".join(pieces)
+            analysis = parser.result()
             
-            general_analysis = ""
-            strengths = []
-            weaknesses = []
-            training_recommendations = []
-            performance_profile = ""
+            if content and not any(analysis.values()):
+                analysis[PLAYER_ANALYSIS_SECTIONS[0].key] = content.strip()
             
-            general_match = re.search(r'ANÁLISIS GENERAL:\s*(.*?)(?=\s*\n\s*FORTALEZAS:|$)', content, re.DOTALL)
-            if general_match:
-                general_analysis = general_match.group(1).strip()
+            yield "analysis", {
+                "success": True,
+                "positionCategory": position_category,
+                "physicalCategory": physical_category,
+                **analysis,
+                "rawAnalysis": content,
+                "rawFeatures": player_data
+            }
             
-            strengths_section = re.search(r'FORTALEZAS:(?:\s*\n)((?:(?:-\s*.*?\n)|.)*?)(?=\s*\n\s*ÁREAS DE MEJORA:|$)', content, re.DOTALL)
-            if strengths_section:
-                strength_items = re.findall(r'-\s*(.*?)(?:\n|$)', strengths_section.group(1).strip(), re.DOTALL)
-                strengths = [item.strip() for item in strength_items if item.strip()]
+        except Exception as e:
+            import traceback
+            yield "analysis", {
+                "error": str(e),
+                "traceback": traceback.format_exc(),
+                "analysis": "No se pudo completar el análisis. Error en la integración con OpenAI."
+            }
+    
+    def analyze_player_profile(self, features: List[float], position_category: int, 
+                                physical_category: int, feature_names: List[str],
+                                use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Analyzes the player's profile using GPT to provide insights.
+        
+        Args:
+            features: List of player's characteristics as float values.
+            position_category: Predicted position cluster/category.
+            physical_category: Predicted physical condition cluster/category.
+            feature_names: Names of the features.
+            use_cache: If False, bypasses the persistent analysis cache.
+        
+        Returns:
+            Dictionary with the detailed profile analysis.
+        """
+        if not Config.OPENAI_API_KEY:
+            return {
+                "error": "API key not configured",
+                "analysis": "No se pudo realizar el análisis detallado. Configure la clave de API de OpenAI."
+            }
+        
+        try:
+            player_data, prompt = self._player_analysis_prompt(features, position_category, physical_category, feature_names)
             
-            weaknesses_section = re.search(r'ÁREAS DE MEJORA:(?:\s*\n)((?:(?:-\s*.*?\n)|.)*?)(?=\s*\n\s*RECOMENDACIONES DE ENTRENAMIENTO:|$)', content, re.DOTALL)
-            if weaknesses_section:
-                weakness_items = re.findall(r'-\s*(.*?)(?:\n|$)', weaknesses_section.group(1).strip(), re.DOTALL)
-                weaknesses = [item.strip() for item in weakness_items if item.strip()]
+            content = self._chat_completion(PLAYER_ANALYSIS_SYSTEM_PROMPT, prompt, use_cache)
             
-            training_section = re.search(r'RECOMENDACIONES DE ENTRENAMIENTO:(?:\s*\n)((?:(?:-\s*.*?\n)|.)*?)(?=\s*\n\s*PERFIL DE RENDIMIENTO:|$)', content, re.DOTALL)
-            if training_section:
-                training_items = re.findall(r'-\s*(.*?)(?:\n|$)', training_section.group(1).strip(), re.DOTALL)
-                training_recommendations = [item.strip() for item in training_items if item.strip()]
+            return self._player_analysis_result(content, position_category, physical_category, player_data)
             
-            performance_section = re.search(r'PERFIL DE RENDIMIENTO:\s*(.*?)', content, re.DOTALL)
-            if performance_section:
-                performance_profile = re.findall(r'-\s*(.*?)(?:\n|$)', performance_section.group(1).strip(), re.DOTALL)
-                performance_profile = [item.strip() for item in performance_profile if item.strip()]
-                performance_profile = "\n".join(performance_profile)
+        except CircuitOpenError:
+            return self.degraded_player_analysis(position_category, physical_category, player_data)
             
-            if not general_analysis:
-                general_match_fallback = re.search(r'^(.*?)(?=\s*\n\s*(?:FORTALEZAS:|PUNTOS FUERTES:|$))', content, re.DOTALL)
-                if general_match_fallback:
-                    general_analysis = general_match_fallback.group(1).strip()
+        except Exception as e:
+            import traceback
+            return {
+                "error": str(e),
+                "traceback": traceback.format_exc(),
+                "analysis": "No se pudo completar el análisis. Error en la integración con OpenAI."
+            }
+    
+    async def analyze_player_profile_async(self, features: List[float], position_category: int,
+                                           physical_category: int, feature_names: List[str],
+                                           use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Async version of `analyze_player_profile`, for the ASGI entry point.
+        
+        Args:
+            features: List of player's characteristics as float values.
+            position_category: Predicted position cluster/category.
+            physical_category: Predicted physical condition cluster/category.
+            feature_names: Names of the features.
+            use_cache: If False, bypasses the persistent analysis cache.
+        
+        Returns:
+            Dictionary with the detailed profile analysis.
+        """
+        if not Config.OPENAI_API_KEY:
+            return {
+                "error": "API key not configured",
+                "analysis": "No se pudo realizar el análisis detallado. Configure la clave de API de OpenAI."
+            }
+        
+        try:
+            player_data, prompt = self._player_analysis_prompt(features, position_category, physical_category, feature_names)
             
-            if not strengths:
-                strengths_fallback = re.search(r'(?:FORTALEZAS:|fortalezas:|Fortalezas:).*?(?:\n)(.*?)(?=\n\s*(?:ÁREAS|Áreas|áreas|DEBILIDADES|Debilidades|debilidades|$))', content, re.DOTALL)
-                if strengths_fallback:
-                    fallback_items = re.findall(r'(?:[-•*]\s*|\d+[.)]\s*|\n\s*)([\w].*?)(?=\n\s*(?:[-•*]|\d+[.)]|\n|$))', strengths_fallback.group(1), re.DOTALL)
-                    strengths = [item.strip() for item in fallback_items if item.strip()]
+            content = await self._achat_completion(PLAYER_ANALYSIS_SYSTEM_PROMPT, prompt, use_cache)
             
-            if content and not general_analysis and not strengths and not weaknesses and not training_recommendations and not performance_profile:
-                general_analysis = content.strip()
+            return self._player_analysis_result(content, position_category, physical_category, player_data)
             
-            return {
-                "success": True,
-                "positionCategory": position_category,
-                "physicalCategory": physical_category,
-                "generalAnalysis": general_analysis,
-                "strengths": strengths,
-                "weaknesses": weaknesses,
-                "trainingRecommendations": training_recommendations,
-                "performanceProfile": performance_profile,
-                "rawAnalysis": content,
-                "rawFeatures": player_data
-            }
+        except CircuitOpenError:
+            return self.degraded_player_analysis(position_category, physical_category, player_data)
             
         except Exception as e:
             import traceback
@@ -159,6 +1056,37 @@ class OpenAIService:
                 "analysis": "No se pudo completar el análisis. Error en la integración con OpenAI."
             }
     
+    async def analyze_player_batches_async(self, players: Sequence[Tuple[List[float], int, int]],
+                                           feature_names: List[str], use_cache: bool = True) -> List[Any]:
+        """
+        Async counterpart of `submit_player_analyses` with `OPENAI_BATCH_ANALYSIS` enabled.
+        
+        The players are split into the same batches (see `_batch_bounds`),
+        and each batch runs `analyze_player_batch` in a thread of the default
+        executor, all of them concurrently, so both entry points send the same
+        prompts and share the same cache entries.
+        
+        Args:
+            players: Tuples of (features, position category, physical category).
+            feature_names: Names of the features.
+            use_cache: If False, bypasses the persistent analysis cache.
+        
+        Returns:
+            One entry per player, in order: the result of `analyze_player_profile`,
+            or the exception that failed its batch.
+        """
+        bounds = self._batch_bounds(players, feature_names)
+        batches = await asyncio.gather(*(
+            asyncio.to_thread(self.analyze_player_batch, players[start:end], feature_names, use_cache)
+            for start, end in bounds
+        ), return_exceptions=True)
+        results = []
+        
+        for (start, end), batch in zip(bounds, batches):
+            results.extend([batch] * (end - start) if isinstance(batch, BaseException) else batch)
+        
+        return results
+    
     def _build_analysis_prompt(self, player_data: Dict[str, float], position_category: int, 
                                 physical_category: int, physical_info: Dict[str, Any],
                                 specific_recommendations: List[str]) -> str:
@@ -216,12 +1144,40 @@ class OpenAIService:
         
         return prompt
 
-    def analyze_team(self, team_data: Dict[str, float]) -> Dict[str, Any]:
+    def _build_batch_analysis_prompt(self, prompts: List[str]) -> str:
+        """
+        Packs the prompts of several players into a single batched prompt.
+        
+        The indentation of each prompt is dropped, since it is repeated on
+        every line and only adds tokens.
+        
+        Args:
+            prompts: Prompts built by `_build_analysis_prompt`, one per player.
+        
+        Returns:
+            Prompt to send to OpenAI with `BATCH_PLAYER_ANALYSIS_SYSTEM_PROMPT`.
+        """
+        sections = [
+            "\n".join([
+                player_block_start(number),
+                *(line.strip() for line in prompt.strip().splitlines()),
+                player_block_end(number)
+            ])
+            for number, prompt in enumerate(prompts, start=1)
+        ]
+        
+        return (
+            f"Analiza por separado los siguientes {len(prompts)} jugadores. Responde a cada uno entre sus "
+            f"delimitadores, numerados del 1 al {len(prompts)} en el mismo orden.\n\n" + "\n\n".join(sections)
+        )
+
+    def analyze_team(self, team_data: Dict[str, float], use_cache: bool = True) -> Dict[str, Any]:
         """
         Analyzes the team profile using GPT to provide insights.
         
         Args:
             team_data: Team data as dictionary.
+            use_cache: If False, bypasses the persistent analysis cache.
         
         Returns:
             Dictionary with the detailed team analysis.
@@ -235,124 +1191,56 @@ class OpenAIService:
         try:
             prompt = self._build_team_analysis_prompt(team_data)
             
-            response = openai.ChatCompletion.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system", "content": (
-                            """Eres un asistente especializado en análisis deportivo y
-                            entrenador experto de fútbol sala. Tu trabajo es analizar 
-                            datos antropométricos y físicos de jugadores para proporcionar
-                            análisis tácticos y estratégicos precisos para equipos.
-                            
-                            IMPORTANTE: Debes responder estrictamente siguiendo esta estructura:
-                            
-                            ANÁLISIS GENERAL:
-                            [Escribe aquí tu análisis general]
-                            
-                            PUNTOS FUERTES:
-                            - [Punto fuerte 1]
-                            - [Punto fuerte 2]
-                            - [Punto fuerte 3]
-                            
-                            ÁREAS DE MEJORA:
-                            - [Área de mejora 1]
-                            - [Área de mejora 2]
-                            - [Área de mejora 3]
-                            
-                            RECOMENDACIONES TÁCTICAS:
-                            - [Recomendación 1]
-                            - [Recomendación 2]
-                            - [Recomendación 3]
-                            
-                            SUGERENCIAS DE ENTRENAMIENTOS:
-                            - [Sugerencia 1]
-                            - [Sugerencia 2]
-                            - [Sugerencia 3]
-                            
-                            AJUSTES EN LA ALINEACIÓN:
-                            [Escribe aquí los posibles ajustes]
-                            
-                            Es crucial que mantengas EXACTAMENTE este formato con los mismos encabezados
-                            y estructura para que el sistema pueda procesar correctamente tu respuesta.
-                            Usa siempre guiones para los elementos de las listas.
-                            
-                            Sé conciso pero completo. Cada sección debe ser precisa y directa para asegurar
-                            que la respuesta completa se ajuste dentro del límite de tokens disponible."""
-                        )
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=1500
-            )
+            content = self._chat_completion(TEAM_ANALYSIS_SYSTEM_PROMPT, prompt, use_cache)
             
-            content = response.choices[0].message.content
-            
-            import re
-            
-            general_analysis = ""
-            team_strengths = []
-            team_weaknesses = []
-            tactical_recommendations = []
-            training_suggestions = []
-            lineup_adjustments = ""
-            
-            general_match = re.search(r'ANÁLISIS GENERAL:\s*(.*?)(?=\s*\n\s*PUNTOS FUERTES:|$)', content, re.DOTALL)
-            if general_match:
-                general_analysis = general_match.group(1).strip()
-            
-            strengths_section = re.search(r'PUNTOS FUERTES:(?:\s*\n)((?:(?:-\s*.*?\n)|.)*?)(?=\s*\n\s*ÁREAS DE MEJORA:|$)', content, re.DOTALL)
-            if strengths_section:
-                strength_items = re.findall(r'-\s*(.*?)(?:\n|$)', strengths_section.group(1).strip(), re.DOTALL)
-                team_strengths = [item.strip() for item in strength_items if item.strip()]
-            
-            weaknesses_section = re.search(r'ÁREAS DE MEJORA:(?:\s*\n)((?:(?:-\s*.*?\n)|.)*?)(?=\s*\n\s*RECOMENDACIONES TÁCTICAS:|$)', content, re.DOTALL)
-            if weaknesses_section:
-                weakness_items = re.findall(r'-\s*(.*?)(?:\n|$)', weaknesses_section.group(1).strip(), re.DOTALL)
-                team_weaknesses = [item.strip() for item in weakness_items if item.strip()]
-            
-            tactical_section = re.search(r'RECOMENDACIONES TÁCTICAS:(?:\s*\n)((?:(?:-\s*.*?\n)|.)*?)(?=\s*\n\s*SUGERENCIAS DE ENTRENAMIENTOS:|$)', content, re.DOTALL)
-            if tactical_section:
-                tactical_items = re.findall(r'-\s*(.*?)(?:\n|$)', tactical_section.group(1).strip(), re.DOTALL)
-                tactical_recommendations = [item.strip() for item in tactical_items if item.strip()]
-            
-            training_section = re.search(r'SUGERENCIAS DE ENTRENAMIENTOS:(?:\s*\n)((?:(?:-\s*.*?\n)|.)*?)(?=\s*\n\s*AJUSTES EN LA ALINEACIÓN:|$)', content, re.DOTALL)
-            if training_section:
-                training_items = re.findall(r'-\s*(.*?)(?:\n|$)', training_section.group(1).strip(), re.DOTALL)
-                training_suggestions = [item.strip() for item in training_items if item.strip()]
-            
-            lineup_section = re.search(r'AJUSTES EN LA ALINEACIÓN:\s*(.*?)', content, re.DOTALL)
-            if lineup_section:
-                lineup_items = re.findall(r'-\s*(.*?)(?:\n|$)', lineup_section.group(1).strip(), re.DOTALL)
-                lineup_adjustments = [item.strip() for item in lineup_items if item.strip()]
-                lineup_adjustments = "\n".join(lineup_adjustments)
-            
-            if not general_analysis:
-                general_match_fallback = re.search(r'^(.*?)(?=\s*\n\s*(?:PUNTOS FUERTES:|$))', content, re.DOTALL)
-                if general_match_fallback:
-                    general_analysis = general_match_fallback.group(1).strip()
-            
-            if not team_strengths:
-                strengths_fallback = re.search(r'(?:PUNTOS FUERTES:|puntos fuertes:|Puntos Fuertes:|fortalezas:|Fortalezas:).*?(?:\n)(.*?)(?=\n\s*(?:ÁREAS|Áreas|áreas|DEBILIDADES|Debilidades|debilidades|$))', content, re.DOTALL)
-                if strengths_fallback:
-                    fallback_items = re.findall(r'(?:[-•*]\s*|\d+[.)]\s*|\n\s*)([\w].*?)(?=\n\s*(?:[-•*]|\d+[.)]|\n|$))', strengths_fallback.group(1), re.DOTALL)
-                    team_strengths = [item.strip() for item in fallback_items if item.strip()]
-            
-            if content and not general_analysis and not team_strengths and not team_weaknesses and not tactical_recommendations and not training_suggestions and not lineup_adjustments:
-                general_analysis = content.strip()
+            return {
+                "success": True,
+                **self._parse_analysis(content, TEAM_ANALYSIS_SECTIONS),
+                "rawAnalysis": content
+            }
+            
+        except CircuitOpenError:
+            return self.degraded_team_analysis(team_data)
+            
+        except Exception as e:
+            import traceback
+            return {
+                "error": str(e),
+                "traceback": traceback.format_exc(),
+                "analysis": "No se pudo completar el análisis. Error en la integración con OpenAI."
+            }
+
+    async def analyze_team_async(self, team_data: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Async version of `analyze_team`, for the ASGI entry point.
+        
+        Args:
+            team_data: Team data as dictionary.
+            use_cache: If False, bypasses the persistent analysis cache.
+        
+        Returns:
+            Dictionary with the detailed team analysis.
+        """
+        if not Config.OPENAI_API_KEY:
+            return {
+                "error": "API key not configured",
+                "analysis": "No se pudo realizar el análisis detallado. Configure la clave de API de OpenAI."
+            }
+        
+        try:
+            prompt = self._build_team_analysis_prompt(team_data)
+            
+            content = await self._achat_completion(TEAM_ANALYSIS_SYSTEM_PROMPT, prompt, use_cache)
             
             return {
                 "success": True,
-                "generalAnalysis": general_analysis,
-                "teamStrengths": team_strengths,
-                "teamWeaknesses": team_weaknesses,
-                "tacticalRecommendations": tactical_recommendations,
-                "trainingRecommendations": training_suggestions,
-                "lineupAdjustments": lineup_adjustments,
+                **self._parse_analysis(content, TEAM_ANALYSIS_SECTIONS),
                 "rawAnalysis": content
             }
             
+        except CircuitOpenError:
+            return self.degraded_team_analysis(team_data)
+            
         except Exception as e:
             import traceback
             return {
@@ -0,0 +1,126 @@
+import hashlib
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence
+
+
+class PredictionCache:
+    """Thread-safe, size-bounded LRU cache with expiration for model predictions."""
+
+    def __init__(self, max_size: int = 4096, ttl: float = 3600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_size: Maximum number of entries; the least recently used entry is
+                evicted when it is exceeded.
+            ttl: Seconds an entry stays valid. Zero or less disables expiration.
+            clock: Monotonic time source, in seconds.
+
+        Raises:
+            ValueError: If max_size is not positive.
+        """
+        if max_size <= 0:
+            raise ValueError("El tamaño de la caché debe ser mayor que 0")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(features: Sequence[float]) -> bytes:
+        """
+        Builds the cache key of a feature vector.
+
+        Values are normalized to float64 (so `10`, `10.0` and `"10"` parsed as
+        float share a key, and `-0.0` is folded into `0.0`) and hashed.
+
+        Args:
+            features: Feature vector, in `FEATURES` order.
+
+        Returns:
+            Digest identifying the vector.
+        """
+        values = np.asarray(features, dtype=np.float64) + 0.0
+        return hashlib.blake2b(values.tobytes(), digest_size=16).digest()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns a cached value and marks it as recently used.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached value, or None on a miss or expired entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Stores a value, evicting the least recently used entries if needed.
+
+        Args:
+            key: Cache key.
+            value: Value to store (must not be None).
+        """
+        expires_at = self._clock() + self.ttl if self.ttl > 0 else None
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Removes every entry, e.g. after the underlying model is replaced."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            Dictionary with size, capacity and hit/miss/eviction counters.
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxSize": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
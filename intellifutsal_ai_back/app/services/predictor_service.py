@@ -1,20 +1,24 @@
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from app.domain import (
     ModelInterface, FEATURES, POSITIONS_CATEGORIES, PHYSICAL_CONDITIONS_CATEGORIES,
     FEATURE_VALIDATIONS, PHYSICAL_CONDITION_CHARACTERISTICS, POSITION_PHYSICAL_RECOMMENDATIONS
 )
 from app.exceptions import PredictionError
+from .prediction_cache import PredictionCache
+from .shadow_scorer import ShadowScorer
 
 
 class PlayerProfilePredictor:
     """Service to predict player profiles."""
     
-    def __init__(self, model: ModelInterface):
+    def __init__(self, model: ModelInterface, cache: Optional[PredictionCache] = None):
         """
         Initializes the predictor with a model.
         
         Args:
             model: Implementation of ModelInterface for making predictions.
+            cache: Optional cache for predictions, keyed by the feature vector.
             
         Raises:
             ValueError: If the model is None.
@@ -23,6 +27,124 @@ class PlayerProfilePredictor:
             raise ValueError("El modelo no puede ser None")
         
         self.model = model
+        self.cache = cache
+        self.shadow: Optional[ShadowScorer] = None
+        self._model_version = 0
+    
+    def set_model(self, model: ModelInterface) -> None:
+        """
+        Replaces the model and invalidates the cached predictions of the old one.
+        
+        Args:
+            model: New implementation of ModelInterface.
+            
+        Raises:
+            ValueError: If the model is None.
+        """
+        if model is None:
+            raise ValueError("El modelo no puede ser None")
+        
+        self.model = model
+        self._model_version += 1
+        
+        if self.cache is not None:
+            self.cache.clear()
+    
+    def cached_predictions(self, matrix: Sequence[Sequence[float]]) -> Tuple[List[Any], List[Optional[int]]]:
+        """
+        Looks up the cached prediction of every row.
+        
+        Args:
+            matrix: N x len(FEATURES) matrix of features.
+            
+        Returns:
+            Tuple with the cache key of every row and its cached prediction
+            (None for misses). Without a cache, keys and predictions are all None.
+        """
+        if self.cache is None:
+            return [None] * len(matrix), [None] * len(matrix)
+        
+        keys = [(self._model_version, PredictionCache.make_key(row)) for row in matrix]
+        return keys, [self.cache.get(key) for key in keys]
+    
+    def store_predictions(self, keys: Sequence[Any], predictions: Sequence[int]) -> None:
+        """
+        Stores predictions computed for the given cache keys.
+        
+        Args:
+            keys: Keys returned by `cached_predictions`.
+            predictions: Prediction of each key.
+        """
+        if self.cache is None:
+            return
+        
+        for key, prediction in zip(keys, predictions):
+            self.cache.set(key, prediction)
+    
+    def observe(self, matrix: Sequence[Sequence[float]], predictions: Sequence[int],
+                latency: Optional[float] = None) -> None:
+        """
+        Reports served predictions to the shadow scorer, if there is one.
+        
+        Args:
+            matrix: N x len(FEATURES) matrix of features.
+            predictions: Prediction returned for each row.
+            latency: Seconds the model took, or None if every prediction was cached.
+        """
+        if self.shadow is not None:
+            self.shadow.observe(matrix, predictions, latency)
+    
+    def predict(self, features: List[float]) -> int:
+        """
+        Predicts the cluster of a feature vector, using the cache when possible.
+        
+        Args:
+            features: List of features as float values.
+            
+        Returns:
+            Predicted cluster id.
+        """
+        keys, cached = self.cached_predictions([features])
+        
+        if cached[0] is not None:
+            self.observe([features], cached)
+            return cached[0]
+        
+        start = time.perf_counter()
+        prediction = self.model.predict(features)
+        self.store_predictions(keys, [prediction])
+        self.observe([features], [prediction], time.perf_counter() - start)
+        
+        return prediction
+    
+    def predict_batch(self, matrix: Sequence[Sequence[float]]) -> List[int]:
+        """
+        Predicts the cluster of every row, only running the model on cache misses.
+        
+        Args:
+            matrix: N x len(FEATURES) matrix of features.
+            
+        Returns:
+            List with one predicted cluster id per row.
+        """
+        keys, predictions = self.cached_predictions(matrix)
+        missing = [i for i, prediction in enumerate(predictions) if prediction is None]
+        latency = None
+        
+        if missing:
+            start = time.perf_counter()
+            computed = self.model.predict_batch([matrix[i] for i in missing])
+            latency = time.perf_counter() - start
+            
+            for i, prediction in zip(missing, computed):
+                predictions[i] = prediction
+            
+            self.store_predictions([keys[i] for i in missing], computed)
+        
+        if len(matrix):
+            self.observe(matrix, predictions, latency)
+        
+        return predictions
     
     def parse_form_data(self, form_data: Dict[str, Any]) -> List[float]:
         """
@@ -83,7 +205,7 @@ class PlayerProfilePredictor:
             PredictionError: If there's an error during prediction.
         """
         try:
-            prediction = self.model.predict(features)
+            prediction = self.predict(features)
             
             if is_physical:
                 return PHYSICAL_CONDITIONS_CATEGORIES.get(prediction, f"Perfil físico desconocido ({prediction})")
@@ -108,7 +230,7 @@ class PlayerProfilePredictor:
             PredictionError: If there's an error during prediction.
         """
         try:
-            prediction = self.model.predict(features)
+            prediction = self.predict(features)
             
             if is_physical:
                 cluster_name = PHYSICAL_CONDITIONS_CATEGORIES.get(prediction, f"Perfil físico desconocido ({prediction})")
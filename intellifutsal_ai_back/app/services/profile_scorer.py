@@ -0,0 +1,251 @@
+import time
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence
+from app.domain import FEATURES
+from app.infrastructure import CompiledForestGroup
+from app.exceptions import PredictionError
+from .predictor_service import PlayerProfilePredictor
+
+
+class ProfileScorer:
+    """Scores position and physical condition clusters for the same players in one pass."""
+
+    def __init__(self, positions_predictor: PlayerProfilePredictor,
+                 physical_conditions_predictor: PlayerProfilePredictor):
+        """
+        Initializes the scorer with both predictors.
+
+        Args:
+            positions_predictor: Prediction service for position profiles.
+            physical_conditions_predictor: Prediction service for physical conditions.
+        """
+        self.positions_predictor = positions_predictor
+        self.physical_conditions_predictor = physical_conditions_predictor
+        self._group_state = (None, None)
+
+    @staticmethod
+    def _build_group(models) -> Optional[CompiledForestGroup]:
+        """
+        Builds a merged forest for both models when they can share one traversal.
+
+        That is the case when both models are compiled with their scalers fused,
+        so they consume the same raw input.
+
+        Args:
+            models: Position and physical condition models.
+
+        Returns:
+            The merged forest, or None if the models can't be merged.
+        """
+        compiled_models = [getattr(model, "compiled_model", None) for model in models]
+
+        if not all(compiled is not None and compiled.scaler_fused for compiled in compiled_models):
+            return None
+
+        try:
+            return CompiledForestGroup(compiled_models)
+        except ValueError:
+            return None
+
+    def _compiled_group(self) -> Optional[CompiledForestGroup]:
+        """
+        Returns the merged forest of the predictors' current models.
+
+        The group is rebuilt whenever the predictors' models are replaced
+        without going through `set_models`.
+
+        Returns:
+            The merged forest, or None if the models can't be merged.
+        """
+        models = (self.positions_predictor.model, self.physical_conditions_predictor.model)
+        group_models, group = self._group_state
+
+        if group_models is None or any(a is not b for a, b in zip(models, group_models)):
+            group = self._build_group(models)
+            self._group_state = (models, group)
+
+        return group
+
+    def warm_up(self) -> None:
+        """
+        Builds the merged forest now instead of on the first request.
+
+        Called before gunicorn forks its workers, so they all share the merged
+        arrays instead of building a private copy each.
+        """
+        self._compiled_group()
+
+    def set_models(self, positions_model: Optional[Any] = None,
+                   physical_conditions_model: Optional[Any] = None) -> None:
+        """
+        Replaces the predictors' models, building their merged forest first.
+
+        The merged forest is ready before the swap, so the first request
+        served by the new models doesn't pay for building it. Each predictor
+        invalidates its cached predictions.
+
+        Args:
+            positions_model: New position model, or None to keep the current one.
+            physical_conditions_model: New physical condition model, or None to
+                keep the current one.
+        """
+        models = (
+            positions_model or self.positions_predictor.model,
+            physical_conditions_model or self.physical_conditions_predictor.model
+        )
+        group = self._build_group(models)
+
+        if positions_model is not None:
+            self.positions_predictor.set_model(positions_model)
+        if physical_conditions_model is not None:
+            self.physical_conditions_predictor.set_model(physical_conditions_model)
+
+        self._group_state = (models, group)
+
+    def _observe(self, input_array: np.ndarray, position_ids: Sequence[int], physical_ids: Sequence[int],
+                 latency: Optional[float]) -> None:
+        """
+        Reports served predictions to the predictors' shadow scorers.
+
+        The latency covers both models, which are evaluated together.
+        """
+        self.positions_predictor.observe(input_array, position_ids, latency)
+        self.physical_conditions_predictor.observe(input_array, physical_ids, latency)
+
+    def _infer(self, input_array: np.ndarray, with_probabilities: bool) -> Dict[str, Any]:
+        """
+        Runs both models over a validated feature matrix.
+
+        Args:
+            input_array: N x len(FEATURES) float64 matrix, with N > 0.
+            with_probabilities: If True, also returns the class probabilities.
+
+        Returns:
+            Dictionary with the same keys as `score`.
+        """
+        group = self._compiled_group()
+
+        if group is not None:
+            position_proba, physical_proba = group.predict_proba(input_array)
+            position_ids = group.forests[0].classes.take(np.argmax(position_proba, axis=1))
+            physical_ids = group.forests[1].classes.take(np.argmax(physical_proba, axis=1))
+        elif with_probabilities:
+            position_proba = self.positions_predictor.model.predict_proba_batch(input_array)
+            physical_proba = self.physical_conditions_predictor.model.predict_proba_batch(input_array)
+            position_ids = self.positions_predictor.model.classes.take(np.argmax(position_proba, axis=1))
+            physical_ids = self.physical_conditions_predictor.model.classes.take(np.argmax(physical_proba, axis=1))
+        else:
+            position_ids = self.positions_predictor.model.predict_batch(input_array)
+            physical_ids = self.physical_conditions_predictor.model.predict_batch(input_array)
+
+        result = {
+            "positionIds": [int(cluster_id) for cluster_id in position_ids],
+            "physicalIds": [int(cluster_id) for cluster_id in physical_ids]
+        }
+
+        if with_probabilities:
+            result["positionProbabilities"] = np.asarray(position_proba).tolist()
+            result["physicalProbabilities"] = np.asarray(physical_proba).tolist()
+
+        return result
+
+    def score(self, matrix: Sequence[Sequence[float]], with_probabilities: bool = False,
+              use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Predicts both clusters for every row of a feature matrix.
+
+        The matrix is converted and validated once and shared by both models.
+        With compiled, scaler-fused models both forests are evaluated in a
+        single traversal; otherwise each adapter is called once on the shared
+        buffer. Rows whose clusters are both in the predictors' caches are not
+        evaluated at all (probabilities are not cached, so they always are
+        when requested).
+
+        Args:
+            matrix: N x len(FEATURES) matrix, one row of features per player.
+            with_probabilities: If True, also returns the class probabilities.
+            use_cache: If False, the caches are neither read nor filled, so
+                one-off bulk scoring doesn't evict the entries of live traffic.
+
+        Returns:
+            Dictionary with `positionIds` and `physicalIds` (one int per row) and,
+            if requested, `positionProbabilities` and `physicalProbabilities`
+            (one list of probabilities per row, in the order of the model's classes).
+
+        Raises:
+            PredictionError: If there's an error during prediction.
+        """
+        try:
+            input_array = np.asarray(matrix, dtype=np.float64)
+
+            if input_array.ndim != 2 or input_array.shape[1] != len(FEATURES):
+                raise ValueError(
+                    f"Se esperaba una matriz de N x {len(FEATURES)} características, "
+                    f"pero se recibió una de forma {input_array.shape}"
+                )
+
+            if input_array.shape[0] == 0:
+                result = {"positionIds": [], "physicalIds": []}
+                if with_probabilities:
+                    result.update(positionProbabilities=[], physicalProbabilities=[])
+                return result
+
+            if with_probabilities or not use_cache:
+                start = time.perf_counter()
+                result = self._infer(input_array, with_probabilities)
+                self._observe(input_array, result["positionIds"], result["physicalIds"], time.perf_counter() - start)
+                return result
+
+            position_keys, position_ids = self.positions_predictor.cached_predictions(input_array)
+            physical_keys, physical_ids = self.physical_conditions_predictor.cached_predictions(input_array)
+            missing = [
+                i for i in range(len(input_array))
+                if position_ids[i] is None or physical_ids[i] is None
+            ]
+
+            latency = None
+
+            if missing:
+                start = time.perf_counter()
+                computed = self._infer(input_array[missing], with_probabilities=False)
+                latency = time.perf_counter() - start
+
+                for i, position_id, physical_id in zip(missing, computed["positionIds"], computed["physicalIds"]):
+                    position_ids[i] = position_id
+                    physical_ids[i] = physical_id
+
+                self.positions_predictor.store_predictions(
+                    [position_keys[i] for i in missing], computed["positionIds"]
+                )
+                self.physical_conditions_predictor.store_predictions(
+                    [physical_keys[i] for i in missing], computed["physicalIds"]
+                )
+
+            self._observe(input_array, position_ids, physical_ids, latency)
+
+            return {
+                "positionIds": [int(cluster_id) for cluster_id in position_ids],
+                "physicalIds": [int(cluster_id) for cluster_id in physical_ids]
+            }
+        except Exception as e:
+            raise PredictionError(f"Error al predecir categoría: {str(e)}")
+
+    def score_one(self, features: List[float]) -> Dict[str, int]:
+        """
+        Predicts both clusters for a single feature vector.
+
+        Args:
+            features: List of features as float values.
+
+        Returns:
+            Dictionary with `positionId` and `physicalId`.
+
+        Raises:
+            PredictionError: If there's an error during prediction.
+        """
+        scores = self.score([features])
+
+        return {
+            "positionId": scores["positionIds"][0],
+            "physicalId": scores["physicalIds"][0]
+        }
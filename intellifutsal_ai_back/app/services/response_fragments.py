@@ -0,0 +1,41 @@
+from typing import Any, Dict
+from app.core import JSONFragments
+from app.domain import PHYSICAL_CONDITION_CHARACTERISTICS
+
+
+def _encode_physical_condition(characteristics: Dict[str, Any]) -> JSONFragments:
+    """Encodes the descriptive fields of a physical condition cluster, as sent in responses."""
+    return JSONFragments({
+        "description": characteristics.get("description", ""),
+        "strengths": characteristics.get("strengths", []),
+        "developmentAreas": characteristics.get("development_areas", []),
+        "trainingRecommendations": characteristics.get("training_recommendations", [])
+    })
+
+
+PHYSICAL_CONDITION_FRAGMENTS: Dict[int, JSONFragments] = {
+    cluster_id: _encode_physical_condition(characteristics)
+    for cluster_id, characteristics in PHYSICAL_CONDITION_CHARACTERISTICS.items()
+}
+
+_UNKNOWN_PHYSICAL_CONDITION = _encode_physical_condition({})
+
+
+def physical_condition_fragments(cluster_id: int) -> JSONFragments:
+    """
+    Returns the descriptive fields of a physical condition cluster, encoded once.
+
+    Team responses repeat the same description, strengths, development areas
+    and training recommendations for every player of a cluster; splicing
+    the pre-encoded fragments saves encoding them again for each player.
+
+    Args:
+        cluster_id: Physical condition cluster.
+
+    Returns:
+        Fragments with the `description`, `strengths`, `developmentAreas`
+        and `trainingRecommendations` fields of the cluster (empty for an
+        unknown cluster), to be merged into a response with the `splice`
+        method of the app's JSON provider.
+    """
+    return PHYSICAL_CONDITION_FRAGMENTS.get(cluster_id, _UNKNOWN_PHYSICAL_CONDITION)
@@ -0,0 +1,215 @@
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+class _VersionMetrics:
+    """Counters of one model version; only used with the scorer's lock held."""
+
+    def __init__(self, latency_window: int):
+        """Initializes empty counters keeping the last `latency_window` latencies."""
+        self.rows = 0
+        self.batches = 0
+        self.agreements = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=latency_window)
+
+    def as_dict(self, with_agreement: bool) -> Dict[str, Any]:
+        """Returns the counters, latency percentiles and, if requested, agreement rate."""
+        latencies = np.asarray(self.latencies) * 1000.0
+        metrics = {
+            "rows": self.rows,
+            "batches": self.batches,
+            "errors": self.errors,
+            "latencyMs": {
+                "mean": float(latencies.mean()) if len(latencies) else None,
+                "p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+                "p95": float(np.percentile(latencies, 95)) if len(latencies) else None
+            }
+        }
+
+        if with_agreement:
+            metrics["agreements"] = self.agreements
+            metrics["agreementRate"] = self.agreements / self.rows if self.rows else None
+
+        return metrics
+
+
+class ShadowScorer:
+    """
+    Scores a sample of live traffic with shadow model versions.
+
+    The primary model keeps answering every request. A fraction of the
+    batches it scores is queued, with the labels it returned, and a
+    background thread runs them through each shadow version, recording per
+    version how many labels agree with the primary and how long scoring
+    took. Queuing is non-blocking: when the queue is full the batch is
+    dropped, so shadow scoring never adds latency to a response.
+    """
+
+    def __init__(self, task: str, sample_rate: float = 0.1, queue_size: int = 1000,
+                 latency_window: int = 1000):
+        """
+        Initializes the scorer without shadow versions.
+
+        Args:
+            task: Name of the task the models solve, for logging.
+            sample_rate: Fraction of scored batches also sent to the shadows.
+            queue_size: Maximum number of batches waiting to be shadow scored.
+            latency_window: Number of recent latencies kept per version.
+        """
+        self.task = task
+        self.sample_rate = sample_rate
+        self.latency_window = latency_window
+        self.primary_version = None
+        self.dropped = 0
+        self._shadows: Dict[str, Any] = {}
+        self._metrics: Dict[str, _VersionMetrics] = {}
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._lock = threading.Lock()
+        self._worker_pid = None
+
+    def set_primary(self, version: str) -> None:
+        """
+        Sets the version label of the primary model, resetting every metric
+        when it changes, since agreement is measured against it.
+
+        Args:
+            version: Version label of the primary model.
+        """
+        with self._lock:
+            if version != self.primary_version:
+                self.primary_version = version
+                self._metrics = {}
+
+    def add_shadow(self, version: str, model: Any) -> None:
+        """
+        Adds (or replaces) a shadow version.
+
+        Args:
+            version: Version label of the shadow model.
+            model: Model adapter implementing `predict_batch`.
+        """
+        with self._lock:
+            self._shadows[version] = model
+            self._metrics.pop(version, None)
+
+    @property
+    def shadow_versions(self) -> List[str]:
+        """Version labels of the shadow models."""
+        return list(self._shadows)
+
+    def _version_metrics(self, version: str) -> _VersionMetrics:
+        """Returns the counters of a version; must be called with the lock held."""
+        metrics = self._metrics.get(version)
+
+        if metrics is None:
+            metrics = self._metrics[version] = _VersionMetrics(self.latency_window)
+
+        return metrics
+
+    def observe(self, matrix: Any, predictions: Sequence[int], latency: Optional[float] = None) -> None:
+        """
+        Records a batch scored by the primary model and samples it for the shadows.
+
+        Args:
+            matrix: N x len(FEATURES) raw feature matrix that was scored.
+            predictions: Labels returned by the primary model.
+            latency: Seconds the primary model took, or None if the labels
+                came from the cache.
+        """
+        if self.primary_version is not None:
+            with self._lock:
+                metrics = self._version_metrics(self.primary_version)
+                metrics.rows += len(predictions)
+                if latency is not None:
+                    metrics.batches += 1
+                    metrics.latencies.append(latency)
+
+        if not self._shadows or random.random() >= self.sample_rate:
+            return
+
+        self._ensure_worker()
+
+        try:
+            self._queue.put_nowait((self.primary_version, np.array(matrix, dtype=np.float64), list(predictions)))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _ensure_worker(self) -> None:
+        """Starts the thread of this process, since threads don't survive a fork."""
+        if self._worker_pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._worker_pid == os.getpid():
+                return
+
+            self._worker_pid = os.getpid()
+            threading.Thread(target=self._work, name=f"shadow-{self.task}", daemon=True).start()
+
+    def _work(self) -> None:
+        """Scores queued batches with every shadow version."""
+        while True:
+            primary_version, matrix, predictions = self._queue.get()
+            expected = np.asarray(predictions)
+
+            for version, model in list(self._shadows.items()):
+                start = time.perf_counter()
+
+                try:
+                    shadow_predictions = np.asarray(model.predict_batch(matrix))
+                except Exception:
+                    logger.error(f"Shadow model {version} of {self.task} failed: {traceback.format_exc()}")
+                    with self._lock:
+                        self._version_metrics(version).errors += 1
+                    continue
+
+                latency = time.perf_counter() - start
+
+                with self._lock:
+                    if primary_version != self.primary_version:
+                        break
+
+                    metrics = self._version_metrics(version)
+                    metrics.rows += len(expected)
+                    metrics.batches += 1
+                    metrics.agreements += int(np.count_nonzero(shadow_predictions == expected))
+                    metrics.latencies.append(latency)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Returns the metrics of every version in this process.
+
+        Returns:
+            Dictionary with the primary version, the sample rate, the dropped
+            batches, the queue length, and the rows, latencies and (for
+            shadows) agreement with the primary of each version.
+        """
+        with self._lock:
+            versions = {
+                version: dict(metrics.as_dict(with_agreement=version in self._shadows), role=(
+                    "shadow" if version in self._shadows else "primary"
+                ))
+                for version, metrics in self._metrics.items()
+            }
+
+            return {
+                "primaryVersion": self.primary_version,
+                "shadowVersions": list(self._shadows),
+                "sampleRate": self.sample_rate,
+                "dropped": self.dropped,
+                "queued": self._queue.qsize(),
+                "versions": versions
+            }
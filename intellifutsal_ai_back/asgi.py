@@ -0,0 +1,27 @@
+import logging
+import uvicorn
+from app import create_app, Config, ConfigError, ModelLoadError
+from app.asgi import create_asgi_app
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+try:
+    app = create_asgi_app(create_app())
+
+    if __name__ == "__main__":
+        logger.info(f"Starting ASGI server at {Config.HOST}:{Config.PORT}")
+        uvicorn.run(app, host=Config.HOST, port=Config.PORT)
+except ConfigError as e:
+    logger.critical(f"Configuration error: {str(e)}")
+    exit(1)
+except ModelLoadError as e:
+    logger.critical(f"Error loading models: {str(e)}")
+    exit(1)
+except Exception as e:
+    logger.critical(f"Unexpected error: {str(e)}")
+    exit(1)
@@ -0,0 +1,184 @@
+"""
+Scores feature files offline, with the same models and validation as the API.
+
+Reads a CSV, Parquet or NDJSON file in chunks, scores the chunks in parallel
+on every core and writes one row per player (index, id, name, position and
+physical condition clusters, or the row error) in the same format, or in
+the one given by `--output-format`. Models are loaded from the paths in the
+environment, exactly as the API loads them, and rows are validated against
+`FEATURE_VALIDATIONS` by the same parser.
+
+Run from the `intellifutsal_ai_back` directory, with the same environment as
+the application:
+
+    python batch_score.py players.csv scored.csv [--chunk-size 20000] [--workers 8]
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from typing import Dict, Optional
+import pandas as pd
+from app import Config, ConfigError, ModelLoadError
+from app.domain import FEATURES
+from app.infrastructure import FeatureFileWriter, PickleModelLoader, read_feature_chunks, format_from_path, FILE_FORMATS
+from app.services import BulkScorer, ModelSource, PlayerProfilePredictor, ProfileScorer
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+_bulk_scorer: Optional[BulkScorer] = None
+
+
+def init_worker(sources: Dict[str, ModelSource]) -> None:
+    """Loads the models of a scoring process."""
+    global _bulk_scorer
+
+    positions_model_adapter = PickleModelLoader.load_adapter(*sources["positions"])
+    physical_conditions_model_adapter = PickleModelLoader.load_adapter(*sources["physicalConditions"])
+    _bulk_scorer = BulkScorer(ProfileScorer(
+        PlayerProfilePredictor(positions_model_adapter),
+        PlayerProfilePredictor(physical_conditions_model_adapter)
+    ))
+
+
+def score_chunk(frame: pd.DataFrame, offset: int) -> pd.DataFrame:
+    """Scores a chunk of players in a scoring process."""
+    return _bulk_scorer.score_frame(frame, offset)
+
+
+def batch_score(input_path: str, output_path: str, input_format: str, output_format: str,
+                chunk_size: int, workers: int) -> Dict[str, int]:
+    """
+    Scores a feature file into a result file.
+
+    Chunks are read by this process and scored by `workers` processes, with
+    at most two chunks per process in flight, so memory stays bounded
+    whatever the size of the file. Results are written in input order.
+
+    The models are loaded (and compiled) once, by this process, before the
+    scoring processes are forked, so they inherit them and a model that
+    can't be loaded fails here. Where `fork` isn't available, each process
+    loads its own copy.
+
+    Args:
+        input_path: File with one row per player.
+        output_path: File the results are written to.
+        input_format: Format of the input file, one of `FILE_FORMATS`.
+        output_format: Format of the output file, one of `FILE_FORMATS`.
+        chunk_size: Number of rows per chunk.
+        workers: Number of scoring processes.
+
+    Returns:
+        Dictionary with the number of `rows` written and of `errors` among them.
+
+    Raises:
+        ModelLoadError: If a model can't be loaded.
+    """
+    sources = {
+        "positions": ModelSource(Config.POSITIONS_MODEL_PATH, Config.POSITIONS_SCALER_PATH, Config.POSITIONS_ARTIFACT_PATH),
+        "physicalConditions": ModelSource(
+            Config.PHYSICAL_CONDITIONS_MODEL_PATH, Config.PHYSICAL_CONDITIONS_SCALER_PATH, Config.PHYSICAL_CONDITIONS_ARTIFACT_PATH
+        )
+    }
+    writer = FeatureFileWriter(output_format)
+    counts = {"rows": 0, "errors": 0}
+    pool = None
+
+    init_worker(sources)
+
+    if workers > 1:
+        if "fork" in multiprocessing.get_all_start_methods():
+            pool = multiprocessing.get_context("fork").Pool(workers)
+        else:
+            pool = multiprocessing.Pool(workers, initializer=init_worker, initargs=(sources,))
+
+    def write(output, scored: pd.DataFrame) -> None:
+        output.write(writer.write(scored))
+        counts["rows"] += len(scored)
+        counts["errors"] += int(scored["error"].notna().sum())
+
+    try:
+        with open(output_path, "wb") as output:
+            pending = deque()
+            offset = 0
+
+            for frame in read_feature_chunks(input_path, input_format, chunk_size):
+                if pool is None:
+                    write(output, score_chunk(frame, offset))
+                else:
+                    pending.append(pool.apply_async(score_chunk, (frame, offset)))
+                    if len(pending) >= 2 * workers:
+                        write(output, pending.popleft().get())
+
+                offset += len(frame)
+                logger.info(f"{offset} rows read")
+
+            while pending:
+                write(output, pending.popleft().get())
+
+            if offset == 0:
+                # An empty file still gets a header.
+                frame = pd.DataFrame(columns=FEATURES)
+                write(output, score_chunk(frame, 0) if pool is None else pool.apply(score_chunk, (frame, 0)))
+
+            output.write(writer.close())
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    return counts
+
+
+def main() -> None:
+    """Parses the command line and scores the file."""
+    parser = argparse.ArgumentParser(description="Puntúa un archivo de jugadores con los modelos de la API.")
+    parser.add_argument("input", help="Archivo CSV, Parquet o NDJSON con una fila por jugador")
+    parser.add_argument("output", help="Archivo donde se escriben los resultados")
+    parser.add_argument("--input-format", choices=FILE_FORMATS, help="Formato del archivo de entrada (por defecto, según su extensión)")
+    parser.add_argument("--output-format", choices=FILE_FORMATS, help="Formato del archivo de salida (por defecto, el de entrada)")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="Filas por bloque")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Procesos de puntuación")
+    args = parser.parse_args()
+
+    input_format = args.input_format or format_from_path(args.input)
+
+    if input_format is None:
+        parser.error(f"No se reconoce el formato de {args.input}; indícalo con --input-format")
+
+    output_format = args.output_format or format_from_path(args.output) or input_format
+
+    start = time.perf_counter()
+    counts = batch_score(
+        args.input, args.output, input_format, output_format, max(1, args.chunk_size), max(1, args.workers)
+    )
+    elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"{counts['rows']} rows scored ({counts['errors']} with errors) in {elapsed:.1f} s "
+        f"with {max(1, args.workers)} processes: {counts['rows'] / elapsed:.0f} rows/s"
+    )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ConfigError as e:
+        logger.critical(f"Configuration error: {str(e)}")
+        exit(1)
+    except ModelLoadError as e:
+        logger.critical(f"Error loading models: {str(e)}")
+        exit(1)
+    except ValueError as e:
+        logger.critical(f"Invalid input: {str(e)}")
+        exit(1)
+    except OSError as e:
+        logger.critical(f"File error: {str(e)}")
+        exit(1)
@@ -0,0 +1,26 @@
+import gc
+import os
+
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '9041')}"
+workers = int(os.environ.get("GUNICORN_WORKERS", "2"))
+threads = int(os.environ.get("GUNICORN_THREADS", "1"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "90"))
+
+# Load the application (and unpickle and compile the models) once in the
+# master, so workers inherit it through fork and share its pages.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+
+
+def when_ready(server):
+    """
+    Freezes the objects created while preloading before the first fork.
+
+    Frozen objects are moved to the permanent generation, so the collector
+    of each worker never writes to their headers and the pages holding them
+    stay shared with the master.
+    """
+    if preload_app:
+        gc.collect()
+        gc.freeze()
+        server.log.info(f"Frozen {gc.get_freeze_count()} objects before forking workers")
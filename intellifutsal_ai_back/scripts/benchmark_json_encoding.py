@@ -0,0 +1,142 @@
+"""
+Benchmarks the encoding of a team physical condition response.
+
+Builds the body of `/api/team/predict-physical` for a synthetic team and
+encodes it as a response with Flask's standard library provider (the
+former encoding, with plain ints and dictionaries), with
+`NumpyJSONProvider` and with `OrjsonJSONProvider`, the last two as the
+routes build it now (NumPy cluster ids and the descriptions of each
+cluster spliced from pre-encoded fragments). Prints the median time and
+size of each response and whether it decodes to the same document as the
+former one.
+
+Run from the `intellifutsal_ai_back` directory, with the same environment as
+the application:
+
+    python scripts/benchmark_json_encoding.py [--players 100] [--number 200] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import NumpyJSONProvider, OrjsonJSONProvider
+from app.domain import FEATURES, FEATURE_VALIDATIONS, PHYSICAL_CONDITIONS_CATEGORIES, PHYSICAL_CONDITION_CHARACTERISTICS
+from app.services import physical_condition_fragments
+
+
+def build_team_response(players: int, provider: Optional[NumpyJSONProvider] = None) -> Dict[str, Any]:
+    """
+    Builds the body of a team physical condition response.
+
+    Args:
+        players: Number of players of the team.
+        provider: If given, builds it as the routes do now for this provider
+            (NumPy cluster ids and spliced descriptions); otherwise as they
+            used to.
+
+    Returns:
+        The response body.
+    """
+    generator = random.Random(0)
+    cluster_ids = sorted(PHYSICAL_CONDITION_CHARACTERISTICS)
+    results = []
+
+    for i in range(players):
+        cluster_id = np.int64(cluster_ids[i % len(cluster_ids)])
+
+        if provider is not None:
+            descriptions = provider.splice(physical_condition_fragments(cluster_id))
+        else:
+            cluster_id = int(cluster_id)
+            characteristics = PHYSICAL_CONDITION_CHARACTERISTICS[cluster_id]
+            descriptions = {
+                "description": characteristics.get("description", ""),
+                "strengths": characteristics.get("strengths", []),
+                "developmentAreas": characteristics.get("development_areas", []),
+                "trainingRecommendations": characteristics.get("training_recommendations", [])
+            }
+
+        results.append({
+            "playerId": f"player_{i}",
+            "playerName": f"Jugador {i + 1}",
+            "clusterId": cluster_id,
+            "clusterName": PHYSICAL_CONDITIONS_CATEGORIES[int(cluster_id)],
+            **descriptions,
+            "features": {
+                field: round(generator.uniform(FEATURE_VALIDATIONS[field]["min"], FEATURE_VALIDATIONS[field]["max"]), 2)
+                for field in FEATURES
+            }
+        })
+
+    return {
+        "success": True,
+        "teamName": "IntelliFutsal FC",
+        "results": results,
+        "errors": [],
+        "totalPlayers": players,
+        "processedPlayers": players,
+        "failedPlayers": 0
+    }
+
+
+def median_time(provider: DefaultJSONProvider, document: Dict[str, Any], number: int, repeat: int) -> float:
+    """Returns the median wall time of one `provider.response(document)`, in seconds."""
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            provider.response(document)
+        timings.append((time.perf_counter() - start) / number)
+
+    return statistics.median(timings)
+
+
+def main(argv: List[str] = None) -> None:
+    """Runs the benchmark and prints one line per provider."""
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("--players", type=int, default=100, help="Players of the team")
+    arguments.add_argument("--number", type=int, default=200, help="Responses encoded per run")
+    arguments.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    options = arguments.parse_args(argv)
+
+    app = Flask(__name__)
+    numpy_provider = NumpyJSONProvider(app)
+    orjson_provider = OrjsonJSONProvider(app)
+    former_document = build_team_response(options.players)
+    former_body = json.loads(DefaultJSONProvider(app).response(former_document).get_data())
+
+    cases = [
+        ("stdlib (former)", DefaultJSONProvider(app), former_document),
+        ("stdlib + numpy", numpy_provider, build_team_response(options.players, numpy_provider)),
+        ("orjson", orjson_provider, former_document),
+        ("orjson + fragments", orjson_provider, build_team_response(options.players, orjson_provider)),
+    ]
+    baseline = None
+
+    print(f"{'provider':<20}{'players':>8}{'bytes':>10}{'us':>10}{'speedup':>10}  same document")
+
+    for name, provider, case_document in cases:
+        elapsed = median_time(provider, case_document, options.number, options.repeat)
+        body = provider.response(case_document).get_data()
+        baseline = baseline or elapsed
+
+        print(
+            f"{name:<20}{options.players:>8}{len(body):>10}{elapsed * 1e6:>10.1f}"
+            f"{baseline / elapsed:>9.1f}x  {json.loads(body) == former_body}"
+        )
+
+
+if __name__ == "__main__":
+    main()
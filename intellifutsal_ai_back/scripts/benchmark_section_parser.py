@@ -0,0 +1,185 @@
+"""
+Benchmarks the section parser against the regular expressions it replaced.
+
+Builds synthetic player and team analyses of increasing size, parses them
+with the former `re` cascade of `OpenAIService` and with `SectionParser`,
+and prints the median time of each and the fields where the results differ.
+
+Run from the `intellifutsal_ai_back` directory, with the same environment as
+the application:
+
+    python scripts/benchmark_section_parser.py [--repeat 5]
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.analysis_parser import PLAYER_ANALYSIS_SECTIONS, TEAM_ANALYSIS_SECTIONS, SectionParser
+
+
+def legacy_parse_player(content: str) -> Dict[str, Any]:
+    """Parses a player analysis the way `analyze_player_profile` used to."""
+    general_analysis = ""
+    strengths = []
+    weaknesses = []
+    training_recommendations = []
+    performance_profile = ""
+
+    general_match = re.search(r'ANÁLISIS GENERAL:\s*(.*?)(?=\s*\n\s*FORTALEZAS:|$)', content, re.DOTALL)
+    if general_match:
+        general_analysis = general_match.group(1).strip()
+
+    strengths_section = re.search(r'FORTALEZAS:(?:\s*\n)((?:(?:-\s*.*?\n)|.)*?)(?=\s*\n\s*ÁREAS DE MEJORA:|$)', content, re.DOTALL)
+    if strengths_section:
+        strength_items = re.findall(r'-\s*(.*?)(?:\n|$)', strengths_section.group(1).strip(), re.DOTALL)
+        strengths = [item.strip() for item in strength_items if item.strip()]
+
+    weaknesses_section = re.search(r'ÁREAS DE MEJORA:(?:\s*\n)((?:(?:-\s*.*?\n)|.)*?)(?=\s*\n\s*RECOMENDACIONES DE ENTRENAMIENTO:|$)', content, re.DOTALL)
+    if weaknesses_section:
+        weakness_items = re.findall(r'-\s*(.*?)(?:\n|$)', weaknesses_section.group(1).strip(), re.DOTALL)
+        weaknesses = [item.strip() for item in weakness_items if item.strip()]
+
+    training_section = re.search(r'RECOMENDACIONES DE ENTRENAMIENTO:(?:\s*\n)((?:(?:-\s*.*?\n)|.)*?)(?=\s*\n\s*PERFIL DE RENDIMIENTO:|$)', content, re.DOTALL)
+    if training_section:
+        training_items = re.findall(r'-\s*(.*?)(?:\n|$)', training_section.group(1).strip(), re.DOTALL)
+        training_recommendations = [item.strip() for item in training_items if item.strip()]
+
+    performance_section = re.search(r'PERFIL DE RENDIMIENTO:\s*(.*?)', content, re.DOTALL)
+    if performance_section:
+        performance_profile = re.findall(r'-\s*(.*?)(?:\n|$)', performance_section.group(1).strip(), re.DOTALL)
+        performance_profile = [item.strip() for item in performance_profile if item.strip()]
+        performance_profile = "\n".join(performance_profile)
+
+    return {
+        "generalAnalysis": general_analysis,
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "trainingRecommendations": training_recommendations,
+        "performanceProfile": performance_profile
+    }
+
+
+def legacy_parse_team(content: str) -> Dict[str, Any]:
+    """Parses a team analysis the way `analyze_team` used to."""
+    general_analysis = ""
+    team_strengths = []
+    team_weaknesses = []
+    tactical_recommendations = []
+    training_suggestions = []
+    lineup_adjustments = ""
+
+    general_match = re.search(r'ANÁLISIS GENERAL:\s*(.*?)(?=\s*\n\s*PUNTOS FUERTES:|$)', content, re.DOTALL)
+    if general_match:
+        general_analysis = general_match.group(1).strip()
+
+    strengths_section = re.search(r'PUNTOS FUERTES:(?:\s*\n)((?:(?:-\s*.*?\n)|.)*?)(?=\s*\n\s*ÁREAS DE MEJORA:|$)', content, re.DOTALL)
+    if strengths_section:
+        strength_items = re.findall(r'-\s*(.*?)(?:\n|$)', strengths_section.group(1).strip(), re.DOTALL)
+        team_strengths = [item.strip() for item in strength_items if item.strip()]
+
+    weaknesses_section = re.search(r'ÁREAS DE MEJORA:(?:\s*\n)((?:(?:-\s*.*?\n)|.)*?)(?=\s*\n\s*RECOMENDACIONES TÁCTICAS:|$)', content, re.DOTALL)
+    if weaknesses_section:
+        weakness_items = re.findall(r'-\s*(.*?)(?:\n|$)', weaknesses_section.group(1).strip(), re.DOTALL)
+        team_weaknesses = [item.strip() for item in weakness_items if item.strip()]
+
+    tactical_section = re.search(r'RECOMENDACIONES TÁCTICAS:(?:\s*\n)((?:(?:-\s*.*?\n)|.)*?)(?=\s*\n\s*SUGERENCIAS DE ENTRENAMIENTOS:|$)', content, re.DOTALL)
+    if tactical_section:
+        tactical_items = re.findall(r'-\s*(.*?)(?:\n|$)', tactical_section.group(1).strip(), re.DOTALL)
+        tactical_recommendations = [item.strip() for item in tactical_items if item.strip()]
+
+    training_section = re.search(r'SUGERENCIAS DE ENTRENAMIENTOS:(?:\s*\n)((?:(?:-\s*.*?\n)|.)*?)(?=\s*\n\s*AJUSTES EN LA ALINEACIÓN:|$)', content, re.DOTALL)
+    if training_section:
+        training_items = re.findall(r'-\s*(.*?)(?:\n|$)', training_section.group(1).strip(), re.DOTALL)
+        training_suggestions = [item.strip() for item in training_items if item.strip()]
+
+    lineup_section = re.search(r'AJUSTES EN LA ALINEACIÓN:\s*(.*?)', content, re.DOTALL)
+    if lineup_section:
+        lineup_items = re.findall(r'-\s*(.*?)(?:\n|$)', lineup_section.group(1).strip(), re.DOTALL)
+        lineup_adjustments = [item.strip() for item in lineup_items if item.strip()]
+        lineup_adjustments = "\n".join(lineup_adjustments)
+
+    return {
+        "generalAnalysis": general_analysis,
+        "teamStrengths": team_strengths,
+        "teamWeaknesses": team_weaknesses,
+        "tacticalRecommendations": tactical_recommendations,
+        "trainingRecommendations": training_suggestions,
+        "lineupAdjustments": lineup_adjustments
+    }
+
+
+def build_response(sections, items: int) -> str:
+    """
+    Builds a synthetic response following the format of the system prompts.
+
+    Args:
+        sections: Header table of the analysis type.
+        items: Number of lines of every section.
+
+    Returns:
+        The response text.
+    """
+    blocks = []
+
+    for section in sections:
+        if section.is_list:
+            lines = [f"- {section.header.capitalize()} {i}: ejercicio de 4 series de 8 repeticiones" for i in range(items)]
+        else:
+            lines = [f"Línea {i} del apartado {section.header.lower()} con el detalle del jugador." for i in range(items)]
+
+        blocks.append(f"{section.header}:\n" + "\n".join(lines))
+
+    return "\n\n".join(blocks)
+
+
+def median_time(function: Callable[[str], Any], content: str, repeat: int) -> float:
+    """Returns the median wall time of `function(content)`, in seconds."""
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(content)
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
+
+
+def main(argv: List[str] = None) -> None:
+    """Runs the benchmark and prints one line per analysis type and size."""
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    arguments.add_argument("--sizes", type=int, nargs="+", default=[3, 30, 300, 3000],
+                           help="Lines per section of the synthetic responses")
+    options = arguments.parse_args(argv)
+
+    cases = [
+        ("player", PLAYER_ANALYSIS_SECTIONS, legacy_parse_player),
+        ("team", TEAM_ANALYSIS_SECTIONS, legacy_parse_team),
+    ]
+
+    print(f"{'type':<8}{'lines':>8}{'chars':>12}{'regex ms':>12}{'parser ms':>12}{'speedup':>10}  differences")
+
+    for name, sections, legacy in cases:
+        for size in options.sizes:
+            content = build_response(sections, size)
+            legacy_time = median_time(legacy, content, options.repeat)
+            parser_time = median_time(lambda text: SectionParser.parse(text, sections), content, options.repeat)
+
+            legacy_result = legacy(content)
+            parser_result = SectionParser.parse(content, sections)
+            differences = [key for key in parser_result if parser_result[key] != legacy_result[key]]
+
+            print(
+                f"{name:<8}{size:>8}{len(content):>12}{legacy_time * 1000:>12.3f}{parser_time * 1000:>12.3f}"
+                f"{legacy_time / parser_time:>9.1f}x  {', '.join(differences) or '-'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmarks the WSGI and ASGI entry points under concurrent analyses.
+
+Starts `fake_openai_server.py` as the OpenAI backend, then serves the
+application with gunicorn (`main:app`, sync workers) and with uvicorn
+(`asgi:app`) in turn, fires concurrent `POST /api/analyze` requests at each
+with the analysis cache disabled, and prints the throughput and latency
+percentiles of both.
+
+Run from the `intellifutsal_ai_back` directory, with the same environment as
+the application:
+
+    python scripts/benchmark_serving_modes.py [--requests 200] [--concurrency 50] [--delay 1.0]
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.domain import FEATURES, FEATURE_VALIDATIONS
+
+
+def build_player(seed: int) -> Dict[str, Any]:
+    """Builds a valid random player, different for each seed so no request is coalesced."""
+    generator = random.Random(seed)
+    player = {
+        field: round(generator.uniform(FEATURE_VALIDATIONS[field]["min"], FEATURE_VALIDATIONS[field]["max"]), 2)
+        for field in FEATURES
+    }
+    player["useCache"] = False
+    return player
+
+
+def wait_until_ready(url: str, timeout: float = 60.0) -> None:
+    """Waits until a server answers on `url`."""
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1.0)
+            return
+        except urllib.error.HTTPError:
+            return
+        except OSError:
+            time.sleep(0.2)
+
+    raise RuntimeError(f"Server at {url} didn't start in {timeout} s")
+
+
+def post(url: str, payload: Dict[str, Any]) -> float:
+    """Sends a JSON request and returns its latency, in seconds."""
+    body = json.dumps(payload).encode("utf-8")
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+
+    with urllib.request.urlopen(request, timeout=300) as response:
+        response.read()
+
+    return time.perf_counter() - start
+
+
+def run_load(base_url: str, total: int, concurrency: int) -> Dict[str, Any]:
+    """Fires `total` analyses with `concurrency` clients and summarizes them."""
+    url = f"{base_url}/api/analyze"
+    latencies: List[float] = []
+    errors = 0
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(post, url, build_player(seed)) for seed in range(total)]
+
+        for future in futures:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                errors += 1
+
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def percentile(fraction: float) -> float:
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] if latencies else float("nan")
+
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "mean": statistics.mean(latencies) if latencies else float("nan"),
+        "errors": errors
+    }
+
+
+def serve(command: List[str], environment: Dict[str, str]) -> subprocess.Popen:
+    """Starts a server process in its own process group."""
+    return subprocess.Popen(command, cwd=ROOT, env=environment, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+def stop(process: subprocess.Popen) -> None:
+    """Stops a server process and its workers."""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=15)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("--requests", type=int, default=200)
+    arguments.add_argument("--concurrency", type=int, default=50)
+    arguments.add_argument("--delay", type=float, default=1.0, help="Seconds per fake completion")
+    arguments.add_argument("--workers", type=int, default=2, help="Server worker processes")
+    arguments.add_argument("--port", type=int, default=9100)
+    options = arguments.parse_args()
+
+    fake_port = options.port + 1
+    environment = dict(os.environ)
+    environment.update({
+        "OPENAI_API_BASE": f"http://127.0.0.1:{fake_port}/v1",
+        "OPENAI_API_KEY": environment.get("OPENAI_API_KEY", "test"),
+        "OPENAI_CIRCUIT_BREAKER": "false"
+    })
+
+    backend = serve([sys.executable, os.path.join("scripts", "fake_openai_server.py"),
+                     "--port", str(fake_port), "--delay", str(options.delay)], environment)
+    bind = f"127.0.0.1:{options.port}"
+    modes = {
+        "gunicorn (sync)": ["gunicorn", "--bind", bind, "--workers", str(options.workers),
+                            "--timeout", "300", "main:app"],
+        "uvicorn (asgi)": ["uvicorn", "--host", "127.0.0.1", "--port", str(options.port),
+                           "--workers", str(options.workers), "asgi:app"]
+    }
+
+    try:
+        wait_until_ready(f"http://127.0.0.1:{fake_port}/")
+        print(f"{'mode':<18} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}")
+
+        for name, command in modes.items():
+            server = serve(command, environment)
+
+            try:
+                wait_until_ready(f"http://{bind}/")
+                summary = run_load(f"http://{bind}", options.requests, options.concurrency)
+            finally:
+                stop(server)
+
+            print(f"{name:<18} {summary['throughput']:>8.1f} {summary['p50']:>7.2f}s "
+                  f"{summary['p95']:>7.2f}s {summary['p99']:>7.2f}s {summary['errors']:>7}")
+    finally:
+        stop(backend)
+
+
+if __name__ == "__main__":
+    main()
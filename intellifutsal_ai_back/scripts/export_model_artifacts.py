@@ -0,0 +1,90 @@
+"""
+Exports the configured models as memory-mapped artifacts.
+
+Loads each model/scaler pickle pair, compiles it (fusing the scaler when
+`FUSED_SCALERS` is set), writes it to `POSITIONS_ARTIFACT_PATH` and
+`PHYSICAL_CONDITIONS_ARTIFACT_PATH`, and maps the written file back to check
+that it predicts the same labels as the pickles. The application loads the
+artifacts instead of the pickles from then on; re-run the export whenever the
+pickles change (stale artifacts are detected and ignored).
+
+Run from the `intellifutsal_ai_back` directory, with the same environment as
+the application:
+
+    python scripts/export_model_artifacts.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import Config
+from app.domain import FEATURES, FEATURE_VALIDATIONS
+from app.infrastructure import MemoryMappedModelLoader, PickleModelLoader
+from app.infrastructure.compiled_forest import sample_feature_space
+
+
+MODELS = {
+    "positions": ("POSITIONS_MODEL_PATH", "POSITIONS_SCALER_PATH", "POSITIONS_ARTIFACT_PATH"),
+    "physical conditions": (
+        "PHYSICAL_CONDITIONS_MODEL_PATH", "PHYSICAL_CONDITIONS_SCALER_PATH", "PHYSICAL_CONDITIONS_ARTIFACT_PATH"
+    )
+}
+
+
+def export(name: str, model_path: str, scaler_path: str, artifact_path: str) -> bool:
+    """
+    Exports one model and checks the written artifact.
+
+    Returns:
+        False if the model can't be compiled or the artifact fails the check.
+    """
+    model = PickleModelLoader.load_model(model_path)
+    scaler = PickleModelLoader.load_model(scaler_path)
+    compiled_model = PickleModelLoader.compile_model(model, scaler, Config.FUSED_SCALERS)
+
+    if compiled_model is None:
+        print(f"{name}: the model can't be compiled, nothing exported")
+        return False
+
+    MemoryMappedModelLoader.export(artifact_path, compiled_model, scaler, (model_path, scaler_path))
+    mismatch = MemoryMappedModelLoader.check_export(
+        artifact_path, model, scaler, sample_feature_space(FEATURE_VALIDATIONS, FEATURES, seed=1)
+    )
+
+    if mismatch:
+        os.remove(artifact_path)
+        print(f"{name}: artifact removed, parity check failed: {mismatch}")
+        return False
+
+    start = time.perf_counter()
+    MemoryMappedModelLoader.load(artifact_path, (model_path, scaler_path))
+    map_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    PickleModelLoader.load_model(model_path)
+    PickleModelLoader.load_model(scaler_path)
+    pickle_time = time.perf_counter() - start
+
+    print(
+        f"{name}: {artifact_path} ({os.path.getsize(artifact_path) / 1024:.0f} KiB, "
+        f"scaler {'fused' if compiled_model.scaler_fused else 'separate'}), "
+        f"load {map_time * 1000:.1f} ms vs {pickle_time * 1000:.1f} ms unpickling"
+    )
+    return True
+
+
+def main() -> None:
+    """Exports every model."""
+    exported = [
+        export(name, *(getattr(Config, setting) for setting in settings))
+        for name, settings in MODELS.items()
+    ]
+
+    if not all(exported):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
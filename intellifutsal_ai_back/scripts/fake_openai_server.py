@@ -0,0 +1,180 @@
+"""
+Local stand-in for the OpenAI chat completions API.
+
+Answers `POST /v1/chat/completions` (plain or streamed) with a canned
+analysis in the format requested by the system prompts, after a configurable
+delay, so the service can be load tested without calling OpenAI. Connections
+are kept alive (HTTP/1.1).
+
+    python scripts/fake_openai_server.py --port 8900 --delay 1.5
+    OPENAI_API_BASE=http://127.0.0.1:8900/v1 OPENAI_API_KEY=test gunicorn main:app
+"""
+import argparse
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+PLAYER_ANALYSIS = """ANÁLISIS GENERAL:
+Jugador con un perfil físico equilibrado para su posición.
+
+FORTALEZAS:
+- Buena capacidad de aceleración
+- Salto bipodal por encima de la media
+
+ÁREAS DE MEJORA:
+- Resistencia aeróbica
+- Asimetría entre saltos unipodales
+
+RECOMENDACIONES DE ENTRENAMIENTO:
+- 4 series de 6 sprints de 20 m con 90 s de recuperación
+- 3 series de 8 saltos unipodales alternos con cajón de 30 cm
+
+PERFIL DE RENDIMIENTO:
+Rendimiento alto en acciones cortas e intensas."""
+
+TEAM_ANALYSIS = """ANÁLISIS GENERAL:
+Plantilla equilibrada con predominio de perfiles explosivos.
+
+PUNTOS FUERTES:
+- Velocidad en transiciones
+- Variedad de perfiles físicos
+
+ÁREAS DE MEJORA:
+- Resistencia colectiva
+- Juego aéreo defensivo
+
+RECOMENDACIONES TÁCTICAS:
+- Presión alta en los primeros minutos
+- Rotaciones frecuentes
+
+SUGERENCIAS DE ENTRENAMIENTOS:
+- Circuito de 5 estaciones de 45 s con 15 s de descanso
+
+AJUSTES EN LA ALINEACIÓN:
+Alternar los perfiles más resistentes en el segundo tiempo."""
+
+
+def build_content(request: dict) -> str:
+    """
+    Builds the canned answer for a chat completion request.
+
+    Args:
+        request: Decoded request body.
+
+    Returns:
+        The completion text, with one delimited block per player for batched requests.
+    """
+    messages = request.get("messages", [])
+    system_prompt = messages[0]["content"] if messages else ""
+    prompt = messages[-1]["content"] if messages else ""
+
+    if "PUNTOS FUERTES" in system_prompt:
+        return TEAM_ANALYSIS
+
+    players = sorted({int(number) for number in re.findall(r"=== JUGADOR (\d+) ===", prompt)})
+
+    if not players:
+        return PLAYER_ANALYSIS
+
+    return "\n\n".join(
+        f"=== JUGADOR {number} ===\n{PLAYER_ANALYSIS}\n=== FIN JUGADOR {number} ===" for number in players
+    )
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Request handler of the stand-in server."""
+
+    protocol_version = "HTTP/1.1"
+    delay = 1.0
+    error_rate = 0.0
+
+    def log_message(self, format, *args):
+        """Silences the per-request log."""
+
+    def send_json(self, status: int, payload: dict) -> None:
+        """Sends a JSON response."""
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        """Answers a chat completion request."""
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if not self.path.endswith("/chat/completions"):
+            self.send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+            return
+
+        if random.random() < self.error_rate:
+            self.send_json(429, {"error": {"message": "Rate limit reached", "type": "requests"}})
+            return
+
+        content = build_content(request)
+        model = request.get("model", "gpt-4o")
+
+        if not request.get("stream"):
+            time.sleep(self.delay)
+            self.send_json(200, {
+                "id": "chatcmpl-local",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        pieces = [content[i:i + 12] for i in range(0, len(content), 12)]
+
+        for piece in pieces + [None]:
+            time.sleep(self.delay / (len(pieces) + 1))
+            delta = {"content": piece} if piece is not None else {}
+            chunk = {
+                "id": "chatcmpl-local",
+                "object": "chat.completion.chunk",
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": None if piece is not None else "stop"}]
+            }
+            self.write_chunk(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+
+        self.write_chunk(b"data: [DONE]\n\n")
+        self.write_chunk(b"")
+
+    def write_chunk(self, data: bytes) -> None:
+        """Writes a chunk of a chunked response."""
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def main() -> None:
+    """Starts the server."""
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("--host", default="127.0.0.1")
+    arguments.add_argument("--port", type=int, default=8900)
+    arguments.add_argument("--delay", type=float, default=1.0, help="Seconds per completion")
+    arguments.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    options = arguments.parse_args()
+
+    Handler.delay = options.delay
+    Handler.error_rate = options.error_rate
+    server = ThreadingHTTPServer((options.host, options.port), Handler)
+    server.daemon_threads = True
+
+    print(f"Serving on http://{options.host}:{options.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Measures the memory of gunicorn workers with and without preloading.
+
+Starts gunicorn with `gunicorn.conf.py` in each configuration (one model
+copy per worker, models preloaded in the master, and preloaded with the
+scikit-learn objects released), sends some predictions so every worker has
+served traffic, and prints the RSS and PSS of the master and each worker
+from `/proc/<pid>/smaps_rollup`. PSS splits shared pages among the processes
+sharing them, so its total is the real memory used by the server.
+
+Linux only. Run from the `intellifutsal_ai_back` directory, with the same
+environment as the application:
+
+    python scripts/measure_worker_memory.py [--workers 4] [--requests 200]
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.domain import FEATURES, FEATURE_VALIDATIONS
+
+
+MODES = {
+    "no preload": {"GUNICORN_PRELOAD": "false", "RELEASE_SKLEARN_MODELS": "false"},
+    "preload": {"GUNICORN_PRELOAD": "true", "RELEASE_SKLEARN_MODELS": "false"},
+    "preload + release": {"GUNICORN_PRELOAD": "true", "RELEASE_SKLEARN_MODELS": "true"}
+}
+
+
+def memory_of(pid: int) -> Dict[str, int]:
+    """Returns the RSS and PSS of a process, in KiB."""
+    memory = {}
+
+    with open(f"/proc/{pid}/smaps_rollup") as file:
+        for line in file:
+            name, _, value = line.partition(":")
+            if name in ("Rss", "Pss"):
+                memory[name] = int(value.split()[0])
+
+    return memory
+
+
+def children_of(pid: int) -> List[int]:
+    """Returns the ids of the child processes of a process."""
+    with open(f"/proc/{pid}/task/{pid}/children") as file:
+        return [int(child) for child in file.read().split()]
+
+
+def wait_for_workers(master: subprocess.Popen, url: str, workers: int, timeout: float = 120.0) -> None:
+    """Waits until every worker is started and the server answers."""
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        if master.poll() is not None:
+            raise RuntimeError("gunicorn exited while starting")
+
+        if len(children_of(master.pid)) >= workers:
+            try:
+                urllib.request.urlopen(url, timeout=1.0)
+                return
+            except urllib.error.HTTPError:
+                return
+            except OSError:
+                pass
+
+        time.sleep(0.5)
+
+    raise RuntimeError(f"gunicorn didn't start in {timeout} s")
+
+
+def send_predictions(url: str, total: int) -> None:
+    """Sends position predictions with random valid players."""
+    generator = random.Random(0)
+
+    for _ in range(total):
+        player = {
+            field: round(generator.uniform(FEATURE_VALIDATIONS[field]["min"], FEATURE_VALIDATIONS[field]["max"]), 2)
+            for field in FEATURES
+        }
+        request = urllib.request.Request(
+            url, data=json.dumps(player).encode("utf-8"), headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+
+
+def measure(environment: Dict[str, str], port: int, workers: int, requests: int) -> Dict[str, List[Dict[str, int]]]:
+    """Starts gunicorn in one configuration and measures its processes."""
+    environment = dict(environment, PORT=str(port), HOST="127.0.0.1", GUNICORN_WORKERS=str(workers))
+    master = subprocess.Popen(
+        ["gunicorn", "-c", "gunicorn.conf.py", "main:app"], cwd=ROOT, env=environment,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        wait_for_workers(master, f"{base_url}/", workers)
+        send_predictions(f"{base_url}/api/predict-position", requests)
+        time.sleep(1.0)
+
+        return {
+            "master": [memory_of(master.pid)],
+            "workers": [memory_of(worker) for worker in children_of(master.pid)]
+        }
+    finally:
+        os.killpg(master.pid, signal.SIGTERM)
+        master.wait(timeout=30)
+
+
+def main() -> None:
+    """Runs the measurement."""
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("--workers", type=int, default=4)
+    arguments.add_argument("--requests", type=int, default=200, help="Predictions sent before measuring")
+    arguments.add_argument("--port", type=int, default=9300)
+    options = arguments.parse_args()
+
+    print(f"{'mode':<20} {'master RSS':>11} {'worker RSS':>11} {'worker PSS':>11} {'total PSS':>11}")
+
+    for name, overrides in MODES.items():
+        memory = measure(dict(os.environ, **overrides), options.port, options.workers, options.requests)
+        workers = memory["workers"]
+        worker_rss = sum(worker["Rss"] for worker in workers) / len(workers)
+        worker_pss = sum(worker["Pss"] for worker in workers) / len(workers)
+        total_pss = memory["master"][0]["Pss"] + sum(worker["Pss"] for worker in workers)
+
+        print(f"{name:<20} {memory['master'][0]['Rss'] / 1024:>8.1f} MB {worker_rss / 1024:>8.1f} MB "
+              f"{worker_pss / 1024:>8.1f} MB {total_pss / 1024:>8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(ROOT, "static", "models")
+
+sys.path.insert(0, ROOT)
+
+# `Config` requires the model paths when `app` is imported; default them to
+# the shipped pickles so the tests run without an environment file.
+os.environ.setdefault("POSITIONS_MODEL_PATH", os.path.join(MODELS_DIR, "hierarchical_classifier.pkl"))
+os.environ.setdefault("POSITIONS_SCALER_PATH", os.path.join(MODELS_DIR, "hierarchical_scaler.pkl"))
+os.environ.setdefault("PHYSICAL_CONDITIONS_MODEL_PATH", os.path.join(MODELS_DIR, "kmeans_classifier.pkl"))
+os.environ.setdefault("PHYSICAL_CONDITIONS_SCALER_PATH", os.path.join(MODELS_DIR, "kmeans_scaler.pkl"))
+
+
+@pytest.fixture(autouse=True)
+def lock_dir(tmp_path, monkeypatch):
+    """Keeps the lock files of `OpenAIService` out of the working tree."""
+    from app.core import Config
+
+    monkeypatch.setattr(Config, "OPENAI_SINGLE_FLIGHT_LOCK_DIR", str(tmp_path / "locks"))
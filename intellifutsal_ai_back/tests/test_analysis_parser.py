@@ -0,0 +1,76 @@
+"""
+Splitting of batched player analyses, and caching of truncated batches.
+"""
+from types import SimpleNamespace
+import openai
+from openai.openai_object import OpenAIObject
+from app.core import Config
+from app.domain import FEATURES
+from app.services import OpenAIService
+from app.services.analysis_parser import player_block_end, player_block_start, split_player_blocks
+
+
+def batch(*blocks):
+    """Joins (number, text, closed) blocks into a batched response."""
+    lines = []
+
+    for number, text, closed in blocks:
+        lines += [player_block_start(number), text]
+
+        if closed:
+            lines.append(player_block_end(number))
+
+    return "\n".join(lines)
+
+
+def test_closed_blocks_are_split():
+    content = batch((1, "Uno", True), (2, "Dos", True))
+
+    assert split_player_blocks(content, 2) == ["Uno", "Dos"]
+
+
+def test_truncated_last_block_is_dropped():
+    content = batch((1, "Uno", True), (2, "Dos, cortado a mitad de", False))
+
+    assert split_player_blocks(content, 2) == ["Uno", None]
+
+
+def test_block_cut_off_by_the_next_one_is_dropped():
+    content = batch((1, "Uno", False), (2, "Dos", True))
+
+    assert split_player_blocks(content, 2) == [None, "Dos"]
+
+
+def test_truncated_batch_caches_only_closed_blocks(monkeypatch):
+    cached = {}
+    service = OpenAIService(cache=SimpleNamespace(get=cached.get, set=cached.__setitem__))
+    content = batch((1, "Uno", True), (2, "Dos, cortado a mitad de", False))
+    response = OpenAIObject.construct_from({
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "length"}]
+    })
+
+    monkeypatch.setattr(Config, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(openai.ChatCompletion, "create", lambda **kwargs: response)
+    monkeypatch.setattr(service, "analyze_player_profile", lambda *args: "individual")
+    monkeypatch.setattr(service, "_player_analysis_result", lambda content, *args: content)
+    features = [1.0] * len(FEATURES)
+
+    results = service.analyze_player_batch([(features, 0, 0), (features, 1, 1)], FEATURES)
+
+    assert results == ["Uno", "individual"]
+    assert list(cached.values()) == ["Uno"]
+
+
+def test_only_stopped_completions_are_cached(monkeypatch):
+    cached = {}
+    service = OpenAIService(cache=SimpleNamespace(get=cached.get, set=cached.__setitem__))
+
+    for prompt, finish_reason in [("cortado", "length"), ("completo", "stop")]:
+        response = OpenAIObject.construct_from({
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": prompt}, "finish_reason": finish_reason}]
+        })
+        monkeypatch.setattr(openai.ChatCompletion, "create", lambda **kwargs: response)
+
+        assert service._chat_completion("sistema", prompt) == prompt
+
+    assert list(cached.values()) == ["completo"]
@@ -0,0 +1,56 @@
+"""
+Files returned by `/api/bulk/score` when scoring fails after the response started.
+"""
+import io
+import pandas as pd
+import pyarrow
+import pytest
+from flask import Flask
+from app.domain import FEATURES
+from app.routes.bulk_routes import init_bulk_bp
+from app.services import BulkScorer
+
+
+class FailingScorer(BulkScorer):
+    """Scores the first chunk and fails on the second one."""
+
+    def __init__(self):
+        super().__init__(profile_scorer=None, chunk_size=1)
+
+    def score_chunks(self, chunks):
+        yield self.interrupted_frame("primer bloque").assign(playerIndex=0, error=None)
+        raise RuntimeError("modelo no disponible")
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    init_bulk_bp(app, FailingScorer())
+    return app.test_client()
+
+
+def post_players(client, output_format):
+    body = pd.DataFrame([[1.0] * len(FEATURES)] * 2, columns=FEATURES).to_csv(index=False)
+
+    return client.post(f"/api/bulk/score?outputFormat={output_format}", data=body, content_type="text/csv")
+
+
+@pytest.mark.parametrize("output_format, read", [
+    ("csv", pd.read_csv),
+    ("ndjson", lambda file: pd.read_json(file, lines=True)),
+])
+def test_text_files_end_with_an_error_row(client, output_format, read):
+    response = post_players(client, output_format)
+    rows = read(io.BytesIO(response.get_data()))
+
+    assert response.status_code == 200
+    assert len(rows) == 2
+    assert pd.isna(rows["playerIndex"].iloc[-1])
+    assert rows["error"].iloc[-1] == "Procesamiento interrumpido: modelo no disponible"
+
+
+def test_parquet_file_is_left_unreadable(client):
+    response = post_players(client, "parquet")
+
+    with pytest.raises(pyarrow.ArrowInvalid):
+        pd.read_parquet(io.BytesIO(response.get_data()))
@@ -0,0 +1,44 @@
+"""
+Outcomes counted by the OpenAI circuit breaker.
+"""
+from types import SimpleNamespace
+import openai
+import pytest
+from app.infrastructure import CircuitBreaker
+from app.services import OpenAIService
+
+
+def test_ignored_exceptions_are_not_counted():
+    breaker = CircuitBreaker("test", min_calls=1, ignored_exceptions=(ValueError,))
+
+    def fail(error):
+        raise error
+
+    with pytest.raises(ValueError):
+        breaker.call(lambda: fail(ValueError()))
+
+    assert breaker.stats()["calls"] == 0
+
+    with pytest.raises(RuntimeError):
+        breaker.call(lambda: fail(RuntimeError()))
+
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_client_errors_and_cache_hits_are_not_counted(monkeypatch):
+    cached = {}
+    service = OpenAIService(cache=SimpleNamespace(get=cached.get, set=cached.__setitem__))
+
+    def invalid_request(**kwargs):
+        raise openai.error.InvalidRequestError("Solicitud no válida", None)
+
+    monkeypatch.setattr(openai.ChatCompletion, "create", invalid_request)
+
+    with pytest.raises(openai.error.InvalidRequestError):
+        service._chat_completion("sistema", "solicitud")
+
+    # A request answered by the cache once the lock is held never reaches the API.
+    cached["clave"] = "cacheado"
+
+    assert service._request_completion("sistema", "cacheado", "clave") == "cacheado"
+    assert service.circuit_breaker.stats()["calls"] == 0
@@ -0,0 +1,147 @@
+"""
+Parity of the compiled forests with the shipped scikit-learn models.
+
+Every evaluator built from the pickles in `static/models` (the plain
+compiled forest, the forest with its scaler fused and the merged group of
+both models) must give exactly the same labels and probabilities as
+`model.predict` / `model.predict_proba(scaler.transform(X))`.
+"""
+import os
+import pickle
+import warnings
+import numpy as np
+import pytest
+from app.domain import FEATURES, FEATURE_VALIDATIONS
+from app.infrastructure import CompiledForest, CompiledForestGroup
+
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "models")
+
+MODEL_FILES = {
+    "positions": ("hierarchical_classifier.pkl", "hierarchical_scaler.pkl"),
+    "physicalConditions": ("kmeans_classifier.pkl", "kmeans_scaler.pkl"),
+}
+
+
+def load_pickle(file_name):
+    """Loads a pickle of `static/models`."""
+    with open(os.path.join(MODELS_DIR, file_name), "rb") as file, warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return pickle.load(file)
+
+
+@pytest.fixture(scope="module", params=sorted(MODEL_FILES))
+def model_and_scaler(request):
+    """Each shipped model with its scaler."""
+    model_file, scaler_file = MODEL_FILES[request.param]
+    return load_pickle(model_file), load_pickle(scaler_file)
+
+
+@pytest.fixture(scope="module")
+def all_models():
+    """Every shipped model with its scaler, in `MODEL_FILES` order."""
+    return [(load_pickle(model_file), load_pickle(scaler_file)) for model_file, scaler_file in MODEL_FILES.values()]
+
+
+def feature_bounds():
+    """Min and max of every feature, in `FEATURES` order."""
+    low = np.array([FEATURE_VALIDATIONS[field]["min"] for field in FEATURES], dtype=np.float64)
+    high = np.array([FEATURE_VALIDATIONS[field]["max"] for field in FEATURES], dtype=np.float64)
+    return low, high
+
+
+def in_range_rows(n_rows=2000, seed=0):
+    """Random rows within the valid range of every feature."""
+    low, high = feature_bounds()
+    return np.random.default_rng(seed).uniform(low, high, size=(n_rows, len(FEATURES)))
+
+
+def out_of_range_rows(n_rows=500, seed=1):
+    """Random rows up to twice the valid range away from it, on both sides."""
+    low, high = feature_bounds()
+    span = high - low
+    return np.random.default_rng(seed).uniform(low - 2 * span, high + 2 * span, size=(n_rows, len(FEATURES)))
+
+
+def integer_rows(n_rows=500, seed=2):
+    """Random integer rows within the valid range, as an integer array."""
+    low, high = feature_bounds()
+    return np.random.default_rng(seed).integers(np.floor(low), np.ceil(high) + 1, size=(n_rows, len(FEATURES)))
+
+
+ROW_SETS = {
+    "in_range": in_range_rows,
+    "out_of_range": out_of_range_rows,
+    "integer": integer_rows,
+    "single": lambda: in_range_rows(1, seed=3),
+}
+
+
+def expected(model, scaler, rows):
+    """Labels and probabilities of the scikit-learn model."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        scaled = scaler.transform(rows)
+        return model.predict(scaled), model.predict_proba(scaled)
+
+
+@pytest.mark.parametrize("row_set", sorted(ROW_SETS))
+def test_compiled_forest_matches_sklearn(model_and_scaler, row_set):
+    model, scaler = model_and_scaler
+    rows = ROW_SETS[row_set]()
+    labels, proba = expected(model, scaler, rows)
+    compiled = CompiledForest.from_sklearn(model)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        scaled = scaler.transform(rows)
+
+    np.testing.assert_array_equal(compiled.predict(scaled), labels)
+    np.testing.assert_array_equal(compiled.predict_proba(scaled), proba)
+
+
+@pytest.mark.parametrize("row_set", sorted(ROW_SETS))
+def test_fused_forest_matches_sklearn(model_and_scaler, row_set):
+    model, scaler = model_and_scaler
+    rows = ROW_SETS[row_set]()
+    labels, proba = expected(model, scaler, rows)
+    fused = CompiledForest.from_sklearn(model).fuse_scaler(scaler)
+
+    np.testing.assert_array_equal(fused.predict(rows), labels)
+    np.testing.assert_array_equal(fused.predict_proba(rows), proba)
+
+
+def test_fused_forest_matches_sklearn_at_split_thresholds(model_and_scaler):
+    model, scaler = model_and_scaler
+    fused = CompiledForest.from_sklearn(model).fuse_scaler(scaler)
+    rng = np.random.default_rng(4)
+    rows = in_range_rows(2000, seed=5)
+    is_split = np.isfinite(fused.threshold) & (np.abs(fused.threshold) < np.finfo(np.float64).max)
+
+    # Raw values on and next to the fused thresholds exercise the boundary
+    # of every `<=` decision.
+    for column in range(fused.n_features):
+        thresholds = fused.threshold[is_split & (fused.feature == column)]
+        if thresholds.size:
+            picked = rng.choice(thresholds, size=len(rows))
+            rows[:, column] = np.nextafter(picked, picked + rng.integers(-1, 2, size=len(rows)))
+
+    labels, proba = expected(model, scaler, rows)
+
+    np.testing.assert_array_equal(fused.predict(rows), labels)
+    np.testing.assert_array_equal(fused.predict_proba(rows), proba)
+
+
+@pytest.mark.parametrize("row_set", sorted(ROW_SETS))
+def test_forest_group_matches_sklearn(all_models, row_set):
+    rows = ROW_SETS[row_set]()
+    group = CompiledForestGroup([
+        CompiledForest.from_sklearn(model).fuse_scaler(scaler) for model, scaler in all_models
+    ])
+    group_labels = group.predict(rows)
+    group_proba = group.predict_proba(rows)
+
+    for (model, scaler), labels, proba in zip(all_models, group_labels, group_proba):
+        expected_labels, expected_proba = expected(model, scaler, rows)
+        np.testing.assert_array_equal(labels, expected_labels)
+        np.testing.assert_array_equal(proba, expected_proba)
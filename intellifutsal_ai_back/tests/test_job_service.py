@@ -0,0 +1,62 @@
+"""
+Resumption of jobs abandoned while the workers keep running.
+"""
+import time
+from app.infrastructure import SQLiteJobStore
+from app.services import JobService
+
+
+def wait_for_status(store, job_id, status, timeout=5.0):
+    """Polls a job until it reaches a status, returning the last one seen."""
+    deadline = time.monotonic() + timeout
+
+    while store.get(job_id)["status"] != status and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    return store.get(job_id)["status"]
+
+
+def test_abandoned_jobs_are_requeued_periodically(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    service = JobService(store, stale_after=0.0, requeue_interval=0.2)
+    service.register("echo", lambda payload, publish: payload)
+    service.resume()
+
+    # Claimed by a worker that stopped updating it after the pool started.
+    job_id = store.create("echo", {"value": 1})
+    assert store.claim(job_id)
+
+    assert service.get(job_id)["status"] == SQLiteJobStore.RUNNING
+
+    time.sleep(0.3)
+    service.get(job_id)
+
+    assert wait_for_status(store, job_id, SQLiteJobStore.COMPLETED) == SQLiteJobStore.COMPLETED
+    assert store.get(job_id)["result"] == {"value": 1}
+
+
+def test_job_taken_over_by_another_worker_stops(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    service = JobService(store)
+    published = []
+
+    def handler(payload, publish):
+        # Another worker claims the job once it is requeued as abandoned.
+        store._connection().execute("UPDATE jobs SET owner = 'otro:1' WHERE id = ?", (job_id,))
+        publish({"step": 1})
+        published.append(1)
+        return {"value": 1}
+
+    service.register("echo", handler)
+    job_id = store.create("echo", {})
+    service._run(job_id)
+    job = store.get(job_id)
+
+    assert published == []
+    assert job["status"] == SQLiteJobStore.RUNNING
+    assert job["owner"] == "otro:1"
+    assert job["partial"] is None and job["result"] is None
+
+    assert not store.complete(job_id, {"value": 2})
+    assert not store.fail(job_id, "error")
+    assert store.get(job_id)["status"] == SQLiteJobStore.RUNNING
@@ -0,0 +1,29 @@
+"""
+Batched player analyses from the async entry point.
+"""
+import asyncio
+from app.domain import FEATURES
+from app.services import OpenAIService
+
+
+def test_async_batches_match_the_players(monkeypatch):
+    service = OpenAIService()
+    players = [([float(i)] * len(FEATURES), i, i) for i in range(5)]
+    batches = []
+
+    def analyze_player_batch(batch, feature_names, use_cache):
+        batches.append([player[1] for player in batch])
+
+        if batch[0][1] == 3:
+            raise RuntimeError("lote fallido")
+
+        return [{"positionId": player[1]} for player in batch]
+
+    monkeypatch.setattr(service, "_batch_bounds", lambda players, feature_names: [(0, 3), (3, 5)])
+    monkeypatch.setattr(service, "analyze_player_batch", analyze_player_batch)
+
+    results = asyncio.run(service.analyze_player_batches_async(players, FEATURES))
+
+    assert sorted(batches) == [[0, 1, 2], [3, 4]]
+    assert results[:3] == [{"positionId": 0}, {"positionId": 1}, {"positionId": 2}]
+    assert all(isinstance(result, RuntimeError) for result in results[3:])
@@ -0,0 +1,54 @@
+"""
+Cluster ids of `ProfileScorer` with models whose labels aren't 0..n-1.
+"""
+import os
+import pickle
+import warnings
+import numpy as np
+import pytest
+from app.domain import FEATURES, FEATURE_VALIDATIONS
+from app.infrastructure import CompiledForest, SklearnModelAdapter
+from app.services import PlayerProfilePredictor, ProfileScorer
+
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "models")
+
+
+def load_pickle(file_name):
+    """Loads a pickle of `static/models`."""
+    with open(os.path.join(MODELS_DIR, file_name), "rb") as file, warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return pickle.load(file)
+
+
+def relabeled_adapter(model_file, scaler_file, fuse_scaler):
+    """Adapter of a shipped model whose class labels are mapped to 10 * label + 5."""
+    scaler = load_pickle(scaler_file)
+    compiled = CompiledForest.from_sklearn(load_pickle(model_file))
+
+    if fuse_scaler:
+        compiled = compiled.fuse_scaler(scaler)
+
+    compiled.classes = compiled.classes * 10 + 5
+    return SklearnModelAdapter(None, scaler, compiled)
+
+
+@pytest.mark.parametrize("fuse_scaler", [False, True])
+def test_probability_path_returns_class_labels(fuse_scaler):
+    positions_adapter = relabeled_adapter("hierarchical_classifier.pkl", "hierarchical_scaler.pkl", fuse_scaler)
+    physical_adapter = relabeled_adapter("kmeans_classifier.pkl", "kmeans_scaler.pkl", fuse_scaler)
+    scorer = ProfileScorer(PlayerProfilePredictor(positions_adapter), PlayerProfilePredictor(physical_adapter))
+
+    low = [FEATURE_VALIDATIONS[field]["min"] for field in FEATURES]
+    high = [FEATURE_VALIDATIONS[field]["max"] for field in FEATURES]
+    rows = np.random.default_rng(0).uniform(low, high, size=(500, len(FEATURES)))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        scores = scorer.score(rows, with_probabilities=True, use_cache=False)
+        expected_positions = positions_adapter.predict_batch(rows)
+        expected_physical = physical_adapter.predict_batch(rows)
+
+    assert scores["positionIds"] == expected_positions
+    assert scores["physicalIds"] == expected_physical
+    assert set(expected_positions) <= set(positions_adapter.classes.tolist())
@@ -0,0 +1,126 @@
+"""
+Parsing of sectioned analyses with `SectionParser`.
+"""
+import pytest
+from app.services.analysis_parser import PLAYER_ANALYSIS_SECTIONS, TEAM_ANALYSIS_SECTIONS, SectionParser
+from scripts.benchmark_section_parser import build_response, legacy_parse_player, legacy_parse_team
+
+
+PLAYER_RESPONSE = """ANÁLISIS GENERAL:
+Jugador rápido con buena resistencia.
+Destaca en transiciones.
+
+FORTALEZAS:
+- Velocidad
+- Resistencia
+
+ÁREAS DE MEJORA:
+- Fuerza del tren superior
+
+RECOMENDACIONES DE ENTRENAMIENTO:
+- Trabajo de fuerza
+- Sprints repetidos
+
+PERFIL DE RENDIMIENTO:
+Perfil de ala con alto volumen de carrera."""
+
+
+@pytest.mark.parametrize("sections, legacy", [
+    (PLAYER_ANALYSIS_SECTIONS, legacy_parse_player),
+    (TEAM_ANALYSIS_SECTIONS, legacy_parse_team),
+])
+def test_same_result_as_the_regular_expressions(sections, legacy):
+    content = build_response(sections, 3)
+    parsed = SectionParser.parse(content, sections)
+    expected = legacy(content)
+    last_key = sections[-1].key
+
+    assert list(parsed) == list(expected)
+    assert {key: type(value) for key, value in parsed.items()} == {key: type(value) for key, value in expected.items()}
+    # The regular expression of the last section never captured its text.
+    assert {key: value for key, value in parsed.items() if key != last_key} == \
+        {key: value for key, value in expected.items() if key != last_key}
+    assert expected[last_key] == ""
+    assert parsed[last_key] == build_response(sections[-1:], 3).split(":\n", 1)[1]
+
+
+def test_player_analysis():
+    assert SectionParser.parse(PLAYER_RESPONSE, PLAYER_ANALYSIS_SECTIONS) == {
+        "generalAnalysis": "Jugador rápido con buena resistencia.\nDestaca en transiciones.",
+        "strengths": ["Velocidad", "Resistencia"],
+        "weaknesses": ["Fuerza del tren superior"],
+        "trainingRecommendations": ["Trabajo de fuerza", "Sprints repetidos"],
+        "performanceProfile": "Perfil de ala con alto volumen de carrera."
+    }
+
+
+@pytest.mark.parametrize("header", [
+    "## FORTALEZAS:", "**FORTALEZAS:**", "**Fortalezas**:", "fortalezas:", "### _Fortalezas_:"
+])
+def test_decorated_and_lowercase_headers(header):
+    parsed = SectionParser.parse(f"{header}\n- Velocidad\nÁreas de mejora: \n- Fuerza", PLAYER_ANALYSIS_SECTIONS)
+
+    assert parsed["strengths"] == ["Velocidad"]
+    assert parsed["weaknesses"] == ["Fuerza"]
+
+
+def test_header_followed_by_text_on_the_same_line():
+    parsed = SectionParser.parse("ANÁLISIS GENERAL: Jugador rápido.\nFORTALEZAS:", PLAYER_ANALYSIS_SECTIONS)
+
+    assert parsed["generalAnalysis"] == "Jugador rápido."
+
+
+def test_bullets_numbers_and_continuation_lines():
+    content = "\n".join([
+        "FORTALEZAS:",
+        "1. Velocidad",
+        "2) Resistencia",
+        "• Visión de juego",
+        "* Regate",
+        "- Disparo con",
+        "  ambas piernas",
+        "",
+        "Línea suelta",
+    ])
+
+    assert SectionParser.parse(content, PLAYER_ANALYSIS_SECTIONS)["strengths"] == [
+        "Velocidad", "Resistencia", "Visión de juego", "Regate", "Disparo con ambas piernas", "Línea suelta"
+    ]
+
+
+def test_preamble_is_the_general_analysis_when_missing():
+    parsed = SectionParser.parse("Jugador polivalente.\n\nFORTALEZAS:\n- Velocidad", PLAYER_ANALYSIS_SECTIONS)
+
+    assert parsed["generalAnalysis"] == "Jugador polivalente."
+    assert parsed["strengths"] == ["Velocidad"]
+    assert parsed["performanceProfile"] == ""
+
+
+def test_preamble_is_ignored_when_the_general_analysis_exists():
+    parsed = SectionParser.parse("Introducción.\n" + PLAYER_RESPONSE, PLAYER_ANALYSIS_SECTIONS)
+
+    assert parsed["generalAnalysis"] == "Jugador rápido con buena resistencia.\nDestaca en transiciones."
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16])
+def test_chunked_feed_matches_parse(size):
+    parser = SectionParser(PLAYER_ANALYSIS_SECTIONS)
+    completed = []
+
+    for start in range(0, len(PLAYER_RESPONSE), size):
+        completed.extend(parser.feed(PLAYER_RESPONSE[start:start + size]))
+
+    completed.extend(parser.close())
+    parsed = SectionParser.parse(PLAYER_RESPONSE, PLAYER_ANALYSIS_SECTIONS)
+
+    assert parser.result() == parsed
+    assert [key for key, _ in completed] == [section.key for section in PLAYER_ANALYSIS_SECTIONS]
+    assert dict(completed) == parsed
+
+
+def test_section_completes_when_the_next_header_arrives():
+    parser = SectionParser(PLAYER_ANALYSIS_SECTIONS)
+
+    assert parser.feed("FORTALEZAS:\n- Velocidad\nÁREAS DE ") == []
+    assert parser.feed("MEJORA:\n") == [("strengths", ["Velocidad"])]
+    assert parser.close() == [("weaknesses", [])]